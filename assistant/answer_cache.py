@@ -0,0 +1,279 @@
+"""
+Semantic cache of answers to previously asked questions.
+
+Help-desk style traffic repeats the same questions with slightly different
+wording. This module stores each answer together with the embedding of its
+question; a new question whose embedding has cosine similarity above a
+configurable threshold with a cached one returns the cached answer without
+retrieval or generation.
+
+Entries are only valid for the settings that produced them (language model,
+temperature, and the retrieval and context packing settings in
+`ANSWER_RAG_SETTINGS`) and for the current content version
+of the vector store. `ingest_folder` bumps the content version whenever it
+changes the store, which invalidates every cached answer.
+
+The cache lives next to the vector store as `answer_cache.json` (questions,
+answers, timestamps) and `answer_cache.npy` (normalised question
+embeddings). Hits only update the in-memory LRU bookkeeping; it is written
+with the next stored answer or at process exit (`flush`), so lookups never
+touch the disk unless another process changed the cache.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .config import Config
+
+CACHE_FILENAME = "answer_cache.json"
+VECTORS_FILENAME = "answer_cache.npy"
+CONTENT_VERSION_FILENAME = "content_version"
+# Bump when the layout of stored entries changes; older caches are dropped.
+# Version 2 stores the bare answer, without the `Sources:` block.
+ENTRY_FORMAT = 2
+
+# `rag` settings that change which passages reach the prompt, and so the answer.
+ANSWER_RAG_SETTINGS = (
+    "top_k",
+    "embedding_model",
+    "mmr_lambda",
+    "fetch_k",
+    "retrieval_mode",
+    "rrf_k",
+    "lexical_index",
+    "max_distance",
+    "context_budget_chars",
+    "vector_backend",
+    "vector_dtype",
+    "quantization",
+    "rescore_factor",
+)
+
+
+def read_content_version(store_dir: Path) -> str:
+    """Return the vector store's content version token ("" if never set)."""
+    try:
+        return (Path(store_dir) / CONTENT_VERSION_FILENAME).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return ""
+
+
+def bump_content_version(store_dir: Path) -> str:
+    """Record that the vector store's content changed; returns the new token."""
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    token = uuid.uuid4().hex
+    tmp_path = store_dir / f".{CONTENT_VERSION_FILENAME}.tmp"
+    tmp_path.write_text(token, encoding="utf-8")
+    os.replace(tmp_path, store_dir / CONTENT_VERSION_FILENAME)
+    return token
+
+
+def _normalise(vector) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else array
+
+
+class AnswerCache:
+    """Similarity-keyed answer cache with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        store_dir: Path,
+        settings: dict,
+        threshold: float = 0.95,
+        ttl_seconds: float = 86400,
+        max_entries: int = 1000,
+    ) -> None:
+        self.store_dir = Path(store_dir)
+        self.settings = dict(settings)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: List[dict] = []
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._loaded_mtime: Optional[float] = None
+        self._content_version: Optional[str] = None
+        self._dirty = False
+
+    @property
+    def _path(self) -> Path:
+        return self.store_dir / CACHE_FILENAME
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.store_dir / VECTORS_FILENAME
+
+    def _key(self) -> dict:
+        return {**self.settings, "content_version": self._content_version, "format": ENTRY_FORMAT}
+
+    def _refresh(self) -> None:
+        """Reload from disk if another process changed the cache or the store."""
+        version = read_content_version(self.store_dir)
+        try:
+            mtime: Optional[float] = self._path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if version == self._content_version and mtime == self._loaded_mtime:
+            return
+        self._content_version = version
+        self._loaded_mtime = mtime
+        self._dirty = False  # Unsaved LRU updates yield to the other process's writes.
+        self._entries, self._vectors = [], np.zeros((0, 0), dtype=np.float32)
+        if mtime is None:
+            return
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            vectors = np.load(self._vectors_path)
+        except (OSError, ValueError) as exc:
+            print(f"[WARN] Ignoring unreadable answer cache {self._path}: {exc}")
+            return
+        if data.get("key") != self._key() or len(data.get("entries", [])) != len(vectors):
+            return  # Settings or store content changed: every entry is stale.
+        self._entries = data["entries"]
+        self._vectors = vectors
+
+    def _save(self) -> None:
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_vectors = self.store_dir / f".{VECTORS_FILENAME}.tmp.npy"
+        np.save(tmp_vectors, self._vectors)
+        os.replace(tmp_vectors, self._vectors_path)
+        tmp_path = self.store_dir / f".{CACHE_FILENAME}.tmp"
+        tmp_path.write_text(
+            json.dumps({"key": self._key(), "entries": self._entries}), encoding="utf-8"
+        )
+        os.replace(tmp_path, self._path)
+        self._loaded_mtime = self._path.stat().st_mtime
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Persist LRU updates from cache hits, unless the cache changed on disk."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._refresh()
+            if self._dirty:
+                self._save()
+
+    def _drop(self, keep: np.ndarray) -> None:
+        self._entries = [e for e, k in zip(self._entries, keep) if k]
+        self._vectors = self._vectors[keep]
+
+    def lookup(self, embedding) -> Optional[dict]:
+        """Return the cache entry for the most similar live question, if any.
+
+        The entry holds the cached `question`, `answer` and `sources`.
+        """
+        with self._lock:
+            self._refresh()
+            if not self._entries:
+                return None
+            now = time.time()
+            created = np.array([e["created"] for e in self._entries])
+            scores = self._vectors @ _normalise(embedding)
+            scores[now - created > self.ttl_seconds] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            self._entries[best]["last_used"] = now
+            self._dirty = True
+            return dict(self._entries[best])
+
+    def store(self, question: str, embedding, answer: str, sources: Optional[List[str]] = None) -> None:
+        """Cache an answer, evicting expired and least recently used entries."""
+        with self._lock:
+            self._refresh()
+            now = time.time()
+            vector = _normalise(embedding)
+            if self._entries:
+                created = np.array([e["created"] for e in self._entries])
+                self._drop(now - created <= self.ttl_seconds)
+            if self._vectors.size and self._vectors.shape[1] != vector.shape[0]:
+                self._entries, self._vectors = [], np.zeros((0, 0), dtype=np.float32)
+            if len(self._entries) >= self.max_entries:
+                last_used = np.array([e["last_used"] for e in self._entries])
+                keep = np.ones(len(self._entries), dtype=bool)
+                keep[np.argsort(last_used)[: len(self._entries) - self.max_entries + 1]] = False
+                self._drop(keep)
+            self._entries.append(
+                {
+                    "question": question,
+                    "answer": answer,
+                    "sources": list(sources or []),
+                    "created": now,
+                    "last_used": now,
+                }
+            )
+            self._vectors = (
+                np.vstack([self._vectors, vector[None, :]]) if self._vectors.size else vector[None, :]
+            )
+            self._save()
+
+    def clear(self) -> int:
+        """Remove every cached answer and return how many there were."""
+        with self._lock:
+            self._refresh()
+            count = len(self._entries)
+            for path in (self._path, self._vectors_path):
+                if path.exists():
+                    path.unlink()
+            self._entries, self._vectors = [], np.zeros((0, 0), dtype=np.float32)
+            self._loaded_mtime = None
+            self._dirty = False
+            return count
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+
+_CACHES: Dict[tuple, AnswerCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+@atexit.register
+def _flush_caches() -> None:
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    for cache in caches:
+        try:
+            cache.flush()
+        except OSError as exc:
+            print(f"[WARN] Could not save answer cache {cache.store_dir}: {exc}")
+
+
+def get_answer_cache(cfg: Config) -> Optional[AnswerCache]:
+    """Return the process-wide answer cache for these settings, or None if disabled."""
+    cache_cfg = cfg.cache
+    if not cache_cfg.get("answers", True):
+        return None
+    store_dir = Path(cfg.paths.get("vector_store", "./vector_store")).resolve()
+    settings = {
+        "model": cfg.model.get("name", "llama3"),
+        "temperature": cfg.model.get("temperature", 0.2),
+        **{name: cfg.rag.get(name) for name in ANSWER_RAG_SETTINGS},
+    }
+    key = (str(store_dir), json.dumps(settings, sort_keys=True))
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            _CACHES[key] = AnswerCache(
+                store_dir,
+                settings,
+                threshold=cache_cfg.get("answer_similarity", 0.95),
+                ttl_seconds=cache_cfg.get("answer_ttl_seconds", 86400),
+                max_entries=cache_cfg.get("answer_max_entries", 1000),
+            )
+        return _CACHES[key]
@@ -5,9 +5,15 @@ Provide functions to split large pieces of text into smaller chunks for
 processing by language models. Chunking is based on character length, with
 optional overlap to maintain context across chunks. These functions can be
 replaced or extended with token-based chunking if needed.
+
+`chunk_ids` gives chunks content-addressed ids, so a re-ingested file keeps
+the ids (and stored embeddings) of every chunk whose text did not change.
+`chunk_pages` chunks a paged document (PDF) as a stream and records the
+pages each chunk spans.
 """
 
-from typing import List
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 
 def chunk_text(text: str, max_chars: int, overlap: int = 0) -> List[str]:
@@ -42,4 +48,109 @@ def chunk_text(text: str, max_chars: int, overlap: int = 0) -> List[str]:
         # Move start forward, subtracting overlap to create overlap with the previous chunk.
         start = end - overlap if overlap > 0 else end
 
-    return chunks
\ No newline at end of file
+    return chunks
+
+
+class ChunkIds:
+    """Streaming form of `chunk_ids`: call `next(chunk)` for each chunk in order.
+
+    Only a digest of each distinct chunk text is kept to number repeats, so
+    memory does not grow with the size of the chunks.
+    """
+
+    def __init__(self, source: str, namespace: str = "") -> None:
+        self.source = source
+        self.namespace = namespace
+        self.seen: Dict[bytes, int] = {}
+
+    def next(self, chunk: str) -> str:
+        normalised = " ".join(chunk.split())
+        key = hashlib.sha256(normalised.encode("utf-8")).digest()
+        occurrence = self.seen.get(key, 0)
+        self.seen[key] = occurrence + 1
+        digest = hashlib.sha256(
+            f"{self.namespace}\0{self.source}\0{occurrence}\0{normalised}".encode("utf-8")
+        )
+        return digest.hexdigest()[:32]
+
+
+def chunk_ids(source: str, chunks: List[str], namespace: str = "") -> List[str]:
+    """Return a content-addressed id for every chunk of a source file.
+
+    The id hashes the source path and the chunk text with whitespace runs
+    collapsed, so re-extraction that only changes spacing keeps it stable.
+    Repeated chunks within one file are told apart by occurrence number.
+
+    Args:
+        source: Identifier of the source file (its resolved path).
+        chunks: The file's chunks, in order.
+        namespace: Settings the stored embedding depends on (e.g. the
+            embedding model); ids change when it does.
+
+    Returns:
+        One 32-character hex id per chunk.
+    """
+    ids = ChunkIds(source, namespace)
+    return [ids.next(chunk) for chunk in chunks]
+
+
+def chunk_pages(
+    pages: Iterable[Tuple[int, str]], max_chars: int, overlap: int = 0
+) -> Iterator[Tuple[str, int, int]]:
+    """Chunk a document page by page, tracking which pages each chunk spans.
+
+    Produces exactly the chunks `chunk_text` would for the pages joined with
+    newlines, but only buffers the text not yet emitted, so memory depends
+    on page and chunk size rather than document size.
+
+    Args:
+        pages: `(page_number, text)` pairs in document order.
+        max_chars: Maximum number of characters per chunk.
+        overlap: Characters shared with the previous chunk.
+
+    Yields:
+        Tuples `(chunk, first_page, last_page)`.
+    """
+    buffer = ""
+    offset = 0  # Document offset of buffer[0]
+    start = 0  # Document offset of the next chunk
+    starts: List[Tuple[int, int]] = []  # (document offset, page number) of buffered pages
+
+    def page_at(position: int) -> int:
+        page = starts[0][1]
+        for page_start, number in starts:
+            if page_start > position:
+                break
+            page = number
+        return page
+
+    def emit(end: int) -> Tuple[str, int, int]:
+        chunk = buffer[start - offset:end - offset]
+        return chunk, page_at(start), page_at(end - 1)
+
+    for number, text in pages:
+        if starts:
+            buffer += "\n"
+        starts.append((offset + len(buffer), number))
+        buffer += text
+        # Emit only chunks known not to be the last one, as chunk_text would.
+        while offset + len(buffer) > start + max_chars:
+            end = start + max_chars
+            yield emit(end)
+            start = end - overlap if overlap > 0 else end
+        # Drop text and pages before the next chunk.
+        if start > offset:
+            buffer = buffer[start - offset:]
+            offset = start
+            while len(starts) > 1 and starts[1][0] <= start:
+                starts.pop(0)
+
+    length = offset + len(buffer)
+    if not starts or length == 0:
+        return
+    while start < length:
+        end = min(start + max_chars, length)
+        yield emit(end)
+        if end == length:
+            break
+        start = end - overlap if overlap > 0 else end
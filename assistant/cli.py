@@ -3,7 +3,9 @@ Command-line interface for the AI assistant.
 
 Defines a `main` function that parses arguments and dispatches to the
 appropriate functionality: summarising files, ingesting a folder into the
-vector store, or asking a question over ingested content.
+vector store, asking a question over ingested content, serving those
+operations over a local API, removing chunks of deleted files, or
+reporting on embedding quantisation.
 
 The CLI uses the `argparse` module to provide a structured interface.
 """
@@ -11,11 +13,22 @@ The CLI uses the `argparse` module to provide a structured interface.
 from __future__ import annotations
 
 import argparse
+import json
+import sys
 from pathlib import Path
 
+import numpy as np
+
 from .config import get_config
 from .summarizer import summarize_folder, summarize_single_file
-from .rag import ingest_folder, answer_question
+from .rag import _get_vector_store, collect_garbage, ingest_folder, answer_question, answer_questions, iter_answer
+from .quantization import evaluate_quantization
+from .vector_store import NumpyVectorStore
+from .extract_cache import get_extraction_cache
+from .answer_cache import get_answer_cache
+from .server import serve
+from .watcher import watch_folder
+from . import profiling
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -27,9 +40,22 @@ def build_parser() -> argparse.ArgumentParser:
 
     subparsers = parser.add_subparsers(dest="command", required=True)
 
+    # Profiling flags shared by the pipeline subcommands
+    profile = argparse.ArgumentParser(add_help=False)
+    profile.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage timings and LLM token counts when done",
+    )
+    profile.add_argument(
+        "--trace",
+        type=str,
+        help="Also write a Chrome trace (chrome://tracing, Perfetto) to this file",
+    )
+
     # Subparser for summary
     summary = subparsers.add_parser(
-        "summary", help="Summarise files in a folder or a single file"
+        "summary", help="Summarise files in a folder or a single file", parents=[profile]
     )
     summary.add_argument(
         "--folder",
@@ -41,10 +67,16 @@ def build_parser() -> argparse.ArgumentParser:
         type=str,
         help="Path to a single file to summarise",
     )
+    summary.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used to parse files in parallel",
+    )
 
     # Subparser for ingest
     ingest = subparsers.add_parser(
-        "ingest", help="Ingest a folder into the vector store for RAG"
+        "ingest", help="Ingest a folder into the vector store for RAG", parents=[profile]
     )
     ingest.add_argument(
         "--folder",
@@ -52,21 +84,186 @@ def build_parser() -> argparse.ArgumentParser:
         required=True,
         help="Folder to ingest into the vector store",
     )
+    ingest.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used to parse files in parallel",
+    )
+    ingest.add_argument(
+        "--prune",
+        action="store_true",
+        help="Also delete stored chunks of files under the folder that no longer exist or are now ignored",
+    )
+    ingest.add_argument(
+        "--watch",
+        action="store_true",
+        help="After ingesting, keep watching the folder and apply changes as they happen",
+    )
+    ingest.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="With --watch, seconds of quiet that end a burst of file events",
+    )
+    ingest.add_argument(
+        "--poll-interval",
+        type=float,
+        help="With --watch, poll the folder every N seconds instead of using inotify",
+    )
 
     # Subparser for ask
     ask = subparsers.add_parser(
-        "ask", help="Ask questions over previously ingested content"
+        "ask", help="Ask questions over previously ingested content", parents=[profile]
     )
-    ask.add_argument(
+    ask_input = ask.add_mutually_exclusive_group(required=True)
+    ask_input.add_argument(
         "--question",
         type=str,
-        required=True,
         help="The question to ask over the ingested documents",
     )
+    ask_input.add_argument(
+        "--questions-file",
+        type=str,
+        help="JSONL file with one {\"question\": ...} object per line to answer in batch",
+    )
+    ask.add_argument(
+        "--output",
+        type=str,
+        help="Write batch answers as JSONL to this file instead of stdout",
+    )
+    ask.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Print the answer only once it is complete instead of streaming it",
+    )
+    ask.add_argument(
+        "--concurrency",
+        type=int,
+        help="Maximum concurrent LLM requests in batch mode (default: model.max_parallel)",
+    )
+
+    # Subparser for serve
+    serve_cmd = subparsers.add_parser(
+        "serve", help="Serve ask/ingest/summary over a local JSON HTTP API"
+    )
+    serve_cmd.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface to bind the HTTP server to",
+    )
+    serve_cmd.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="TCP port to listen on",
+    )
+    serve_cmd.add_argument(
+        "--socket",
+        type=str,
+        help="Listen on this Unix domain socket path instead of TCP",
+    )
+
+    # Subparser for garbage collection
+    gc = subparsers.add_parser(
+        "gc", help="Delete stored chunks whose source files no longer exist", parents=[profile]
+    )
+    gc.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report orphaned sources and reclaimable chunks",
+    )
+    gc.add_argument(
+        "--force",
+        action="store_true",
+        help="Delete even if every stored source is missing (e.g. the data folder was removed)",
+    )
+
+    # Subparser for cache maintenance
+    cache = subparsers.add_parser(
+        "cache", help="Inspect or clear the extraction and answer caches"
+    )
+    cache.add_argument(
+        "action",
+        choices=["stats", "clear"],
+        help="Show cache usage or delete all cached entries",
+    )
+
+    # Subparser for the quantisation report
+    quant = subparsers.add_parser(
+        "quantization", help="Report memory footprint and recall of quantised embeddings"
+    )
+    quant.add_argument(
+        "--sample",
+        type=int,
+        default=200,
+        help="Number of stored vectors used as queries",
+    )
+    quant.add_argument(
+        "--k",
+        type=int,
+        default=10,
+        help="Number of neighbours whose recall is measured",
+    )
 
     return parser
 
 
+def _quantization_report(cfg, sample: int, k: int) -> None:
+    """Print memory and recall of each quantisation mode for the NumPy store."""
+    store, _ = _get_vector_store(cfg)
+    if not isinstance(store, NumpyVectorStore):
+        print("[QUANT] The quantisation report needs rag.vector_backend: numpy.")
+        return
+    matrix, live = store.vector_rows()
+    live_rows = np.flatnonzero(live)
+    if len(live_rows) < 2:
+        print("[QUANT] The vector store needs at least two vectors.")
+        return
+    # Queries are stored vectors, read row by row; their own rows are left
+    # out of the search so self-matches do not inflate recall.
+    rng = np.random.default_rng(0)
+    picked = np.sort(rng.choice(live_rows, size=min(sample, len(live_rows)), replace=False))
+    queries = np.asarray(matrix[picked], dtype=np.float32)
+    rows = evaluate_quantization(
+        matrix,
+        queries,
+        k=k,
+        rescore_factor=cfg.rag.get("rescore_factor", 4),
+        live=live,
+        exclude=picked,
+    )
+    print(f"[QUANT] {len(live_rows)} vectors, {len(queries)} queries, recall@{min(k, len(live_rows) - 1)}")
+    print(f"{'mode':<8} {'bytes/vec':>9} {'index MB':>9} {'recall':>7} {'rescored':>9}")
+    for row in rows:
+        print(
+            f"{row['mode']:<8} {row['bytes_per_vector']:>9} {row['index_mb']:>9.1f} "
+            f"{row['recall']:>7.3f} {row['recall_rescored']:>9.3f}"
+        )
+
+
+def _answer_questions_file(
+    path: Path, cfg, output: str | None, concurrency: int | None
+) -> None:
+    """Answer every question in a JSONL file and write JSONL results."""
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                questions.append(json.loads(line))
+    results = answer_questions(questions, cfg, max_workers=concurrency)
+    out = open(output, "w", encoding="utf-8") if output else sys.stdout
+    try:
+        for record in results:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if output:
+            out.close()
+    if output:
+        print(f"[ASK] Answered {len(results)} questions -> {output}")
+
+
 def main() -> None:
     """Entry point for the CLI.
 
@@ -77,21 +274,92 @@ def main() -> None:
     args = parser.parse_args()
     cfg = get_config()
 
+    profiler = None
+    if getattr(args, "profile", False) or getattr(args, "trace", None):
+        profiler = profiling.enable()
+    try:
+        _run(parser, args, cfg)
+    finally:
+        if profiler is not None:
+            profiling.disable()
+            print("\n=== Profile ===\n")
+            print(profiler.format_table())
+            if args.trace:
+                profiler.export_trace(Path(args.trace))
+                print(f"[PROFILE] Trace written to {args.trace}")
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace, cfg) -> None:
+    """Dispatch the parsed subcommand."""
+
     if args.command == "summary":
         # Summarise a single file or all files in a folder
         if args.file:
             summarize_single_file(Path(args.file), cfg)
         elif args.folder:
-            summarize_folder(Path(args.folder), cfg)
+            summarize_folder(Path(args.folder), cfg, workers=args.workers)
         else:
             parser.error("summary requires --file or --folder")
 
     elif args.command == "ingest":
-        # Ingest a folder into the vector store
-        ingest_folder(Path(args.folder), cfg)
+        if args.watch:
+            # Ingest, then keep the store in step with the folder
+            watch_folder(
+                Path(args.folder),
+                cfg,
+                workers=args.workers,
+                debounce=args.debounce,
+                poll_interval=args.poll_interval,
+                prune=args.prune,
+            )
+        else:
+            # Ingest a folder into the vector store
+            ingest_folder(Path(args.folder), cfg, workers=args.workers, prune=args.prune)
 
     elif args.command == "ask":
-        # Ask a question over ingested content
-        answer = answer_question(args.question, cfg)
-        print("\n=== Answer ===\n")
-        print(answer)
\ No newline at end of file
+        if args.questions_file:
+            # Answer a JSONL file of questions in one batch
+            _answer_questions_file(Path(args.questions_file), cfg, args.output, args.concurrency)
+        else:
+            # Ask a question over ingested content
+            print("\n=== Answer ===\n")
+            if args.no_stream:
+                print(answer_question(args.question, cfg))
+            else:
+                for piece in iter_answer(args.question, cfg):
+                    print(piece, end="", flush=True)
+                print()
+
+    elif args.command == "serve":
+        # Keep the vector store and embedding model warm behind a local API
+        serve(cfg, host=args.host, port=args.port, socket_path=args.socket)
+
+    elif args.command == "gc":
+        # Reconcile stored sources with the filesystem
+        collect_garbage(cfg, dry_run=args.dry_run, force=args.force)
+
+    elif args.command == "cache":
+        # Inspect or clear the extraction and answer caches
+        cache = get_extraction_cache(cfg)
+        answers = get_answer_cache(cfg)
+        if cache is None:
+            print("[CACHE] Extraction cache is disabled (cache.extraction_max_mb is 0).")
+        elif args.action == "clear":
+            removed = cache.clear()
+            print(f"[CACHE] Removed {removed} cached extractions from {cache.directory}")
+        else:
+            stats = cache.stats()
+            print(
+                f"[CACHE] {stats['entries']} entries, "
+                f"{stats['bytes'] / 1024 / 1024:.1f} MB of "
+                f"{stats['max_bytes'] / 1024 / 1024:.0f} MB in {stats['directory']}"
+            )
+        if answers is not None:
+            if args.action == "clear":
+                print(f"[CACHE] Removed {answers.clear()} cached answers")
+            else:
+                print(f"[CACHE] {len(answers)} cached answers")
+
+    elif args.command == "quantization":
+        # Compare quantised codes with exact search over the stored vectors
+        _quantization_report(cfg, args.sample, args.k)
@@ -3,12 +3,14 @@ Configuration loader for the AI assistant.
 
 Loads configuration values from a YAML file (default `config.yaml` in the
 project root). This module exposes a `Config` class that stores model,
-retrieval, path, and logging settings.
+retrieval, summary, PDF, path, discovery, logging, and cache settings.
 """
 
 from pathlib import Path
 import yaml
 
+from .file_discovery import DEFAULT_IGNORE, DEFAULT_IGNORE_FILES
+
 # Determine the default configuration file path relative to this module.
 DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[1] / "config.yaml"
 
@@ -28,17 +30,44 @@ class Config:
 
         # Base defaults used if keys are absent from the YAML file.
         defaults = {
-            "model": {"name": "llama3", "temperature": 0.2},
+            "model": {"name": "llama3", "temperature": 0.2, "max_parallel": 4},
             "rag": {
                 "embedding_model": "all-minilm",
                 "top_k": 5,
                 "chunk_size": 1500,
                 "chunk_overlap": 200,
+                "ingest_batch_size": 256,
+                "max_distance": None,
+                "context_budget_chars": 6000,
+                "retrieval_mode": "vector",
+                "lexical_index": True,
+                "rrf_k": 60,
+                "mmr_lambda": None,
+                "fetch_k": 50,
+                "vector_backend": "chroma",
+                "vector_dtype": "float32",
+                "quantization": None,
+                "rescore_factor": 4,
             },
             "paths": {
                 "data_folder": "./data",
                 "output_folder": "./outputs",
                 "vector_store": "./vector_store",
+                "cache_folder": "./cache",
+            },
+            "summary": {"reduce_budget_chars": 6000},
+            "pdf": {"pages_per_task": 16, "fanout_min_pages": 64, "ocr_dpi": 300},
+            "discovery": {
+                "ignore": list(DEFAULT_IGNORE),
+                "ignore_files": list(DEFAULT_IGNORE_FILES),
+            },
+            "cache": {
+                "extraction_max_mb": 1024,
+                "embeddings": True,
+                "answers": True,
+                "answer_similarity": 0.95,
+                "answer_ttl_seconds": 86400,
+                "answer_max_entries": 1000,
             },
             "logging": {"level": "INFO"},
         }
@@ -48,6 +77,10 @@ class Config:
         self.rag: dict = {**defaults["rag"], **data.get("rag", {})}
         self.paths: dict = {**defaults["paths"], **data.get("paths", {})}
         self.logging: dict = {**defaults["logging"], **data.get("logging", {})}
+        self.summary: dict = {**defaults["summary"], **data.get("summary", {})}
+        self.cache: dict = {**defaults["cache"], **data.get("cache", {})}
+        self.pdf: dict = {**defaults["pdf"], **data.get("pdf", {})}
+        self.discovery: dict = {**defaults["discovery"], **data.get("discovery", {})}
 
 
 def get_config(path: str | None = None) -> Config:
@@ -0,0 +1,93 @@
+"""
+Context packing for retrieval-augmented prompts.
+
+Retrieved chunks overlap (`chunk_overlap` characters are repeated between
+neighbouring chunks) and some are barely relevant. `pack_context` turns the
+raw hits into a compact prompt context: it drops hits beyond a distance
+threshold, merges adjacent chunks of the same source while stripping the
+repeated overlap, and keeps the most relevant passages that fit in a
+character budget.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+Hit = Tuple[str, dict]
+
+
+def _merge(passage: Hit, nxt: Hit, overlap: int) -> Hit:
+    text, meta = passage
+    next_text, next_meta = nxt
+    if overlap > 0 and next_text.startswith(text[-overlap:]):
+        text += next_text[overlap:]
+    else:
+        text += "\n" + next_text
+    merged = {**meta, "chunk_end": next_meta.get("chunk_index")}
+    if next_meta.get("page") is not None:
+        merged["page_end"] = next_meta.get("page_end", next_meta["page"])
+    distances = [m["distance"] for m in (meta, next_meta) if m.get("distance") is not None]
+    if distances:
+        merged["distance"] = min(distances)
+    return text, merged
+
+
+def pack_context(
+    retrieved: List[Hit],
+    overlap: int = 0,
+    max_distance: Optional[float] = None,
+    budget_chars: Optional[int] = None,
+) -> List[Hit]:
+    """Deduplicate, filter and budget retrieved chunks for a prompt.
+
+    Args:
+        retrieved: `(document, metadata)` hits in rank order. Metadata may
+            carry `source`, `chunk_index` and `distance`.
+        overlap: Number of characters neighbouring chunks share.
+        max_distance: Drop hits whose distance exceeds this value.
+        budget_chars: Maximum total characters of packed context. The
+            first passage is truncated if it alone exceeds the budget.
+
+    Returns:
+        Packed `(passage, metadata)` pairs, most relevant first. Merged
+        passages keep the first chunk's metadata, with `chunk_end` set to
+        the last merged chunk index, `page_end` to the last page of paged
+        documents, and the best (smallest) distance.
+    """
+    hits = [
+        (doc, meta)
+        for doc, meta in retrieved
+        if max_distance is None or meta.get("distance") is None or meta["distance"] <= max_distance
+    ]
+
+    # Merge runs of consecutive chunk indices from the same source.
+    rank = {id(meta): pos for pos, (_, meta) in enumerate(hits)}
+    by_source: Dict[str, List[Hit]] = {}
+    for hit in hits:
+        by_source.setdefault(str(hit[1].get("source")), []).append(hit)
+    passages: List[Tuple[int, Hit]] = []
+    for source_hits in by_source.values():
+        source_hits.sort(key=lambda h: (h[1].get("chunk_index") is None, h[1].get("chunk_index", 0)))
+        current, best = source_hits[0], rank[id(source_hits[0][1])]
+        for nxt in source_hits[1:]:
+            last_index = current[1].get("chunk_end", current[1].get("chunk_index"))
+            next_index = nxt[1].get("chunk_index")
+            if last_index is not None and next_index == last_index + 1:
+                current = _merge(current, nxt, overlap)
+                best = min(best, rank[id(nxt[1])])
+            else:
+                passages.append((best, current))
+                current, best = nxt, rank[id(nxt[1])]
+        passages.append((best, current))
+    passages.sort(key=lambda p: p[0])
+
+    packed: List[Hit] = []
+    used = 0
+    for _, (text, meta) in passages:
+        if budget_chars is not None and used + len(text) > budget_chars:
+            if packed:
+                continue
+            text = text[:budget_chars]
+        packed.append((text, meta))
+        used += len(text)
+    return packed
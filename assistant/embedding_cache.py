@@ -0,0 +1,209 @@
+"""
+Content-addressed cache of chunk embeddings.
+
+Boilerplate text (headers, disclaimers, templated sections) repeats across
+many documents. This module caches embeddings keyed by the resolved
+embedding model name and a hash of the chunk text, so identical chunks are
+only encoded once.
+
+Each model gets its own directory holding two append-only files:
+
+- `keys.bin`: 16-byte BLAKE2b digests of chunk texts, one per row.
+- `vectors.f32`: the matching float32 embeddings, memory-mapped for lookups.
+
+Several processes may append to the same cache (e.g. `ingest --watch` and
+a manual `ingest`). Appends hold a lock file (`cache.lock`) and first read
+the rows other writers added, so every key is numbered by its position in
+the files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import Config
+from .embeddings import _resolve_model_name, as_embedding_array
+from .file_lock import FileLock
+
+CACHE_SUBDIR = "embeddings"
+DIGEST_SIZE = 16
+
+
+def _text_digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+class EmbeddingCache:
+    """Append-only on-disk store of embeddings for one embedding model."""
+
+    def __init__(self, directory: Path, model_name: str) -> None:
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+        self.directory = Path(directory) / safe_name
+        self.model_name = model_name
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        # Rows read from the files; a key appended twice by racing writers is
+        # in `_rows` once but takes two rows.
+        self._count = 0
+        self._vectors: Optional[np.memmap] = None
+        self._file_lock = FileLock(self.directory / "cache.lock")
+        self._load()
+
+    @property
+    def _keys_path(self) -> Path:
+        return self.directory / "keys.bin"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / "vectors.f32"
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "meta.json"
+
+    def _load(self) -> int:
+        """Read rows appended since the last load; returns the rows in the files.
+
+        Only rows present in both files are read, so an append in progress
+        (or a torn one) is skipped rather than cut off.
+        """
+        if self.dim is None:
+            if not self._meta_path.exists():
+                return 0
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            self.dim = int(meta["dim"])
+        vector_bytes = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        keys = b""
+        if self._keys_path.exists():
+            with open(self._keys_path, "rb") as f:
+                f.seek(self._count * DIGEST_SIZE)
+                keys = f.read()
+        rows = min(self._count + len(keys) // DIGEST_SIZE, vector_bytes // (4 * self.dim))
+        for row in range(self._count, rows):
+            offset = (row - self._count) * DIGEST_SIZE
+            self._rows[keys[offset:offset + DIGEST_SIZE]] = row
+        self._count = rows
+        return rows
+
+    def _truncate(self, rows: int) -> None:
+        for path, row_bytes in ((self._keys_path, DIGEST_SIZE), (self._vectors_path, 4 * (self.dim or 0))):
+            if path.exists() and path.stat().st_size > rows * row_bytes:
+                with open(path, "r+b") as f:
+                    f.truncate(rows * row_bytes)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _matrix(self) -> np.ndarray:
+        if self._vectors is None or len(self._vectors) < self._count:
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self._count, self.dim)
+            )
+        return self._vectors
+
+    def rows(self, texts: Sequence[str]) -> np.ndarray:
+        """Return the cache row of each text, or -1 where missing."""
+        return np.fromiter(
+            (self._rows.get(_text_digest(text), -1) for text in texts), dtype=np.int64, count=len(texts)
+        )
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Return the cached embeddings at `rows` as a `(len(rows), dim)` array."""
+        return np.asarray(self._matrix()[rows], dtype=np.float32)
+
+    def lookup(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return the cached embedding for each text, or None where missing."""
+        if not self._rows:
+            return [None] * len(texts)
+        rows = self.rows(texts)
+        found = rows >= 0
+        vectors = iter(self.vectors(rows[found]))
+        return [next(vectors) if hit else None for hit in found]
+
+    def add(self, texts: Sequence[str], vectors) -> None:
+        """Append embeddings for texts that are not cached yet."""
+        if not texts:
+            return
+        array = np.asarray(vectors, dtype=np.float32)
+        with self._file_lock:
+            # Catch up with other writers; the lock means none is mid-append,
+            # so anything past the last complete row is torn and dropped.
+            self._truncate(self._load())
+            if self.dim is None:
+                self.dim = int(array.shape[1])
+                self._meta_path.write_text(
+                    json.dumps({"model": self.model_name, "dim": self.dim}), encoding="utf-8"
+                )
+            elif array.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {array.shape[1]} does not match cache dimension {self.dim}."
+                )
+
+            new_keys: Dict[bytes, None] = {}
+            new_rows: List[int] = []
+            for idx, text in enumerate(texts):
+                digest = _text_digest(text)
+                if digest in self._rows or digest in new_keys:
+                    continue
+                new_keys[digest] = None
+                new_rows.append(idx)
+            if not new_keys:
+                return
+
+            # Vectors are written before keys so a crash never leaves a key without data.
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(array[new_rows]).tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(new_keys))
+            for offset, digest in enumerate(new_keys):
+                self._rows[digest] = self._count + offset
+            self._count += len(new_keys)
+        self._vectors = None
+
+
+class CachedEmbeddingFunction:
+    """Wrap an embedding function so only unseen texts are encoded.
+
+    Counts cache hits and misses across calls in `hits` and `misses`.
+    """
+
+    def __init__(self, embed_fn, cache: EmbeddingCache) -> None:
+        self.embed_fn = embed_fn
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        rows = self.cache.rows(texts)
+        # Encode each distinct missing text once, even if it repeats within the batch.
+        missing: Dict[str, int] = {}
+        fresh_rows = np.full(len(texts), -1, dtype=np.int64)
+        for idx in np.flatnonzero(rows < 0):
+            fresh_rows[idx] = missing.setdefault(texts[idx], len(missing))
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+
+        fresh = as_embedding_array(self.embed_fn(list(missing))) if missing else None
+        dim = fresh.shape[1] if fresh is not None else self.cache.dim
+        result = np.empty((len(texts), dim or 0), dtype=np.float32)
+        hit = rows >= 0
+        if hit.any():
+            result[hit] = self.cache.vectors(rows[hit])
+        if fresh is not None:
+            self.cache.add(list(missing), fresh)
+            result[~hit] = fresh[fresh_rows[~hit]]
+        return result
+
+
+def get_embedding_cache(cfg: Config) -> Optional[EmbeddingCache]:
+    """Return the embedding cache for the configured model, or None if disabled."""
+    if not cfg.cache.get("embeddings", True):
+        return None
+    folder = Path(cfg.paths.get("cache_folder", "./cache")) / CACHE_SUBDIR
+    return EmbeddingCache(folder, _resolve_model_name(cfg.rag.get("embedding_model")))
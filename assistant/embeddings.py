@@ -1,17 +1,20 @@
 """
 Embedding utilities for the RAG pipeline.
 
-Provides a local sentence-transformer embedding function that can be used with
-ChromaDB. Defaults to the small `all-MiniLM-L6-v2` model for lightweight,
-offline-friendly embeddings. Raises a clear error if the dependency is missing.
-Includes helpers to validate embedding outputs for numeric type and uniform
-dimensions.
+Provides a local sentence-transformer embedding function. Defaults to the
+small `all-MiniLM-L6-v2` model for lightweight, offline-friendly
+embeddings. Raises a clear error if the dependency is missing.
+
+Embeddings travel through the pipeline as one contiguous float32 NumPy
+array of shape `(texts, dim)`: the embedding function returns it, the
+embedding cache fills it and the vector stores consume it, without
+per-vector lists in between. `as_embedding_array` checks shape, dtype and
+finiteness of a batch in vectorised form.
 """
 
-from numbers import Real
 from typing import Optional, Sequence
 
-from chromadb.utils import embedding_functions
+import numpy as np
 
 
 DEFAULT_EMBED_MODEL = "all-MiniLM-L6-v2"
@@ -26,40 +29,73 @@ def _resolve_model_name(cfg_name: Optional[str]) -> str:
     return cfg_name
 
 
-def get_embedding_function(model_name: Optional[str] = None):
-    """Return a sentence-transformer embedding function for ChromaDB."""
-    resolved = _resolve_model_name(model_name)
-    try:
-        return embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=resolved
-        )
-    except ImportError as exc:
-        raise RuntimeError(
-            "sentence-transformers is not installed. "
-            "Install it with `pip install sentence-transformers`."
-        ) from exc
+class SentenceTransformerEmbedder:
+    """Callable embedding texts with a sentence-transformer into a float32 array."""
 
+    def __init__(self, model_name: str) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            raise RuntimeError(
+                "sentence-transformers is not installed. "
+                "Install it with `pip install sentence-transformers`."
+            ) from exc
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
 
-def validate_embeddings(embeddings: Sequence[Sequence[Real]]) -> int:
-    """Validate embeddings are numeric and share a uniform dimension.
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        embeddings = self.model.encode(list(texts), convert_to_numpy=True)
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
 
-    Returns:
-        The embedding dimension.
+
+def get_embedding_function(model_name: Optional[str] = None) -> SentenceTransformerEmbedder:
+    """Return a sentence-transformer embedding function."""
+    return SentenceTransformerEmbedder(_resolve_model_name(model_name))
+
+
+def as_embedding_array(embeddings) -> np.ndarray:
+    """Return embeddings as a validated `(n, dim)` float32 array.
+
+    Arrays that are already float32 and contiguous are returned without a
+    copy; lists of vectors are stacked once.
 
     Raises:
-        ValueError: If embeddings are empty or dimensions mismatch.
+        ValueError: If embeddings are empty, dimensions mismatch or any
+            value is NaN or infinite.
         TypeError: If any element is non-numeric.
     """
-    if not embeddings:
+    if isinstance(embeddings, np.ndarray):
+        array = embeddings
+    else:
+        if len(embeddings) == 0:
+            raise ValueError("No embeddings were generated.")
+        try:
+            array = np.stack([np.asarray(emb) for emb in embeddings])
+        except ValueError as exc:
+            raise ValueError("Embeddings have inconsistent dimensions.") from exc
+    if array.ndim != 2:
+        raise ValueError(f"Embeddings must be a 2-D batch, got shape {array.shape}.")
+    if array.shape[0] == 0:
         raise ValueError("No embeddings were generated.")
-    dim = len(embeddings[0])
-    if dim == 0:
+    if array.shape[1] == 0:
         raise ValueError("Embedding dimension must be greater than zero.")
+    if not (np.issubdtype(array.dtype, np.number) or array.dtype == np.bool_):
+        raise TypeError("Embedding values must be numeric.")
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    if not np.isfinite(array).all():
+        raise ValueError("Embeddings contain NaN or infinite values.")
+    return array
+
 
-    for emb in embeddings:
-        if len(emb) != dim:
-            raise ValueError("Embeddings have inconsistent dimensions.")
-        for val in emb:
-            if not isinstance(val, Real):
-                raise TypeError("Embedding values must be numeric.")
-    return dim
+def validate_embeddings(embeddings) -> int:
+    """Validate embeddings are numeric, finite and share a uniform dimension.
+
+    Returns:
+        The embedding dimension.
+
+    Raises:
+        ValueError: If embeddings are empty, dimensions mismatch or values
+            are not finite.
+        TypeError: If any element is non-numeric.
+    """
+    return int(as_embedding_array(embeddings).shape[1])
@@ -0,0 +1,136 @@
+"""
+On-disk cache of extracted document text.
+
+Text extraction (PDF parsing, DOCX parsing and especially Tesseract OCR) is
+the most expensive part of both summarisation and ingest. This module
+stores the extracted text keyed by the SHA-256 of the file's bytes plus the
+parser name and version, so the same content is never parsed twice, even
+across the `summary` and `ingest` commands or after a file is renamed.
+
+Entries are plain UTF-8 files under the configured cache folder. A hit
+refreshes the entry's modification time, and `prune` evicts the least
+recently used entries once the cache grows beyond its size limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from .config import Config
+from .manifest import file_sha256
+
+CACHE_SUBDIR = "extracted_text"
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache mapping file content to extracted text.
+
+    Instances only hold a directory and a size limit, so they can be sent
+    to parser worker processes. Writes are atomic, which makes concurrent
+    use from several processes safe.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._written_since_prune = 0
+
+    def key_for(self, path: Path, parser: str, version: str) -> str:
+        """Return the cache key for a file parsed by the given parser version."""
+        return self.key_for_hash(file_sha256(path), parser, version)
+
+    @staticmethod
+    def key_for_hash(content_hash: str, parser: str, version: str) -> str:
+        """Return the cache key for content with a known SHA-256 digest."""
+        return hashlib.sha256(f"{content_hash}:{parser}:{version}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached text for `key`, or None on a miss."""
+        entry = self._entry_path(key)
+        try:
+            text = entry.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(entry)  # Mark as recently used.
+        except OSError:
+            pass
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store text for `key`, evicting old entries if the cache is full."""
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.with_name(f".{entry.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, entry)
+        self._written_since_prune += entry.stat().st_size
+        if self._written_since_prune > self.max_bytes // 8:
+            self.prune()
+
+    def _entries(self) -> list:
+        if not self.directory.exists():
+            return []
+        entries = []
+        for entry in self.directory.glob("*/*.txt"):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry))
+        return entries
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits its limit.
+
+        Returns:
+            The number of entries removed.
+        """
+        self._written_since_prune = 0
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Delete every cached entry and return how many were removed."""
+        count = len(self._entries())
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        return count
+
+    def stats(self) -> dict:
+        """Return the number of entries and bytes used by the cache."""
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+def get_extraction_cache(cfg: Config) -> Optional[ExtractionCache]:
+    """Return the configured extraction cache, or None if it is disabled."""
+    max_mb = cfg.cache.get("extraction_max_mb", 1024)
+    if not max_mb:
+        return None
+    folder = Path(cfg.paths.get("cache_folder", "./cache")) / CACHE_SUBDIR
+    return ExtractionCache(folder, int(max_mb * 1024 * 1024))
@@ -0,0 +1,192 @@
+"""
+Parser dispatch shared by the summariser and the RAG pipeline.
+
+Maps file extensions to the parser functions in `assistant.parsers` and
+routes extraction through the optional on-disk `ExtractionCache`. Each
+parser carries a version string; bump it whenever a parser's output
+changes so stale cache entries are no longer used. PDF entries are also
+keyed on the OCR resolution, or on OCR being off or unavailable, so text
+cached without OCR is re-extracted once Tesseract is installed.
+
+`iter_pdf_text` streams a PDF page by page for ingest. The pages are read
+in fixed ranges, which can run in parallel worker processes and are cached
+individually, so a large document never has to be held in memory whole.
+Scanned pages (no text layer) are rendered and OCR-ed, one page per task.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .extract_cache import ExtractionCache
+from .manifest import file_sha256
+from .parallel import process_pool
+from .parsers.pdf_parser import (
+    DEFAULT_OCR_DPI,
+    extract_pdf_text,
+    ocr_enabled,
+    ocr_pdf_page,
+    pdf_page_count,
+    scan_pdf_pages,
+)
+from .parsers.docx_parser import extract_docx_text
+from .parsers.md_parser import extract_md_text
+from .parsers.txt_parser import extract_txt_text
+from .parsers.image_parser import ocr_image
+
+# Extension -> (parser name, parser version, parser function).
+PARSERS: Dict[str, Tuple[str, str, Callable[[Path], str]]] = {
+    ".pdf": ("pdf", "2", extract_pdf_text),
+    ".docx": ("docx", "1", extract_docx_text),
+    ".md": ("md", "1", extract_md_text),
+    ".txt": ("txt", "1", extract_txt_text),
+    ".png": ("ocr", "1", ocr_image),
+    ".jpg": ("ocr", "1", ocr_image),
+    ".jpeg": ("ocr", "1", ocr_image),
+}
+
+
+def extract_text(
+    path: Path, cache: Optional[ExtractionCache] = None, ocr_dpi: Optional[int] = DEFAULT_OCR_DPI
+) -> str:
+    """Extract text from a supported file, using the cache when provided.
+
+    Args:
+        path: File to parse.
+        cache: Optional extraction cache. Cached text is returned without
+            invoking the parser; freshly extracted text is stored.
+        ocr_dpi: Resolution at which scanned PDF pages are OCR-ed (`pdf.ocr_dpi`);
+            `None` or 0 leaves them empty.
+
+    Returns:
+        The extracted text.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    suffix = path.suffix.lower()
+    if suffix not in PARSERS:
+        raise ValueError(f"Unsupported file type: {suffix}")
+    name, version, parser = PARSERS[suffix]
+    if suffix == ".pdf":
+        dpi = ocr_dpi if ocr_enabled(ocr_dpi) else 0
+        name += f"+ocr{dpi}" if dpi else ""
+        parser = partial(parser, ocr_dpi=dpi)
+
+    if cache is None:
+        return parser(path)
+
+    key = cache.key_for(path, name, version)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    text = parser(path)
+    cache.put(key, text)
+    return text
+
+
+PDF_PAGES_VERSION = "2"
+
+
+def _scan_pdf_range(page_range: Tuple[int, int], path: Path) -> List[Tuple[int, str, bool]]:
+    """Return `(page_number, text, needs_ocr)` for pages `start <= index < stop`."""
+    return list(scan_pdf_pages(path, *page_range))
+
+
+def _ocr_pdf_page(page_number: int, path: Path, dpi: int) -> Tuple[str, float]:
+    """OCR one page, returning its text and the seconds spent."""
+    started = time.perf_counter()
+    text = ocr_pdf_page(path, page_number, dpi)
+    return text, time.perf_counter() - started
+
+
+def iter_pdf_text(
+    path: Path,
+    cache: Optional[ExtractionCache] = None,
+    workers: int = 1,
+    pages_per_task: int = 16,
+    ocr_dpi: Optional[int] = DEFAULT_OCR_DPI,
+    stats: Optional[dict] = None,
+    pool: Optional[Executor] = None,
+) -> Iterator[Tuple[int, str]]:
+    """Yield `(page_number, text)` for every page of a PDF, in order.
+
+    Text layers are read in ranges of `pages_per_task`, at most two ranges
+    per worker ahead of the caller, so memory stays bounded by page size,
+    not document size. Scanned pages of a range are then rendered and
+    OCR-ed one task per page, so a scanned document keeps every worker
+    busy even when it fits in a single range.
+
+    Args:
+        path: PDF file to read.
+        cache: Optional extraction cache; each range is cached separately,
+            with its OCR text.
+        workers: Number of worker processes (the pool size when `pool` is
+            given).
+        pages_per_task: Pages read per range (and per cache entry).
+        ocr_dpi: Resolution for rendering scanned pages; `None` or 0
+            disables OCR, as does a missing OCR installation (see
+            `ocr_enabled`).
+        stats: Optional dict that receives `ocr_pages` and `ocr_seconds`
+            (OCR time summed over pages, i.e. worker CPU time).
+        pool: Executor to submit work to; by default one with `workers`
+            processes is started for this document.
+    """
+    count = pdf_page_count(path)
+    step = max(1, pages_per_task)
+    ranges = iter([(start, min(start + step, count)) for start in range(0, count, step)])
+    content_hash = file_sha256(path) if cache is not None else None
+    use_ocr = ocr_enabled(ocr_dpi)
+    # Pages cached without OCR are re-read once OCR becomes available.
+    parser = "pdf-pages[{}:{}]" + (f"+ocr{ocr_dpi}" if use_ocr else "")
+    if stats is not None:
+        stats.update(ocr_pages=0, ocr_seconds=0.0)
+
+    with process_pool(workers) if pool is None else nullcontext(pool) as pool:
+
+        def start_range(page_range: Tuple[int, int]):
+            key = None
+            if content_hash is not None:
+                key = cache.key_for_hash(content_hash, parser.format(*page_range), PDF_PAGES_VERSION)
+                cached = cache.get(key)
+                if cached is not None:
+                    return key, [(number, text) for number, text in json.loads(cached)], None
+            return key, None, pool.submit(_scan_pdf_range, page_range, path)
+
+        ahead = deque(start_range(r) for r in islice(ranges, max(2, workers * 2)))
+        while ahead:
+            key, pages, future = ahead.popleft()
+            for page_range in islice(ranges, 1):
+                ahead.append(start_range(page_range))
+            if pages is None:
+                scanned = future.result()
+                pages = [(number, text) for number, text, _ in scanned]
+                ocr = [
+                    (i, pool.submit(_ocr_pdf_page, number, path, ocr_dpi))
+                    for i, (number, _, needs_ocr) in enumerate(scanned)
+                    if needs_ocr and use_ocr
+                ]
+                complete = True
+                for i, ocr_future in ocr:
+                    try:
+                        text, seconds = ocr_future.result()
+                    except Exception as exc:
+                        # Keep the empty text layer rather than failing the document.
+                        print(f"[WARN] OCR failed for page {pages[i][0]} of {path}: {exc}")
+                        complete = False
+                        continue
+                    pages[i] = (pages[i][0], text)
+                    if stats is not None:
+                        stats["ocr_pages"] += 1
+                        stats["ocr_seconds"] += seconds
+                if key is not None and complete:
+                    cache.put(key, json.dumps(pages))
+            yield from pages
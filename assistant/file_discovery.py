@@ -1,32 +1,248 @@
 """
 Utilities for discovering files within a folder.
 
-This module provides helper functions to iterate over files in a directory
-recursively and to determine whether a file is supported for text or
-image processing based on its extension.
+This module walks a directory tree with `os.scandir`, pruning ignored
+directories before descending into them and keeping only files with a
+supported extension, and provides helpers to determine whether a file is
+supported for text or image processing based on its extension.
+
+Ignore rules use `.gitignore` syntax. They come from configured patterns
+(applied at every level of the tree) and from ignore files found during the
+walk, whose patterns are relative to the directory containing them. Later
+rules override earlier ones and `!pattern` re-includes a path, as in git.
+Directories containing a `pyvenv.cfg` (virtualenvs) are always skipped.
 """
 
+import os
+import re
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
 
 # Supported extensions for text documents and images.
 SUPPORTED_TEXT_EXTS = {".pdf", ".docx", ".md", ".txt"}
 SUPPORTED_IMAGE_EXTS = {".png", ".jpg", ".jpeg"}
+SUPPORTED_EXTS = SUPPORTED_TEXT_EXTS | SUPPORTED_IMAGE_EXTS
+
+# Skipped unless configured otherwise: VCS metadata, dependencies, caches.
+DEFAULT_IGNORE = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "node_modules/",
+    "__pycache__/",
+    ".venv/",
+    "venv/",
+    ".tox/",
+]
+DEFAULT_IGNORE_FILES = [".gitignore", ".assistantignore"]
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex body."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("(?:/.*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+class IgnoreRule:
+    """One `.gitignore`-style pattern.
+
+    Args:
+        pattern: The pattern line, e.g. `build/`, `*.log`, `/docs/draft-*`
+            or `!keep.txt`.
+        base: Path of the directory the pattern is relative to, from the
+            root of the walk and using `/` separators (`""` for the root).
+    """
+
+    def __init__(self, pattern: str, base: str = "") -> None:
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        prefix = re.escape(base + "/") if base else ""
+        if not anchored:
+            prefix += "(?:.*/)?"
+        self.regex = re.compile(prefix + _translate(pattern) + r"\Z", re.DOTALL)
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        return (is_dir or not self.dir_only) and self.regex.match(rel_path) is not None
+
+
+def parse_ignore_lines(lines: Iterable[str], base: str = "") -> List[IgnoreRule]:
+    """Build rules from ignore-file lines, skipping blanks and comments."""
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("\\"):
+            line = line[1:]
+        rules.append(IgnoreRule(line, base))
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Apply rules in order; the last matching rule decides."""
+    ignored = False
+    for rule in rules:
+        if rule.negate == ignored and rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+def ignore_rules(ignore: Optional[Iterable[str]] = None) -> List[IgnoreRule]:
+    """Rules for configured patterns (default `DEFAULT_IGNORE`), rooted at the walk."""
+    return parse_ignore_lines(DEFAULT_IGNORE if ignore is None else ignore)
+
+
+def scan_files(
+    folder: Path,
+    extensions: Optional[Iterable[str]] = SUPPORTED_EXTS,
+    ignore: Optional[Iterable[str]] = None,
+    ignore_files: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[Path, os.stat_result]]:
+    """Yield `(path, stat)` for every wanted file below `folder`.
+
+    Directory entries come from `os.scandir`, so file types are known
+    without a `stat` call; only files that pass the extension and ignore
+    filters are stat-ed, once, and the result is handed to the caller.
+    Symlinks to files are followed, symlinks to directories are not.
+
+    Args:
+        folder: The root directory to search.
+        extensions: Lower-case suffixes to keep (`None` keeps every file).
+        ignore: Ignore patterns applied across the tree
+            (default `DEFAULT_IGNORE`).
+        ignore_files: Names of ignore files to honour
+            (default `DEFAULT_IGNORE_FILES`).
+
+    Yields:
+        Tuples of the file path (under `folder`) and its `os.stat_result`,
+        in sorted order within each directory.
+    """
+    return scan_tree(Path(folder), "", ignore_rules(ignore), extensions, ignore_files)
+
+
+def scan_tree(
+    directory: Path,
+    rel_dir: str,
+    rules: List[IgnoreRule],
+    extensions: Optional[Iterable[str]] = SUPPORTED_EXTS,
+    ignore_files: Optional[Iterable[str]] = None,
+    on_dir: Optional[Callable[[Path, str, List[IgnoreRule]], None]] = None,
+) -> Iterator[Tuple[Path, os.stat_result]]:
+    """Walk `directory` as the subtree `rel_dir` of a larger walk.
+
+    Like `scan_files`, but starts from the rules already in force for
+    `directory` and calls `on_dir(path, rel_dir, rules)` for every directory
+    it descends into (including `directory` itself), with the rules that
+    apply to its entries. Watch mode uses this to register directories and
+    to scan directories created or moved in while it runs.
+    """
+    exts = None if extensions is None else {e.lower() for e in extensions}
+    ignore_names = set(DEFAULT_IGNORE_FILES if ignore_files is None else ignore_files)
+    stack: List[Tuple[Path, str, List[IgnoreRule]]] = [(Path(directory), rel_dir, rules)]
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as exc:
+            print(f"[WARN] Cannot read directory {directory}: {exc}")
+            continue
+        names = {e.name for e in entries}
+        if rel_dir and "pyvenv.cfg" in names:
+            continue
+        for name in sorted(ignore_names & names):
+            try:
+                with open(directory / name, "r", encoding="utf-8", errors="replace") as f:
+                    rules = rules + parse_ignore_lines(f, rel_dir)
+            except OSError as exc:
+                print(f"[WARN] Cannot read ignore file {directory / name}: {exc}")
+        if on_dir is not None:
+            on_dir(directory, rel_dir, rules)
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not is_dir and not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if is_dir:
+                if not is_ignored(rules, rel_path, True):
+                    subdirs.append((directory / entry.name, rel_path, rules))
+                continue
+            if exts is not None and os.path.splitext(entry.name)[1].lower() not in exts:
+                continue
+            if rules and is_ignored(rules, rel_path, False):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield directory / entry.name, stat
+        # Depth-first, visiting subdirectories in name order.
+        stack.extend(reversed(subdirs))
 
 
-def iter_files(folder: Path) -> Iterable[Path]:
-    """Yield all files in the given folder recursively.
+def iter_files(
+    folder: Path,
+    extensions: Optional[Iterable[str]] = SUPPORTED_EXTS,
+    ignore: Optional[Iterable[str]] = None,
+    ignore_files: Optional[Iterable[str]] = None,
+) -> Iterator[Path]:
+    """Yield supported, non-ignored files in the given folder recursively.
 
     Args:
         folder: The root directory to search.
+        extensions, ignore, ignore_files: As for `scan_files`.
 
     Yields:
-        Path objects for every file found in the directory tree.
+        Path objects for every wanted file found in the directory tree.
     """
-    for path in folder.rglob("*"):
-        if path.is_file():
-            yield path
+    for path, _ in scan_files(folder, extensions, ignore, ignore_files):
+        yield path
 
 
 def is_text_file(path: Path) -> bool:
@@ -36,4 +252,4 @@ def is_text_file(path: Path) -> bool:
 
 def is_image_file(path: Path) -> bool:
     """Return True if the file has a supported image extension."""
-    return path.suffix.lower() in SUPPORTED_IMAGE_EXTS
\ No newline at end of file
+    return path.suffix.lower() in SUPPORTED_IMAGE_EXTS
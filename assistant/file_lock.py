@@ -0,0 +1,59 @@
+"""
+Advisory file locks shared between processes.
+
+The NumPy vector store and the embedding cache append rows to files that
+several processes may write at once (`ingest --watch`, a manual `ingest`,
+`serve`). `FileLock` serialises those writers with `fcntl.flock` on a lock
+file next to the data. On platforms without `fcntl` it only serialises
+threads of the current process.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class FileLock:
+    """Exclusive lock on `path`, re-entrant within one instance.
+
+    Use as a context manager. Nested `with` blocks on the same instance only
+    lock the file once, so a locked method may call another locked method.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fh: Optional[IO[bytes]] = None
+
+    def __enter__(self) -> "FileLock":
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.path, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self._fh, fcntl.LOCK_EX)
+            except BaseException:
+                if self._fh is not None:
+                    self._fh.close()
+                    self._fh = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fh is not None:
+            # Closing the file releases the flock.
+            self._fh.close()
+            self._fh = None
+        self._lock.release()
@@ -0,0 +1,228 @@
+"""
+On-disk BM25 inverted index for lexical retrieval.
+
+Vector search misses exact identifiers such as error codes, part numbers
+or command names. This module keeps a lexical inverted index of every
+ingested chunk in a SQLite database next to the vector store, scores
+queries with BM25, and fuses lexical and vector rankings with reciprocal
+rank fusion (RRF).
+
+The index is updated incrementally: chunks are added as ingest writes them
+and removed per source file, and corpus statistics (document count, total
+length, per-term document frequency) are maintained alongside so a query
+only touches the postings of its own terms. Query terms are scored rarest
+first; a term with more than `max_postings` postings only refines the
+chunks rarer terms already matched (or, on its own, reads its
+`max_postings` highest-frequency postings), so common words cost a bounded
+number of rows however large the corpus.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+INDEX_FILENAME = "lexical_index.sqlite3"
+
+_TOKEN_RE = re.compile(r"\w+(?:[-.:/]\w+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens, keeping compound identifiers and their parts.
+
+    `git-commit` yields `git-commit`, `git` and `commit`, so both the exact
+    identifier and its components can be matched.
+    """
+    tokens: List[str] = []
+    for match in _TOKEN_RE.findall(text.lower()):
+        tokens.append(match)
+        if not match.isalnum():
+            tokens.extend(part for part in re.split(r"[-.:/]", match) if part)
+    return tokens
+
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id TEXT PRIMARY KEY, source TEXT NOT NULL, length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_source ON chunks(source);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL, chunk_id TEXT NOT NULL, tf INTEGER NOT NULL,
+    PRIMARY KEY (term, chunk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_chunk ON postings(chunk_id);
+CREATE INDEX IF NOT EXISTS postings_impact ON postings(term, tf);
+CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats VALUES ('docs', 0), ('total_length', 0);
+"""
+
+
+class LexicalIndex:
+    """BM25 index over chunk texts stored in SQLite.
+
+    The schema is created (or upgraded) once, tracked by SQLite's
+    `user_version`. With `read_only`, the database is opened read-only so
+    queries never take a write lock and cannot block a running ingest; the
+    index file must then already exist.
+    """
+
+    def __init__(
+        self,
+        store_dir: Path,
+        k1: float = 1.2,
+        b: float = 0.75,
+        read_only: bool = False,
+        max_postings: int = 10000,
+    ) -> None:
+        self.path = Path(store_dir) / INDEX_FILENAME
+        self.k1 = k1
+        self.b = b
+        self.max_postings = max_postings
+        if read_only:
+            self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            if self._schema_version() < SCHEMA_VERSION:
+                # An index from an older version: upgrade it once, then read.
+                LexicalIndex(store_dir, k1, b).close()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        version = self._schema_version()
+        if version < SCHEMA_VERSION:
+            with self.conn:
+                self.conn.executescript(_SCHEMA)
+                if version == 1:
+                    self.conn.execute(
+                        "INSERT INTO terms SELECT term, COUNT(*) FROM postings GROUP BY term"
+                    )
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _schema_version(self) -> int:
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _bump_stats(self, docs: int, length: int) -> None:
+        self.conn.execute("UPDATE stats SET value = value + ? WHERE key = 'docs'", (docs,))
+        self.conn.execute("UPDATE stats SET value = value + ? WHERE key = 'total_length'", (length,))
+
+    def _stats(self) -> Tuple[int, float]:
+        values = dict(self.conn.execute("SELECT key, value FROM stats"))
+        docs = values.get("docs", 0)
+        return docs, (values.get("total_length", 0) / docs if docs else 0.0)
+
+    def delete_ids(self, ids: Iterable[str]) -> None:
+        """Remove chunks by id."""
+        ids = list(ids)
+        with self.conn:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                marks = ",".join("?" * len(batch))
+                row = self.conn.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks WHERE id IN ({marks})", batch
+                ).fetchone()
+                terms = self.conn.execute(
+                    f"SELECT term, COUNT(*) FROM postings WHERE chunk_id IN ({marks}) GROUP BY term", batch
+                ).fetchall()
+                self.conn.executemany("UPDATE terms SET df = df - ? WHERE term = ?", [(n, t) for t, n in terms])
+                self.conn.executemany("DELETE FROM terms WHERE term = ? AND df <= 0", [(t,) for t, _ in terms])
+                self.conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({marks})", batch)
+                self.conn.execute(f"DELETE FROM chunks WHERE id IN ({marks})", batch)
+                self._bump_stats(-row[0], -row[1])
+
+    def delete_source(self, source: str) -> None:
+        """Remove every chunk of a source file."""
+        ids = [row[0] for row in self.conn.execute("SELECT id FROM chunks WHERE source = ?", (source,))]
+        self.delete_ids(ids)
+
+    def delete_sources(self, sources: Sequence[str]) -> None:
+        """Remove every chunk of many source files."""
+        sources = list(sources)
+        ids: List[str] = []
+        for start in range(0, len(sources), 500):
+            batch = sources[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            ids.extend(
+                row[0] for row in self.conn.execute(f"SELECT id FROM chunks WHERE source IN ({marks})", batch)
+            )
+        self.delete_ids(ids)
+
+    def add(self, ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[dict]) -> None:
+        """Index chunks, replacing any existing chunks with the same ids."""
+        self.delete_ids(ids)
+        with self.conn:
+            total = 0
+            for chunk_id, doc, meta in zip(ids, documents, metadatas):
+                counts = Counter(tokenize(doc))
+                length = sum(counts.values())
+                total += length
+                self.conn.execute(
+                    "INSERT INTO chunks VALUES (?, ?, ?)", (chunk_id, str(meta.get("source")), length)
+                )
+                self.conn.executemany(
+                    "INSERT INTO postings VALUES (?, ?, ?)",
+                    [(term, chunk_id, tf) for term, tf in counts.items()],
+                )
+                self.conn.executemany(
+                    "INSERT INTO terms VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                    [(term,) for term in counts],
+                )
+            self._bump_stats(len(ids), total)
+
+    def _postings(self, term: str, df: int, candidates: Dict[str, float]) -> List[tuple]:
+        """`(chunk_id, tf, length)` rows of a term, bounded by `max_postings`."""
+        select = "SELECT p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.chunk_id "
+        if df <= self.max_postings:
+            return self.conn.execute(select + "WHERE p.term = ?", (term,)).fetchall()
+        if not candidates:
+            # Only common terms so far: read the postings where the term weighs most.
+            return self.conn.execute(
+                select + "WHERE p.term = ? ORDER BY p.tf DESC LIMIT ?", (term, self.max_postings)
+            ).fetchall()
+        # A common term only refines the chunks rarer terms already matched.
+        ids = list(candidates)
+        rows: List[tuple] = []
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            rows.extend(
+                self.conn.execute(select + f"WHERE p.term = ? AND p.chunk_id IN ({marks})", [term, *batch])
+            )
+        return rows
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Return the top-k `(chunk_id, bm25_score)` pairs for a query."""
+        docs, avg_len = self._stats()
+        terms = list(set(tokenize(query)))
+        if not docs or not terms:
+            return []
+        marks = ",".join("?" * len(terms))
+        dfs = dict(self.conn.execute(f"SELECT term, df FROM terms WHERE term IN ({marks})", terms))
+        scores: Dict[str, float] = {}
+        for term, df in sorted(dfs.items(), key=lambda item: item[1]):
+            idf = math.log(1 + (docs - df + 0.5) / (df + 0.5))
+            for chunk_id, tf, length in self._postings(term, df, scores):
+                norm = tf + self.k1 * (1 - self.b + self.b * length / (avg_len or 1))
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse several ranked id lists; ids ranked high in any list score well.
+
+    Returns:
+        `(id, score)` pairs sorted by fused score, where each list
+        contributes `1 / (k + rank)` for the ids it contains.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -6,4 +6,4 @@ the `ollama` Python library. Additional backends can be added by exposing
 compatible functions in this package.
 """
 
-from .ollama_client import chat  # noqa: F401
\ No newline at end of file
+from .ollama_client import chat, chat_stream  # noqa: F401
\ No newline at end of file
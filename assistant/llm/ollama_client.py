@@ -3,13 +3,42 @@ Wrapper functions for interacting with Ollama models.
 
 This module abstracts the details of constructing requests and parsing
 responses from the `ollama` library. It exposes a `chat` function that
-sends a prompt to a specified model and returns the generated reply.
+sends a prompt to a specified model and returns the generated reply, and
+`chat_stream`, which yields the reply piece by piece as it is generated.
+Both record an `llm.chat` profiling span with Ollama's token counts and
+durations.
 """
 
-from typing import Optional
+from typing import Iterator, List, Optional
 
 import ollama
 
+from ..profiling import span
+
+_DURATION_FIELDS = ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration")
+
+
+def _build_messages(prompt: str, system_prompt: Optional[str]) -> List[dict]:
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _usage(resp) -> dict:
+    """Token counts and durations (in ms) reported by Ollama, where present."""
+    usage = {}
+    for field in ("prompt_eval_count", "eval_count"):
+        value = resp.get(field)
+        if value is not None:
+            usage[field] = value
+    for field in _DURATION_FIELDS:
+        value = resp.get(field)
+        if value is not None:
+            usage[f"{field}_ms"] = value / 1e6
+    return usage
+
 
 def chat(
     prompt: str,
@@ -28,15 +57,43 @@ def chat(
     Returns:
         The content of the model's response.
     """
-    messages = []
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
-    messages.append({"role": "user", "content": prompt})
+    messages = _build_messages(prompt, system_prompt)
 
-    resp = ollama.chat(
-        model=model,
-        messages=messages,
-        options={"temperature": temperature},
-    )
+    with span("llm.chat", model=model) as s:
+        resp = ollama.chat(
+            model=model,
+            messages=messages,
+            options={"temperature": temperature},
+        )
+        s.set(**_usage(resp))
     # The response dictionary includes a 'message' key with 'content'.
-    return resp["message"]["content"]
\ No newline at end of file
+    return resp["message"]["content"]
+
+
+def chat_stream(
+    prompt: str,
+    model: str = "llama3",
+    system_prompt: Optional[str] = None,
+    temperature: float = 0.2,
+) -> Iterator[str]:
+    """Stream a chat reply from the specified Ollama model.
+
+    Takes the same arguments as `chat`, but yields pieces of the reply as
+    Ollama generates them instead of waiting for the full completion.
+
+    Yields:
+        Successive fragments of the model's response content.
+    """
+    with span("llm.chat", model=model, stream=True) as s:
+        stream = ollama.chat(
+            model=model,
+            messages=_build_messages(prompt, system_prompt),
+            options={"temperature": temperature},
+            stream=True,
+        )
+        for chunk in stream:
+            content = chunk["message"]["content"]
+            if content:
+                yield content
+            if chunk.get("done"):
+                s.set(**_usage(chunk))
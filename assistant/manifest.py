@@ -0,0 +1,131 @@
+"""
+Persistent ingest manifest.
+
+Records a fingerprint for every file that has been ingested into the vector
+store (size, modification time, content hash) together with the chunking and
+embedding settings used at the time. `ingest_folder` consults the manifest
+to skip files that have not changed since the last run and to re-index
+files whose content or ingest settings differ.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_FILENAME = "ingest_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """Fingerprints of ingested files, stored as JSON next to the vector store.
+
+    Entries are keyed by resolved file path. Each entry holds the file size,
+    modification time and SHA-256 hash, plus the ingest parameters
+    (`chunk_size`, `chunk_overlap`, `embedding_model`) that produced the
+    stored chunks. `suffix_params` adds parameters that only matter for
+    one file type (e.g. the OCR resolution for `.pdf`), so changing them
+    leaves other files alone.
+    """
+
+    def __init__(
+        self, store_dir: Path, params: dict, suffix_params: Optional[Dict[str, dict]] = None
+    ) -> None:
+        self.path = Path(store_dir) / MANIFEST_FILENAME
+        self.params = dict(params)
+        self.suffix_params = {k.lower(): dict(v) for k, v in (suffix_params or {}).items()}
+        self.entries: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            print(f"[WARN] Ignoring unreadable ingest manifest {self.path}: {exc}")
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        self.entries = data.get("files", {})
+
+    def save(self) -> None:
+        """Atomically write the manifest to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        payload = {"version": MANIFEST_VERSION, "files": self.entries}
+        tmp_path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def check(self, path: Path, stat: Optional[os.stat_result] = None) -> tuple[str, dict]:
+        """Compare a file against its manifest entry.
+
+        The content hash is only computed when the cheap size/mtime check
+        fails, so unchanged files cost a single `stat` call.
+
+        Args:
+            path: File to check.
+            stat: Optional pre-computed `os.stat` result for the file.
+
+        Returns:
+            A tuple `(status, fingerprint)` where status is one of
+            `"unchanged"`, `"updated"` or `"new"`, and fingerprint is the
+            entry to record once the file has been ingested.
+        """
+        key = str(Path(path).resolve())
+        st = stat or os.stat(path)
+        params = {**self.params, **self.suffix_params.get(Path(path).suffix.lower(), {})}
+        fingerprint = {
+            "path": key,
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            **params,
+        }
+        previous = self.entries.get(key)
+        if previous is None:
+            fingerprint["sha256"] = file_sha256(path)
+            return "new", fingerprint
+
+        params_match = all(previous.get(k) == v for k, v in params.items())
+        if (
+            params_match
+            and previous.get("size") == st.st_size
+            and previous.get("mtime") == st.st_mtime
+        ):
+            fingerprint["sha256"] = previous.get("sha256")
+            return "unchanged", fingerprint
+
+        fingerprint["sha256"] = file_sha256(path)
+        if params_match and previous.get("sha256") == fingerprint["sha256"]:
+            # Touched but not modified: refresh the stat info and skip.
+            self.entries[key] = fingerprint
+            return "unchanged", fingerprint
+        return "updated", fingerprint
+
+    def record(self, fingerprint: dict) -> None:
+        """Store the fingerprint of a successfully ingested file."""
+        self.entries[fingerprint["path"]] = fingerprint
+
+    def paths_under(self, path: Path) -> List[str]:
+        """Return the entry keys for `path` itself or for any file below it."""
+        key = str(Path(path).resolve())
+        if key in self.entries:
+            return [key]
+        prefix = key.rstrip(os.sep) + os.sep
+        return [k for k in self.entries if k.startswith(prefix)]
+
+    def forget(self, path: Path) -> None:
+        """Drop the entry for a file, e.g. when it failed to ingest."""
+        self.entries.pop(str(Path(path).resolve()), None)
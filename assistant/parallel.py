@@ -0,0 +1,124 @@
+"""
+Parallel execution helpers.
+
+Document parsing (PyMuPDF, python-docx, Tesseract OCR) is CPU-bound, so
+`parse_files` fans it out over a pool of worker processes. Results are
+yielded in input order and errors are returned per file rather than
+raised, so callers can report failures and carry on exactly as they do in
+the serial path. `process_pool` hands out the same kind of pool for work
+that is submitted piecemeal, such as the page ranges and OCR pages of one
+large PDF.
+
+Language model calls are I/O-bound; `thread_map` runs them on a thread
+pool with a bounded number of requests in flight.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+ParseResult = Tuple[Path, Optional[str], Optional[BaseException]]
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def parse_files(
+    paths: Iterable[Path],
+    extract_fn: Callable[[Path], str],
+    workers: int = 1,
+    pool: Optional[Executor] = None,
+) -> Iterator[ParseResult]:
+    """Extract text from many files, optionally in parallel.
+
+    Args:
+        paths: Files to parse. Consumed lazily, at most a few files ahead
+            of the caller, so memory stays bounded for large folders.
+        extract_fn: Module-level (picklable) function mapping a path to
+            its text.
+        workers: Number of worker processes. Values of 1 or less parse in
+            the calling process.
+        pool: Executor to use (e.g. from `process_pool`) instead of
+            starting one; it is left running, so one ingest can share a
+            pool between files and page ranges.
+
+    Yields:
+        Tuples `(path, text, error)` in the same order as `paths`. Exactly
+        one of `text` and `error` is set.
+    """
+    if pool is None and workers <= 1:
+        for path in paths:
+            try:
+                yield path, extract_fn(path), None
+            except Exception as exc:
+                yield path, None, exc
+        return
+
+    window = max(1, workers) * 2
+    owned = ProcessPoolExecutor(max_workers=workers) if pool is None else nullcontext(pool)
+    with owned as pool:
+        in_flight: deque = deque()
+        for path in paths:
+            in_flight.append((path, pool.submit(extract_fn, path)))
+            if len(in_flight) >= window:
+                yield _collect(*in_flight.popleft())
+        while in_flight:
+            yield _collect(*in_flight.popleft())
+
+
+class _SerialExecutor:
+    """Runs each submitted call immediately; stands in for a one-worker pool."""
+
+    def submit(self, fn: Callable[..., R], *args, **kwargs) -> "Future[R]":
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def __enter__(self) -> "_SerialExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+def process_pool(workers: int = 1):
+    """Return an executor with `workers` processes.
+
+    For 1 or less, calls run in the calling process as they are submitted,
+    so callers can use one code path for serial and parallel runs. Worker
+    processes are only started once work is submitted.
+    """
+    if workers <= 1:
+        return _SerialExecutor()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _collect(path: Path, future) -> ParseResult:
+    try:
+        return path, future.result(), None
+    except Exception as exc:
+        return path, None, exc
+
+
+def thread_map(fn: Callable[[T], R], items: Sequence[T], max_workers: int) -> List[R]:
+    """Apply `fn` to every item on a thread pool and return results in order.
+
+    Args:
+        fn: Function to apply; exceptions propagate to the caller.
+        items: Inputs to process.
+        max_workers: Maximum number of concurrent calls. Values of 1 or
+            less, or a single item, run in the calling thread.
+
+    Returns:
+        The results, in the same order as `items`.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
@@ -8,8 +8,42 @@ library. Users must have Tesseract installed on their system for OCR to
 function.
 """
 
+import io
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
+
+
+def _ocr(source: Union[Path, io.BytesIO]) -> str:
+    try:
+        import pytesseract  # type: ignore[import-not-found]
+        from PIL import Image  # type: ignore[import-not-found]
+    except ImportError as exc:
+        raise RuntimeError(
+            "pytesseract and Pillow must be installed for OCR."
+        ) from exc
+
+    img = Image.open(source)
+    return pytesseract.image_to_string(img)
+
+
+@lru_cache(maxsize=None)
+def ocr_unavailable_reason() -> Optional[str]:
+    """Return why OCR cannot run in this environment, or None if it can.
+
+    Checked once per process: imports the OCR libraries and asks for the
+    Tesseract version, which fails if the binary is not on the path.
+    """
+    try:
+        import pytesseract  # type: ignore[import-not-found]
+        from PIL import Image  # type: ignore[import-not-found]  # noqa: F401
+    except ImportError:
+        return "pytesseract and Pillow must be installed for OCR."
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as exc:
+        return f"Tesseract is not available: {exc}"
+    return None
 
 
 def ocr_image(path: Path) -> str:
@@ -27,16 +61,19 @@ def ocr_image(path: Path) -> str:
     Raises:
         RuntimeError: If required libraries are not installed.
     """
-    try:
-        import pytesseract  # type: ignore[import-not-found]
-        from PIL import Image  # type: ignore[import-not-found]
-    except ImportError as exc:
-        raise RuntimeError(
-            "pytesseract and Pillow must be installed for OCR."
-        ) from exc
+    return _ocr(path)
 
-    img = Image.open(path)
-    return pytesseract.image_to_string(img)
+
+def ocr_image_bytes(data: bytes) -> str:
+    """Perform OCR on an encoded image (e.g. PNG bytes) held in memory.
+
+    Used for rendered PDF pages; requirements are the same as for
+    `ocr_image`.
+
+    Raises:
+        RuntimeError: If required libraries are not installed.
+    """
+    return _ocr(io.BytesIO(data))
 
 
 def describe_image_with_llm(
@@ -2,25 +2,31 @@
 PDF text extraction.
 
 Uses PyMuPDF (imported as `fitz`) to load PDF documents and extract the
-text content of each page. If PyMuPDF is not installed, an informative
-RuntimeError is raised instructing the user to install the dependency.
+text content of each page. `iter_pdf_pages` yields one page at a time, and
+can be limited to a page range so a large document can be split across
+worker processes; `extract_pdf_text` joins all pages into one string. If
+PyMuPDF is not installed, an informative RuntimeError is raised
+instructing the user to install the dependency.
+
+Scanned pages have no text layer. A page without text that contains an
+image is rendered at `ocr_dpi` and passed through the same Tesseract OCR as
+image files (`image_parser.ocr_image_bytes`); pages that are simply blank
+are left empty. When the OCR libraries or Tesseract are missing, a warning
+is printed once and scanned pages keep their (empty) text layer; a page
+whose OCR fails is likewise left empty with a warning, so one bad page
+never fails the document.
 """
 
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator, Optional, Tuple
 
+from .image_parser import ocr_image_bytes, ocr_unavailable_reason
 
-def extract_pdf_text(path: Path) -> str:
-    """Extract text from a PDF file.
-
-    Args:
-        path: Path to the PDF file.
+DEFAULT_OCR_DPI = 300
 
-    Returns:
-        A string containing the concatenated text of all pages.
 
-    Raises:
-        RuntimeError: If PyMuPDF is not installed.
-    """
+def _open_pdf(path: Path):
     try:
         import fitz  # type: ignore[import-not-found]
     except ImportError as exc:
@@ -29,17 +35,140 @@ def extract_pdf_text(path: Path) -> str:
         ) from exc
 
     try:
-        doc = fitz.open(path)
+        return fitz.open(path)
     except Exception as exc:
         raise RuntimeError(f"Failed to read PDF {path}: {exc}") from exc
 
-    texts: list[str] = []
+
+def pdf_page_count(path: Path) -> int:
+    """Return the number of pages in a PDF file.
+
+    Raises:
+        RuntimeError: If PyMuPDF is not installed or the file cannot be read.
+    """
+    doc = _open_pdf(path)
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def scan_pdf_pages(
+    path: Path, start: int = 0, stop: Optional[int] = None
+) -> Iterator[Tuple[int, str, bool]]:
+    """Yield the text layer of a PDF's pages, flagging scanned pages.
+
+    Only the current page is held in memory, so memory use depends on page
+    size rather than document size.
+
+    Args:
+        path: Path to the PDF file.
+        start: Index of the first page to read (0-based).
+        stop: Index one past the last page to read (default: the last page).
+
+    Yields:
+        Tuples `(page_number, text, needs_ocr)` with 1-based page numbers.
+        `needs_ocr` is True for pages with no text but at least one image.
+
+    Raises:
+        RuntimeError: If PyMuPDF is not installed or the file cannot be read.
+    """
+    doc = _open_pdf(path)
     try:
-        for page in doc:
-            texts.append(page.get_text())
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for index in range(start, stop):
+            page = doc.load_page(index)
+            text = page.get_text()
+            needs_ocr = not text.strip() and bool(page.get_images())
+            del page
+            yield index + 1, text, needs_ocr
+    except RuntimeError:
+        raise
     except Exception as exc:
         raise RuntimeError(f"Failed to extract text from PDF {path}: {exc}") from exc
     finally:
         doc.close()
 
-    return "\n".join(texts)
+
+def ocr_pdf_page(path: Path, page_number: int, dpi: int = DEFAULT_OCR_DPI) -> str:
+    """Render one page (1-based) at `dpi` and return its OCR text.
+
+    Raises:
+        RuntimeError: If PyMuPDF or the OCR libraries are not installed, or
+            the page cannot be rendered.
+    """
+    doc = _open_pdf(path)
+    try:
+        png = doc.load_page(page_number - 1).get_pixmap(dpi=dpi).tobytes("png")
+    except Exception as exc:
+        raise RuntimeError(f"Failed to render page {page_number} of PDF {path}: {exc}") from exc
+    finally:
+        doc.close()
+    return ocr_image_bytes(png)
+
+
+@lru_cache(maxsize=None)
+def _warn_ocr_unavailable(reason: str) -> None:
+    print(f"[WARN] OCR unavailable, scanned PDF pages are left empty: {reason}")
+
+
+def ocr_enabled(ocr_dpi: Optional[int]) -> bool:
+    """Return True if scanned pages should be OCR-ed at `ocr_dpi`.
+
+    False when `ocr_dpi` is `None` or 0, or when OCR cannot run here, in
+    which case a warning is printed once per process.
+    """
+    if not ocr_dpi:
+        return False
+    reason = ocr_unavailable_reason()
+    if reason is not None:
+        _warn_ocr_unavailable(reason)
+        return False
+    return True
+
+
+def iter_pdf_pages(
+    path: Path,
+    start: int = 0,
+    stop: Optional[int] = None,
+    ocr_dpi: Optional[int] = DEFAULT_OCR_DPI,
+) -> Iterator[Tuple[int, str]]:
+    """Yield the text of a PDF's pages one at a time.
+
+    Args:
+        path: Path to the PDF file.
+        start: Index of the first page to read (0-based).
+        stop: Index one past the last page to read (default: the last page).
+        ocr_dpi: Resolution at which scanned pages are rendered for OCR;
+            `None` or 0 leaves them empty.
+
+    Yields:
+        Tuples `(page_number, text)` with 1-based page numbers.
+
+    Raises:
+        RuntimeError: If PyMuPDF is not installed or the file cannot be read.
+    """
+    for number, text, needs_ocr in scan_pdf_pages(path, start, stop):
+        if needs_ocr and ocr_enabled(ocr_dpi):
+            try:
+                text = ocr_pdf_page(path, number, ocr_dpi)
+            except Exception as exc:
+                print(f"[WARN] OCR failed for page {number} of {path}: {exc}")
+        yield number, text
+
+
+def extract_pdf_text(path: Path, ocr_dpi: Optional[int] = DEFAULT_OCR_DPI) -> str:
+    """Extract text from a PDF file, with OCR for scanned pages.
+
+    Args:
+        path: Path to the PDF file.
+        ocr_dpi: Resolution at which scanned pages are rendered for OCR;
+            `None` or 0 leaves them empty.
+
+    Returns:
+        A string containing the text of all pages, separated by newlines.
+
+    Raises:
+        RuntimeError: If PyMuPDF is not installed.
+    """
+    return "\n".join(text for _, text in iter_pdf_pages(path, ocr_dpi=ocr_dpi))
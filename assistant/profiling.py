@@ -0,0 +1,182 @@
+"""
+Lightweight per-stage profiling.
+
+Pipelines wrap each stage in `span("stage.name")`. While no profiler is
+enabled, `span` returns a shared no-op context manager, so instrumented
+code pays one global lookup per span. `enable()` installs a `Profiler`
+that records every span with its thread, start and duration; LLM spans
+also carry Ollama's token counts and durations.
+
+The profiler renders a per-stage breakdown table (`format_table`) and
+exports a Chrome trace (`export_trace`), viewable in `chrome://tracing` or
+Perfetto. Spans nest (e.g. `llm.chat` inside `summary.map`), so totals of
+different stages can overlap; parsing done in worker processes shows up as
+the main process waiting for results.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+TOKEN_FIELDS = ("prompt_eval_count", "eval_count")
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **args) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    def __init__(self, profiler: "Profiler", name: str, args: dict) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.profiler.record(self.name, self.start, time.perf_counter(), self.args)
+
+    def set(self, **args) -> None:
+        """Attach extra data (e.g. token counts) to the span."""
+        self.args.update(args)
+
+
+class Profiler:
+    """Collects timed spans from every thread of the process."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float, args: Optional[dict] = None) -> None:
+        event = {
+            "name": name,
+            "start": start,
+            "duration": end - start,
+            "tid": threading.get_ident(),
+            "args": args or {},
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def breakdown(self) -> List[dict]:
+        """Per-stage totals, in order of first occurrence."""
+        stages: Dict[str, dict] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            row = stages.setdefault(
+                event["name"], {"stage": event["name"], "calls": 0, "total_s": 0.0, **{f: 0 for f in TOKEN_FIELDS}}
+            )
+            row["calls"] += 1
+            row["total_s"] += event["duration"]
+            for field in TOKEN_FIELDS:
+                row[field] += int(event["args"].get(field) or 0)
+        return list(stages.values())
+
+    def format_table(self) -> str:
+        """Render the per-stage breakdown with LLM token totals."""
+        wall = time.perf_counter() - self.started
+        rows = self.breakdown()
+        lines = [
+            f"{'stage':<22} {'calls':>7} {'total s':>9} {'mean ms':>9} {'% wall':>7}",
+        ]
+        for row in rows:
+            mean_ms = row["total_s"] * 1000 / row["calls"]
+            share = 100 * row["total_s"] / wall if wall else 0.0
+            lines.append(
+                f"{row['stage']:<22} {row['calls']:>7} {row['total_s']:>9.3f} {mean_ms:>9.1f} {share:>6.1f}%"
+            )
+        lines.append(f"{'wall':<22} {'':>7} {wall:>9.3f}")
+        prompt_tokens = sum(r["prompt_eval_count"] for r in rows)
+        output_tokens = sum(r["eval_count"] for r in rows)
+        if prompt_tokens or output_tokens:
+            with self._lock:
+                eval_ns = sum(e["args"].get("eval_duration_ms", 0) for e in self.events) * 1e6
+            rate = f", {output_tokens / (eval_ns / 1e9):.1f} tokens/s generated" if eval_ns else ""
+            lines.append(f"LLM tokens: {prompt_tokens} prompt, {output_tokens} generated{rate}")
+        return "\n".join(lines)
+
+    def export_trace(self, path: Path) -> None:
+        """Write the spans as a Chrome trace (JSON) with the breakdown attached."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+        trace = {
+            "traceEvents": [
+                {
+                    "name": e["name"],
+                    "cat": e["name"].split(".")[0],
+                    "ph": "X",
+                    "ts": round((e["start"] - self.started) * 1e6, 1),
+                    "dur": round(e["duration"] * 1e6, 1),
+                    "pid": pid,
+                    "tid": e["tid"],
+                    "args": e["args"],
+                }
+                for e in events
+            ],
+            "displayTimeUnit": "ms",
+            "breakdown": self.breakdown(),
+        }
+        Path(path).write_text(json.dumps(trace), encoding="utf-8")
+
+
+_PROFILER: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    """Start collecting spans in a new profiler and return it."""
+    global _PROFILER
+    _PROFILER = Profiler()
+    return _PROFILER
+
+
+def disable() -> Optional[Profiler]:
+    """Stop collecting spans; returns the profiler that was active, if any."""
+    global _PROFILER
+    profiler, _PROFILER = _PROFILER, None
+    return profiler
+
+
+def span(name: str, **args):
+    """Context manager timing one stage; a no-op unless profiling is enabled."""
+    profiler = _PROFILER
+    if profiler is None:
+        return _NOOP
+    return _Span(profiler, name, args)
+
+
+def profile_iter(name: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Yield from `iterable`, timing each step as a `name` span when profiling."""
+    if _PROFILER is None:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    while True:
+        with span(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
@@ -2,8 +2,9 @@
 Retrieval-augmented generation (RAG) utilities.
 
 This module provides functions for ingesting folders into a vector store
-(Chroma), retrieving relevant document chunks in response to a query, and
-answering questions using a language model. Ingestion splits documents
+(Chroma or the local NumPy engine, see `vector_store`), retrieving
+relevant document chunks in response to a query, and answering questions
+using a language model. Ingestion splits documents
 into chunks and stores embeddings along with metadata. Retrieval fetches
 top-k relevant chunks, which are then used as context in a prompt to
 generate an answer.
@@ -11,132 +12,808 @@ generate an answer.
 
 from __future__ import annotations
 
+import json
+import os
+import threading
+import time
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple
-
-import chromadb
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 from .config import Config
-from .embeddings import get_embedding_function, validate_embeddings
-from .file_discovery import iter_files, is_text_file, is_image_file
-from .parsers.pdf_parser import extract_pdf_text
-from .parsers.docx_parser import extract_docx_text
-from .parsers.md_parser import extract_md_text
-from .parsers.txt_parser import extract_txt_text
-from .parsers.image_parser import ocr_image
-from .chunking import chunk_text
-from .llm.ollama_client import chat
-
-
-def _extract_text(path: Path) -> str:
-    """Helper to select the correct parser for a file."""
-    suffix = path.suffix.lower()
-    if suffix == ".pdf":
-        return extract_pdf_text(path)
-    if suffix == ".docx":
-        return extract_docx_text(path)
-    if suffix == ".md":
-        return extract_md_text(path)
-    if suffix == ".txt":
-        return extract_txt_text(path)
-    if suffix in {".png", ".jpg", ".jpeg"}:
-        return ocr_image(path)
-    raise ValueError(f"Unsupported file type: {suffix}")
-
-
-def _get_chroma_collection(cfg: Config):
-    """Get or create the ChromaDB collection used for document embeddings."""
-    # Use a persistent client so that the vector store is saved on disk
-    client = chromadb.PersistentClient(path=cfg.paths.get("vector_store", "./vector_store"))
-    embed_fn = get_embedding_function(cfg.rag.get("embedding_model"))
-    collection = client.get_or_create_collection(
-        name="documents", embedding_function=embed_fn
-    )
-    return collection, embed_fn
+from .embeddings import as_embedding_array, get_embedding_function
+from .file_discovery import scan_files
+from .manifest import IngestManifest
+from .parallel import parse_files, process_pool, thread_map
+from .extract_cache import ExtractionCache, get_extraction_cache
+from .extraction import extract_text, iter_pdf_text
+from .parsers.image_parser import ocr_unavailable_reason
+from .parsers.pdf_parser import pdf_page_count
+from .embedding_cache import CachedEmbeddingFunction, get_embedding_cache
+from .answer_cache import bump_content_version, get_answer_cache
+from .chunking import ChunkIds, chunk_pages, chunk_text
+from .context import pack_context
+from .lexical_index import INDEX_FILENAME, LexicalIndex, reciprocal_rank_fusion
+from .llm.ollama_client import chat, chat_stream
+from .profiling import profile_iter, span
+from .rerank import mmr
+from .vector_store import VectorStore, open_vector_store
+
+
+def _extract_document(
+    path: Path, cache: Optional[ExtractionCache] = None, ocr_dpi: Optional[int] = 300
+) -> Tuple[object, dict]:
+    """Parse one file for ingest (in a worker process).
+
+    Returns the file's text, or for PDFs its `(page_number, text)` pairs,
+    together with the PDF's OCR stats (empty for other files).
+    """
+    if path.suffix.lower() != ".pdf":
+        return extract_text(path, cache), {}
+    stats: dict = {}
+    return list(iter_pdf_text(path, cache, ocr_dpi=ocr_dpi, stats=stats)), stats
 
 
-def _clear_existing_for_source(collection, source: Path) -> None:
-    """Remove any existing entries for a given source path to avoid duplication on re-ingest."""
+def _page_count(path: Path) -> int:
+    """Page count of a PDF, or 0 if it cannot be read (parsing then reports it)."""
     try:
-        collection.delete(where={"source": str(source)})
-    except Exception as exc:
-        print(f"[WARN] Could not clear existing entries for {source}: {exc}")
+        return pdf_page_count(path)
+    except RuntimeError:
+        return 0
+
+
+_STORES: dict = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _get_vector_store(cfg: Config) -> Tuple[VectorStore, object]:
+    """Get or create the vector store and embedding function for document chunks.
+
+    The backend (`rag.vector_backend`), its storage and the embedding model
+    are created once per vector store path and settings, then reused for the
+    rest of the process so long-running callers (e.g. `serve`) keep them warm.
+    """
+    rag_cfg = cfg.rag
+    store_path = str(Path(cfg.paths.get("vector_store", "./vector_store")).resolve())
+    backend = rag_cfg.get("vector_backend", "chroma")
+    options = {
+        "dtype": rag_cfg.get("vector_dtype", "float32"),
+        "quantization": rag_cfg.get("quantization"),
+        "rescore_factor": rag_cfg.get("rescore_factor", 4),
+    }
+    key = (store_path, rag_cfg.get("embedding_model"), backend, *options.values())
+    with _STORES_LOCK:
+        if key not in _STORES:
+            embed_fn = get_embedding_function(rag_cfg.get("embedding_model"))
+            _STORES[key] = (open_vector_store(backend, Path(store_path), **options), embed_fn)
+        return _STORES[key]
+
+
+def _get_lexical_index(cfg: Config, read_only: bool = False) -> Optional[LexicalIndex]:
+    """Open the BM25 index next to the vector store, or None if disabled.
+
+    With `read_only` (for queries), None is also returned while no index
+    has been built yet.
+    """
+    if not cfg.rag.get("lexical_index", True):
+        return None
+    store_dir = Path(cfg.paths.get("vector_store", "./vector_store"))
+    if read_only and not (store_dir / INDEX_FILENAME).exists():
+        return None
+    return LexicalIndex(store_dir, read_only=read_only)
+
+
+class _SourceDiff:
+    """Reconcile a file's stored chunks with its new chunks as they stream in.
+
+    Chunks are content-addressed (`ChunkIds`), so chunks whose text is
+    unchanged keep their id and embedding; only their metadata (e.g.
+    `chunk_index` or `page`) is updated if it moved. Stored chunks that no
+    longer occur are deleted by `finish`. Ids also hash `namespace` (see
+    `_id_namespace`), so no embedding outlives the settings that made it.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        source: Path,
+        lexical: Optional[LexicalIndex] = None,
+        namespace: str = "",
+    ) -> None:
+        self.store = store
+        self.source = source
+        self.lexical = lexical
+        self.ids = ChunkIds(str(source.resolve()), namespace)
+        try:
+            self.existing = store.source_metadatas(str(source))
+        except Exception as exc:
+            print(f"[WARN] Could not read existing entries for {source}: {exc}")
+            self.existing = {}
+        self.current: set = set()
+        self.moved: List[Tuple[str, dict]] = []
+        self.reused = 0
+
+    def check(self, chunk: str, meta: dict) -> Optional[Tuple[str, str, dict]]:
+        """Return `(id, chunk, meta)` if the chunk needs embedding, else None."""
+        chunk_id = self.ids.next(chunk)
+        self.current.add(chunk_id)
+        previous = self.existing.get(chunk_id)
+        if previous is None:
+            return chunk_id, chunk, meta
+        if previous != meta:
+            self.moved.append((chunk_id, meta))
+        self.reused += 1
+        return None
+
+    def finish(self) -> int:
+        """Delete vanished chunks and apply metadata moves; returns chunks reused."""
+        stale = [chunk_id for chunk_id in self.existing if chunk_id not in self.current]
+        try:
+            if stale:
+                self.store.delete_ids(stale)
+                if self.lexical is not None:
+                    self.lexical.delete_ids(stale)
+            if self.moved:
+                self.store.update_metadatas([i for i, _ in self.moved], [m for _, m in self.moved])
+        except Exception as exc:
+            print(f"[WARN] Could not update existing entries for {self.source}: {exc}")
+        return self.reused
+
+
+def _queue_chunk(batcher: "_IngestBatcher", diff: _SourceDiff, chunk: str, meta: dict) -> None:
+    item = diff.check(chunk, meta)
+    if item is not None:
+        batcher.add(*item)
+
+
+def _id_namespace(params: dict) -> str:
+    """The ingest settings a stored embedding depends on, for chunk ids.
+
+    `vector_dtype` is not one of them: `NumpyVectorStore` converts its
+    stored vectors when it changes.
+    """
+    keys = ("embedding_model", "vector_backend")
+    return json.dumps({key: params.get(key) for key in keys}, sort_keys=True)
 
 
-def ingest_folder(folder: Path, cfg: Config) -> None:
-    """Ingest all supported files in a folder into the vector store."""
-    collection, embed_fn = _get_chroma_collection(cfg)
+def _ingest_params(cfg: Config) -> dict:
+    """Settings that determine the stored chunks; changing any re-indexes files."""
     rag_cfg = cfg.rag
-    chunk_size: int = rag_cfg.get("chunk_size", 1500)
-    overlap: int = rag_cfg.get("chunk_overlap", 200)
+    return {
+        "chunk_size": rag_cfg.get("chunk_size", 1500),
+        "chunk_overlap": rag_cfg.get("chunk_overlap", 200),
+        "embedding_model": rag_cfg.get("embedding_model"),
+        "lexical_index": rag_cfg.get("lexical_index", True),
+        "vector_backend": rag_cfg.get("vector_backend", "chroma"),
+    }
+
+
+def _suffix_params(cfg: Config) -> dict:
+    """Ingest settings that only affect one file type, by suffix."""
+    # 0 while OCR is unavailable, so installing it re-indexes PDFs only.
+    ocr_dpi = cfg.pdf.get("ocr_dpi", 300) if ocr_unavailable_reason() is None else 0
+    return {".pdf": {"pdf_ocr_dpi": ocr_dpi}}
+
+
+class _IngestBatcher:
+    """Buffer chunks and flush them to the vector store in fixed-size batches.
+
+    A file's manifest entry is only recorded once all of its chunks have
+    been written, so an interrupted or failed ingest re-processes just the
+    files whose chunks did not make it into the store. The manifest is
+    written every `SAVE_EVERY` batches and by `close`; files recorded since
+    the last save are re-parsed after a crash, but their chunks are already
+    stored and are reused rather than embedded again.
+
+    `counts` holds the files recorded as `new` or `updated`, and those left
+    out as `failed` because one of their batches could not be stored;
+    `failed_paths` lists the latter.
+    """
+
+    SAVE_EVERY = 16
+
+    def __init__(
+        self,
+        store: VectorStore,
+        embed_fn,
+        manifest: IngestManifest,
+        batch_size: int,
+        lexical: Optional[LexicalIndex] = None,
+    ) -> None:
+        self.store = store
+        self.lexical = lexical
+        self.embed_fn = embed_fn
+        self.manifest = manifest
+        self.batch_size = max(1, batch_size)
+        self.ids: List[str] = []
+        self.docs: List[str] = []
+        self.metadatas: List[dict] = []
+        self.pending: List[dict] = []
+        self.failed_sources: set = set()
+        self.written = 0
+        self.counts = {"new": 0, "updated": 0, "failed": 0}
+        self.failed_paths: List[Path] = []
+        self._unsaved_batches = 0
+
+    def add(self, chunk_id: str, doc: str, metadata: dict) -> None:
+        self.ids.append(chunk_id)
+        self.docs.append(doc)
+        self.metadatas.append(metadata)
+        if len(self.docs) >= self.batch_size:
+            self.flush()
 
-    ids: List[str] = []
-    docs: List[str] = []
-    metadatas: List[dict] = []
+    def finish_file(self, path: Path, fingerprint: dict, status: str) -> None:
+        """Mark a `new` or `updated` file's chunks as fully queued; it is recorded on the next flush."""
+        self.pending.append((path, fingerprint, status))
 
-    for f in iter_files(folder):
-        if not (is_text_file(f) or is_image_file(f)):
-            continue
+    def flush(self) -> None:
+        if self.docs:
+            try:
+                with span("ingest.embed", chunks=len(self.docs)):
+                    embeddings = as_embedding_array(self.embed_fn(self.docs))
+                with span("ingest.store", chunks=len(self.docs)):
+                    self.store.add(
+                        ids=self.ids,
+                        documents=self.docs,
+                        metadatas=self.metadatas,
+                        embeddings=embeddings,
+                    )
+                    if self.lexical is not None:
+                        self.lexical.add(self.ids, self.docs, self.metadatas)
+                self.written += len(self.docs)
+            except Exception as exc:
+                print(f"[ERROR] Failed to embed or store batch of {len(self.docs)} chunks: {exc}")
+                self.failed_sources.update(str(Path(m["source"]).resolve()) for m in self.metadatas)
+            self.ids, self.docs, self.metadatas = [], [], []
+
+        for path, fingerprint, status in self.pending:
+            if fingerprint["path"] in self.failed_sources:
+                self.counts["failed"] += 1
+                self.failed_paths.append(path)
+            else:
+                self.manifest.record(fingerprint)
+                self.counts[status] += 1
+        self.pending = []
+        self._unsaved_batches += 1
+        if self._unsaved_batches >= self.SAVE_EVERY:
+            self._save()
+
+    def close(self) -> None:
+        """Flush the last batch and write the manifest."""
+        self.flush()
+        self._save()
+
+    def _save(self) -> None:
+        with span("ingest.manifest"):
+            self.manifest.save()
+        self._unsaved_batches = 0
+
+
+def ingest_folder(folder: Path, cfg: Config, workers: int = 1, prune: bool = False) -> dict:
+    """Ingest all supported files in a folder into the vector store.
+
+    Files whose fingerprint matches the ingest manifest are skipped; new and
+    modified files are (re-)parsed and chunked. Chunk ids are content
+    addressed, so for a modified file only chunks with new text are embedded
+    and only vanished chunks are deleted. New chunks are streamed into the
+    store in batches of `rag.ingest_batch_size`, so memory stays flat, and
+    the manifest is saved every few batches so an interrupted ingest resumes
+    close to where it stopped.
+
+    Args:
+        folder: Folder to ingest recursively.
+        cfg: Loaded configuration.
+        workers: Number of processes used to parse files in parallel.
+        prune: Afterwards, delete the chunks of stored sources below `folder`
+            that this walk no longer found (see `collect_garbage`).
+
+    Returns:
+        A dict with `new`, `updated`, `skipped`, `deleted`, `failed`,
+        `chunks` (embedded and written) and `reused` (unchanged chunks kept)
+        counts, `ocr_pages` and `ocr_seconds` for scanned PDF pages,
+        embedding cache hit/miss counts when the cache is enabled, and
+        `retry`: the paths (as strings) whose chunks could not be embedded
+        or stored, or whose deletion failed, so a later run may succeed.
+        Files that fail to parse are counted in `failed` but not listed.
+    """
+    discovered = scan_files(
+        folder,
+        ignore=cfg.discovery.get("ignore"),
+        ignore_files=cfg.discovery.get("ignore_files"),
+    )
+    seen: Optional[set] = set() if prune else None
+    counts = _ingest(discovered, cfg, workers, seen=seen)
+
+    # A modified file may reuse all of its chunks, so count files, not chunks.
+    if not (counts["new"] or counts["updated"] or counts["deleted"]):
+        print("[INGEST] No documents to ingest.")
+    else:
+        print(f"[INGEST] Ingested {counts['chunks']} chunks from folder {folder}")
+    print(
+        f"[INGEST] new: {counts['new']}, updated: {counts['updated']}, "
+        f"skipped: {counts['skipped']}, failed: {counts['failed']}, "
+        f"unchanged chunks reused: {counts['reused']}"
+    )
+    if counts["ocr_pages"]:
+        print(
+            f"[INGEST] OCR: {counts['ocr_pages']} scanned pages, "
+            f"{counts['ocr_seconds']:.1f}s of worker time"
+        )
+    if "embedding_cache_hits" in counts:
+        print(
+            f"[INGEST] Embedding cache: {counts['embedding_cache_hits']} hits, "
+            f"{counts['embedding_cache_misses']} misses"
+        )
+    if prune:
+        counts["pruned"] = collect_garbage(cfg, folder=folder, seen=seen)["chunks"]
+    return counts
+
+
+def ingest_changes(
+    folder: Path,
+    changed: Iterable[Path],
+    deleted: Iterable[Path],
+    cfg: Config,
+    workers: int = 1,
+) -> dict:
+    """Apply a set of filesystem changes under `folder` to the vector store.
+
+    Used by watch mode instead of re-walking the folder: changed files go
+    through the same manifest check, parse, chunk and embed path as
+    `ingest_folder`, and deleted files or directories have their chunks and
+    manifest entries removed. A changed path that no longer exists is
+    treated as deleted.
+
+    Args:
+        folder: The ingested root folder; stored sources are relative to it
+            exactly as `ingest_folder` records them.
+        changed: Files created, modified or moved into the folder.
+        deleted: Files or directories removed or moved out of the folder.
+        cfg: Loaded configuration.
+        workers: Number of processes used to parse files in parallel.
+
+    Returns:
+        The same counts as `ingest_folder`.
+    """
+    discovered = []
+    gone = list(deleted)
+    for path in changed:
         try:
-            text = _extract_text(f)
-        except Exception as e:
-            print(f"[ERROR] Failed to parse {f}: {e}")
-            continue
-        # Delete existing entries for this source so repeated ingestion does not duplicate.
-        _clear_existing_for_source(collection, f)
-        chunks = chunk_text(text, max_chars=chunk_size, overlap=overlap)
-        for idx, ch in enumerate(chunks):
+            discovered.append((path, os.stat(path)))
+        except FileNotFoundError:
+            gone.append(path)
+    return _ingest(discovered, cfg, workers, folder=folder, deleted=gone)
+
+
+def _delete_sources(
+    store: VectorStore,
+    lexical: Optional[LexicalIndex],
+    manifest: IngestManifest,
+    sources: List[str],
+) -> None:
+    """Remove many sources' chunks and manifest entries in batched calls."""
+    store.delete_sources(sources)
+    if lexical is not None:
+        lexical.delete_sources(sources)
+    for source in sources:
+        manifest.forget(Path(source))
+    manifest.save()
+
+
+def _dir_bytes(directory: Path) -> int:
+    """Total size of the files below `directory`."""
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def collect_garbage(
+    cfg: Config,
+    folder: Optional[Path] = None,
+    seen: Optional[set] = None,
+    dry_run: bool = False,
+    force: bool = False,
+) -> dict:
+    """Delete the chunks of source files that no longer exist.
+
+    Stored `source` values are reconciled against the filesystem in bulk
+    and orphans are removed with batched deletes from the vector store and
+    the lexical index, together with their manifest entries.
+
+    Without `folder`, a source is orphaned when its path does not exist
+    (relative sources resolve against the working directory, as during
+    ingest). With `folder` and `seen`, the set of files a walk of the folder
+    just found, any source below `folder` that the walk did not find is
+    orphaned, including files that are now ignored.
+
+    If every candidate source looks orphaned, which usually means an
+    unmounted share or the wrong working directory, nothing is deleted
+    unless `force` is set.
+
+    Args:
+        cfg: Loaded configuration.
+        folder: Only consider sources below this folder.
+        seen: Files found below `folder`; required with `folder`.
+        dry_run: Report orphans without deleting them.
+        force: Delete even when every candidate source is orphaned.
+
+    Returns:
+        A dict with `sources` (candidates checked), `orphans`, `chunks`
+        (reclaimed, or reclaimable on a dry run) and the store size in
+        bytes `before` and `after`.
+    """
+    store, _ = _get_vector_store(cfg)
+    store_dir = Path(cfg.paths.get("vector_store", "./vector_store"))
+    with span("gc.scan"):
+        stored = store.sources()
+        if folder is not None:
+            root = Path(folder)
+            candidates = [s for s in stored if Path(s).is_relative_to(root)]
+            orphans = [s for s in candidates if s not in seen]
+        else:
+            candidates = list(stored)
+            orphans = [s for s in candidates if not os.path.exists(s)]
+    chunks = sum(stored[s] for s in orphans)
+    result = {
+        "sources": len(candidates),
+        "orphans": len(orphans),
+        "chunks": chunks,
+        "before": _dir_bytes(store_dir),
+    }
+    action = "would remove" if dry_run else "removing"
+    print(f"[GC] {len(orphans)} of {len(candidates)} sources are gone; {action} {chunks} chunks")
+    if orphans and len(orphans) == len(candidates) and not force and not dry_run:
+        print("[GC] Every stored source is missing; is the folder mounted? Re-run with --force to delete them.")
+        result["chunks"] = 0
+        orphans = []
+    if orphans and not dry_run:
+        lexical = _get_lexical_index(cfg)
+        manifest = IngestManifest(store_dir, _ingest_params(cfg), _suffix_params(cfg))
+        with span("gc.delete", sources=len(orphans)):
+            _delete_sources(store, lexical, manifest, orphans)
+            store.compact()
+        if lexical is not None:
+            lexical.close()
+        bump_content_version(store_dir)
+    result["after"] = _dir_bytes(store_dir)
+    print(
+        f"[GC] Store size: {result['before'] / 1024 / 1024:.1f} MB before, "
+        f"{result['after'] / 1024 / 1024:.1f} MB after"
+    )
+    return result
+
+
+def _deleted_sources(manifest: IngestManifest, folder: Path, paths: List[Path]) -> List[Path]:
+    """Expand deleted files and directories into the ingested sources they held."""
+    root = Path(folder).resolve()
+    sources = []
+    for path in paths:
+        for key in manifest.paths_under(path):
+            sources.append(Path(folder) / os.path.relpath(key, root))
+    return sources
+
+
+def _ingest(
+    discovered: Iterable[Tuple[Path, os.stat_result]],
+    cfg: Config,
+    workers: int,
+    folder: Optional[Path] = None,
+    deleted: Sequence[Path] = (),
+    seen: Optional[set] = None,
+) -> dict:
+    """Remove `deleted` paths under `folder`, then ingest new or modified files.
+
+    Every discovered path is added to `seen`, when given.
+    """
+    store, embed_fn = _get_vector_store(cfg)
+    params = _ingest_params(cfg)
+    chunk_size: int = params["chunk_size"]
+    overlap: int = params["chunk_overlap"]
+    manifest = IngestManifest(
+        Path(cfg.paths.get("vector_store", "./vector_store")), params, _suffix_params(cfg)
+    )
+    namespace = _id_namespace(params)
+    embedding_cache = get_embedding_cache(cfg)
+    if embedding_cache is not None:
+        embed_fn = CachedEmbeddingFunction(embed_fn, embedding_cache)
+    lexical = _get_lexical_index(cfg)
+    batcher = _IngestBatcher(
+        store, embed_fn, manifest, cfg.rag.get("ingest_batch_size", 256), lexical
+    )
+    cache = get_extraction_cache(cfg)
+    pages_per_task = cfg.pdf.get("pages_per_task", 16)
+    fanout_min_pages = cfg.pdf.get("fanout_min_pages", 64)
+    ocr_dpi = cfg.pdf.get("ocr_dpi", 300)
+    extract_fn = partial(_extract_document, cache=cache, ocr_dpi=ocr_dpi)
+    counts = {
+        "new": 0, "updated": 0, "skipped": 0, "deleted": 0, "failed": 0, "chunks": 0, "reused": 0,
+        "ocr_pages": 0, "ocr_seconds": 0.0, "retry": [],
+    }
+    pending: dict = {}
+    large_pdfs: List[Path] = []
+
+    if deleted:
+        with span("ingest.delete", paths=len(deleted)):
+            sources = [str(p) for p in _deleted_sources(manifest, folder, deleted)]
+            try:
+                _delete_sources(store, lexical, manifest, sources)
+                counts["deleted"] = len(sources)
+            except Exception as exc:
+                print(f"[WARN] Could not remove {len(sources)} deleted sources: {exc}")
+                counts["retry"].extend(str(p) for p in deleted)
+
+    def changed_files():
+        for f, stat in profile_iter("ingest.discover", discovered):
+            if seen is not None:
+                seen.add(str(f))
+            with span("ingest.discover"):
+                # Reuse the walker's stat so unchanged files are never stat-ed twice.
+                status, fingerprint = manifest.check(f, stat)
+            if status == "unchanged":
+                counts["skipped"] += 1
+                continue
+            pending[f] = (status, fingerprint)
+            if f.suffix.lower() == ".pdf" and _page_count(f) >= fanout_min_pages:
+                large_pdfs.append(f)
+                continue
+            yield f
+
+    def add_chunks(f: Path, chunks: Iterable[Tuple[str, int, Optional[int]]]) -> int:
+        """Queue `(chunk, first_page, last_page)` chunks of one file; returns chunks reused."""
+        # Only chunks whose content is new get embedded; vanished ones are deleted.
+        diff = _SourceDiff(store, f, lexical, namespace)
+        for idx, (ch, first, last) in enumerate(chunks):
             if not ch.strip():
                 continue
-            ids.append(f"{f.resolve()}#{idx}")
-            docs.append(ch)
-            metadatas.append({"source": str(f), "chunk_index": idx})
+            meta = {"source": str(f), "chunk_index": idx}
+            if first is not None:
+                meta["page"] = first
+                if last != first:
+                    meta["page_end"] = last
+            _queue_chunk(batcher, diff, ch, meta)
+        return diff.finish()
 
-    if not docs:
-        print("[INGEST] No documents to ingest.")
-        return
+    def finish_file(f: Path, status: str, fingerprint, reused: int, ocr: dict) -> None:
+        if ocr.get("ocr_pages"):
+            print(f"[INGEST] OCR {f}: {ocr['ocr_pages']} pages in {ocr['ocr_seconds']:.1f}s")
+            counts["ocr_pages"] += ocr["ocr_pages"]
+            counts["ocr_seconds"] += ocr["ocr_seconds"]
+        counts["reused"] += reused
+        batcher.finish_file(f, fingerprint, status)
+
+    # One pool for the whole ingest: files are parsed in parallel, and PDFs
+    # of at least `fanout_min_pages` pages afterwards stream page by page,
+    # their page ranges spread over the same workers.
+    with process_pool(workers) as pool:
+        # Parse spans time the wait for each parsed file, which includes discovery.
+        parsed = parse_files(changed_files(), extract_fn, workers, pool)
+        for f, result, error in profile_iter("ingest.parse", parsed):
+            status, fingerprint = pending.pop(f)
+            if error is not None:
+                print(f"[ERROR] Failed to parse {f}: {error}")
+                counts["failed"] += 1
+                continue
+            content, ocr = result
+            with span("ingest.chunk"):
+                if isinstance(content, str):
+                    chunks = [(c, None, None) for c in chunk_text(content, chunk_size, overlap)]
+                else:
+                    chunks = list(chunk_pages(content, chunk_size, overlap))
+            del content, result
+            finish_file(f, status, fingerprint, add_chunks(f, chunks), ocr)
+
+        for f in large_pdfs:
+            status, fingerprint = pending.pop(f)
+            ocr: dict = {}
+            try:
+                pages = iter_pdf_text(
+                    f, cache, workers, pages_per_task, ocr_dpi, stats=ocr, pool=pool
+                )
+                reused = add_chunks(
+                    f, chunk_pages(profile_iter("ingest.parse", pages), chunk_size, overlap)
+                )
+            except Exception as exc:
+                print(f"[ERROR] Failed to parse {f}: {exc}")
+                counts["failed"] += 1
+                continue
+            finish_file(f, status, fingerprint, reused, ocr)
+
+    batcher.close()
+    if lexical is not None:
+        lexical.close()
+    counts["chunks"] = batcher.written
+    for key, value in batcher.counts.items():
+        counts[key] += value
+    counts["retry"].extend(str(p) for p in batcher.failed_paths)
+    if counts["new"] or counts["updated"] or counts["deleted"] or counts["chunks"]:
+        # Stored content changed: invalidate cached answers.
+        bump_content_version(manifest.path.parent)
+    if cache is not None:
+        cache.prune()
+    if isinstance(embed_fn, CachedEmbeddingFunction):
+        counts["embedding_cache_hits"] = embed_fn.hits
+        counts["embedding_cache_misses"] = embed_fn.misses
+    return counts
+
+
+NO_CONTEXT_ANSWER = "I couldn't find any relevant content in the vector store."
+CACHED_ANSWER_MARKER = "[cached answer]"
+
+
+def _embed_queries(queries: List[str], cfg: Config) -> np.ndarray:
+    """Embed questions in one batch with the store's embedding model."""
+    _, embed_fn = _get_vector_store(cfg)
+    with span("ask.embed", queries=len(queries)):
+        return as_embedding_array(embed_fn(list(queries)))
+
+
+def _retrieve_many(
+    queries: List[str],
+    cfg: Config,
+    top_k: int,
+    query_embeddings: Optional[np.ndarray] = None,
+) -> List[List[Tuple[str, dict]]]:
+    """Retrieve the top-k documents for several queries in one vector store query.
 
+    All queries are embedded together in a single batch, unless their
+    embeddings are passed in. When
+    `rag.mmr_lambda` is set, `rag.fetch_k` candidates are fetched and
+    re-ranked with Maximal Marginal Relevance. With
+    `rag.retrieval_mode: hybrid`, vector and BM25 rankings are fused with
+    reciprocal rank fusion.
+    """
+    store, _ = _get_vector_store(cfg)
+    hybrid = cfg.rag.get("retrieval_mode", "vector") == "hybrid"
+    n_results = top_k * 2 if hybrid else top_k
+    mmr_lambda = cfg.rag.get("mmr_lambda")
+    if mmr_lambda is not None:
+        # Over-fetch candidates with their vectors for MMR re-ranking.
+        n_keep, n_results = n_results, max(n_results, cfg.rag.get("fetch_k", 50))
+    if query_embeddings is None:
+        query_embeddings = _embed_queries(queries, cfg)
+    with span("ask.search", queries=len(queries)):
+        results = store.query(
+            query_embeddings, n_results=n_results, include_embeddings=mmr_lambda is not None
+        )
+    ids_list: List[List[str]] = results.get("ids") or []  # type: ignore[assignment]
+    docs_list: List[List[str]] = results.get("documents") or []  # type: ignore[assignment]
+    metas_list: List[List[dict]] = results.get("metadatas") or []  # type: ignore[assignment]
+    dists_list: List[List[float]] = results.get("distances") or []  # type: ignore[assignment]
+    retrieved: List[List[Tuple[str, dict]]] = []
+    for idx in range(len(queries)):
+        ids = ids_list[idx] if idx < len(ids_list) else []
+        docs = docs_list[idx] if idx < len(docs_list) else []
+        metas = metas_list[idx] if idx < len(metas_list) else []
+        dists = dists_list[idx] if idx < len(dists_list) else []
+        hits = []
+        for pos, (doc, meta) in enumerate(zip(docs, metas)):
+            meta = dict(meta or {})
+            if pos < len(ids):
+                meta["id"] = ids[pos]
+            if pos < len(dists):
+                meta["distance"] = dists[pos]
+            hits.append((doc, meta))
+        if mmr_lambda is not None and hits:
+            candidates = results["embeddings"][idx][: len(hits)]
+            with span("ask.rerank"):
+                order = mmr(query_embeddings[idx], candidates, n_keep, mmr_lambda)
+            hits = [hits[i] for i in order]
+        retrieved.append(hits)
+    if hybrid:
+        with span("ask.lexical"):
+            retrieved = _fuse_lexical(queries, retrieved, cfg, store, top_k)
+    return retrieved
+
+
+def _fuse_lexical(
+    queries: List[str],
+    retrieved: List[List[Tuple[str, dict]]],
+    cfg: Config,
+    store: VectorStore,
+    top_k: int,
+) -> List[List[Tuple[str, dict]]]:
+    """Fuse vector hits with BM25 hits per query using reciprocal rank fusion."""
+    lexical = _get_lexical_index(cfg, read_only=True)
+    if lexical is None:
+        return [hits[:top_k] for hits in retrieved]
     try:
-        embeddings = embed_fn(docs)
-        validate_embeddings(embeddings)
-    except Exception as exc:
-        print(f"[ERROR] Failed to embed documents: {exc}")
-        return
+        lexical_ids = [[cid for cid, _ in lexical.search(q, top_k * 2)] for q in queries]
+    finally:
+        lexical.close()
 
-    collection.add(ids=ids, documents=docs, metadatas=metadatas, embeddings=embeddings)
-    print(f"[INGEST] Ingested {len(docs)} chunks from folder {folder}")
+    fused_ids: List[List[str]] = []
+    vector_hits: List[dict] = []
+    for hits, lex_ids in zip(retrieved, lexical_ids):
+        # Per query: a chunk's distance is only meaningful for the query that found it.
+        own = {meta["id"]: (doc, meta) for doc, meta in hits if "id" in meta}
+        vector_hits.append(own)
+        fused = reciprocal_rank_fusion([list(own), lex_ids], k=cfg.rag.get("rrf_k", 60))
+        fused_ids.append([cid for cid, _ in fused[:top_k]])
+
+    # Fetch lexical-only hits from the store in one call, shared by all queries.
+    missing = sorted(
+        {cid for ids, own in zip(fused_ids, vector_hits) for cid in ids if cid not in own}
+    )
+    lexical_only: dict = {}
+    if missing:
+        got = store.get(missing)
+        for cid, doc, meta in zip(got.get("ids") or [], got.get("documents") or [], got.get("metadatas") or []):
+            lexical_only[cid] = (doc, {**(meta or {}), "id": cid})
+    return [
+        [own.get(cid) or lexical_only[cid] for cid in ids if cid in own or cid in lexical_only]
+        for ids, own in zip(fused_ids, vector_hits)
+    ]
 
 
-def _retrieve(query: str, cfg: Config, top_k: int) -> List[Tuple[str, dict]]:
+def _retrieve(
+    query: str, cfg: Config, top_k: int, query_embedding=None
+) -> List[Tuple[str, dict]]:
     """Retrieve the top-k most relevant documents from the vector store."""
-    collection, _ = _get_chroma_collection(cfg)
-    results = collection.query(query_texts=[query], n_results=top_k)
-    docs_list: List[List[str]] = results.get("documents", [[]])  # type: ignore[assignment]
-    metas_list: List[List[dict]] = results.get("metadatas", [[]])  # type: ignore[assignment]
-    docs = docs_list[0] if docs_list else []
-    metas = metas_list[0] if metas_list else []
-    return list(zip(docs, metas))
+    embeddings = None if query_embedding is None else as_embedding_array([query_embedding])
+    return _retrieve_many([query], cfg, top_k, query_embeddings=embeddings)[0]
 
 
-def answer_question(question: str, cfg: Config) -> str:
-    """Answer a user question using retrieved context and a language model."""
-    top_k = cfg.rag.get("top_k", 5)
-    model = cfg.model.get("name", "llama3")
-    temp = cfg.model.get("temperature", 0.2)
+def _pack(retrieved: List[Tuple[str, dict]], cfg: Config) -> List[Tuple[str, dict]]:
+    """Merge overlapping neighbours, drop distant hits and apply the prompt budget."""
+    rag_cfg = cfg.rag
+    with span("ask.pack"):
+        return pack_context(
+            retrieved,
+            overlap=rag_cfg.get("chunk_overlap", 200),
+            max_distance=rag_cfg.get("max_distance"),
+            budget_chars=rag_cfg.get("context_budget_chars"),
+        )
 
-    retrieved = _retrieve(question, cfg, top_k=top_k)
-    if not retrieved:
-        return "I couldn't find any relevant content in the vector store."
 
-    context_parts: List[str] = []
-    source_info: List[str] = []
-    for doc, meta in retrieved:
-        context_parts.append(doc)
-        source_info.append(meta.get("source", "unknown"))  # type: ignore[arg-type]
-    context_str = "\n\n---\n\n".join(context_parts)
-    sources_str = "\n".join(sorted(set(source_info)))
+def _page_ranges(pages: List[int]) -> str:
+    """Format sorted page numbers compactly, e.g. `3, 7-9`."""
+    ranges: List[List[int]] = []
+    for page in pages:
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def _sources(retrieved: List[Tuple[str, dict]]) -> List[str]:
+    """Return the sorted, unique source paths of retrieved chunks.
+
+    Chunks of paged documents (PDFs) carry `page`/`page_end` metadata; their
+    sources list the pages used, e.g. `manual.pdf (pages 3, 7-9)`.
+    """
+    pages: Dict[str, set] = {}
+    for _, meta in retrieved:
+        source_pages = pages.setdefault(meta.get("source", "unknown"), set())
+        if meta.get("page") is not None:
+            first = int(meta["page"])
+            source_pages.update(range(first, int(meta.get("page_end", first)) + 1))
+    sources = []
+    for source in sorted(pages):
+        if pages[source]:
+            numbers = sorted(pages[source])
+            label = "page" if len(numbers) == 1 else "pages"
+            sources.append(f"{source} ({label} {_page_ranges(numbers)})")
+        else:
+            sources.append(source)
+    return sources
 
-    prompt = (
+
+def _with_sources(answer: str, sources: List[str]) -> str:
+    """Append the `Sources:` block shown under an answer."""
+    return f"{answer}\n\nSources:\n" + "\n".join(sources)
+
+
+def _build_prompt(question: str, retrieved: List[Tuple[str, dict]]) -> str:
+    """Assemble the RAG prompt from the question and retrieved chunks."""
+    context_str = "\n\n---\n\n".join(doc for doc, _ in retrieved)
+    return (
         "You are a retrieval-augmented assistant. "
         "Answer the user's question using ONLY the context below. "
         "If the answer is not present in the context, say so.\n\n"
@@ -145,6 +822,149 @@ def answer_question(question: str, cfg: Config) -> str:
         "Answer clearly and, at the end, list the file paths you used under 'Sources:'."
     )
 
-    answer = chat(prompt, model=model, temperature=temp)
-    answer += f"\n\nSources:\n{sources_str}"
-    return answer
+
+def _check_answer_cache(question: str, cfg: Config):
+    """Look a question up in the answer cache.
+
+    Returns:
+        A tuple `(cache, embedding, entry)`. `cache` is None when the answer
+        cache is disabled; `entry` is the cached answer on a hit, else None.
+        The question embedding is returned so retrieval can reuse it.
+    """
+    cache = get_answer_cache(cfg)
+    if cache is None:
+        return None, None, None
+    embedding = _embed_queries([question], cfg)[0]
+    with span("ask.cache"):
+        return cache, embedding, cache.lookup(embedding)
+
+
+def answer_question(question: str, cfg: Config) -> str:
+    """Answer a user question using retrieved context and a language model.
+
+    Answers served from the semantic answer cache end with
+    `CACHED_ANSWER_MARKER`.
+    """
+    top_k = cfg.rag.get("top_k", 5)
+    model = cfg.model.get("name", "llama3")
+    temp = cfg.model.get("temperature", 0.2)
+
+    cache, embedding, hit = _check_answer_cache(question, cfg)
+    if hit is not None:
+        return f"{_with_sources(hit['answer'], hit['sources'])}\n\n{CACHED_ANSWER_MARKER}"
+
+    retrieved = _pack(_retrieve(question, cfg, top_k=top_k, query_embedding=embedding), cfg)
+    if not retrieved:
+        return NO_CONTEXT_ANSWER
+
+    sources = _sources(retrieved)
+    answer = chat(_build_prompt(question, retrieved), model=model, temperature=temp)
+    if cache is not None:
+        cache.store(question, embedding, answer, sources)
+    return _with_sources(answer, sources)
+
+
+def iter_answer(question: str, cfg: Config) -> Iterator[str]:
+    """Stream the answer to a question as it is generated.
+
+    Yields the same text as `answer_question`: model output fragments as
+    they arrive, followed by the `Sources:` block once the stream ends.
+    """
+    top_k = cfg.rag.get("top_k", 5)
+    model = cfg.model.get("name", "llama3")
+    temp = cfg.model.get("temperature", 0.2)
+
+    cache, embedding, hit = _check_answer_cache(question, cfg)
+    if hit is not None:
+        yield f"{_with_sources(hit['answer'], hit['sources'])}\n\n{CACHED_ANSWER_MARKER}"
+        return
+
+    retrieved = _pack(_retrieve(question, cfg, top_k=top_k, query_embedding=embedding), cfg)
+    if not retrieved:
+        yield NO_CONTEXT_ANSWER
+        return
+
+    sources = _sources(retrieved)
+    pieces: List[str] = []
+    for piece in chat_stream(_build_prompt(question, retrieved), model=model, temperature=temp):
+        pieces.append(piece)
+        yield piece
+    yield _with_sources("", sources)
+    if cache is not None:
+        cache.store(question, embedding, "".join(pieces), sources)
+
+
+def answer_questions(
+    questions: List[dict], cfg: Config, max_workers: Optional[int] = None
+) -> List[dict]:
+    """Answer many questions with batched retrieval and concurrent generation.
+
+    All questions are embedded and retrieved with a single multi-query
+    vector store call, then answered by the language model with at most
+    `max_workers` requests in flight. Questions found in the semantic
+    answer cache skip retrieval and generation.
+
+    Args:
+        questions: Records with a `question` key; other keys (e.g. `id`)
+            are copied to the output unchanged.
+        cfg: Loaded configuration.
+        max_workers: Maximum concurrent LLM requests. Defaults to
+            `model.max_parallel`.
+
+    Returns:
+        One record per input, in input order, adding `answer`, `sources`,
+        `cached`, `retrieval_ms`, `llm_ms` and `latency_ms` (or `error` on
+        failure).
+    """
+    if not questions:
+        return []
+    top_k = cfg.rag.get("top_k", 5)
+    model = cfg.model.get("name", "llama3")
+    temp = cfg.model.get("temperature", 0.2)
+    workers = max_workers or cfg.model.get("max_parallel", 4)
+    texts = [q["question"] for q in questions]
+    cache = get_answer_cache(cfg)
+
+    start = time.perf_counter()
+    embeddings: Optional[np.ndarray] = _embed_queries(texts, cfg) if cache is not None else None
+    hits: List[Optional[dict]] = [
+        cache.lookup(emb) if cache is not None else None
+        for emb in (embeddings if embeddings is not None else [None] * len(texts))
+    ]
+    misses = [idx for idx, hit in enumerate(hits) if hit is None]
+    retrieved_all: List[List[Tuple[str, dict]]] = [[] for _ in questions]
+    if misses:
+        batch = _retrieve_many(
+            [texts[idx] for idx in misses],
+            cfg,
+            top_k=top_k,
+            query_embeddings=embeddings[misses] if embeddings is not None else None,
+        )
+        for idx, retrieved in zip(misses, batch):
+            retrieved_all[idx] = _pack(retrieved, cfg)
+    # Retrieval is shared by the whole batch; attribute an equal share to each question.
+    retrieval_ms = (time.perf_counter() - start) * 1000 / max(1, len(questions))
+
+    def answer_one(idx: int) -> dict:
+        record, retrieved, hit = questions[idx], retrieved_all[idx], hits[idx]
+        result = {**record, "retrieval_ms": round(retrieval_ms, 2), "cached": hit is not None}
+        llm_start = time.perf_counter()
+        try:
+            if hit is not None:
+                result["answer"], result["sources"] = hit["answer"], hit["sources"]
+            elif retrieved:
+                result["sources"] = _sources(retrieved)
+                result["answer"] = chat(
+                    _build_prompt(record["question"], retrieved), model=model, temperature=temp
+                )
+                if cache is not None:
+                    cache.store(record["question"], embeddings[idx], result["answer"], result["sources"])
+            else:
+                result["answer"], result["sources"] = NO_CONTEXT_ANSWER, []
+        except Exception as exc:
+            result["error"] = str(exc)
+        result["llm_ms"] = round((time.perf_counter() - llm_start) * 1000, 2)
+        result["latency_ms"] = round(result["retrieval_ms"] + result["llm_ms"], 2)
+        return result
+
+    return thread_map(answer_one, list(range(len(questions))), workers)
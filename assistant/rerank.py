@@ -0,0 +1,57 @@
+"""
+Re-ranking of retrieved chunks.
+
+Nearest-neighbour search often returns several near-identical chunks from
+the same file. Maximal Marginal Relevance (MMR) re-ranks an over-fetched
+candidate set so that each pick balances relevance to the query against
+similarity to chunks already picked. All similarities come from one
+batched matrix product; the greedy selection only updates a vector per pick.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+
+def _normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mmr(query_embedding, candidate_embeddings, k: int, lambda_mult: float = 0.5) -> List[int]:
+    """Select `k` candidates by Maximal Marginal Relevance.
+
+    Args:
+        query_embedding: Query vector of shape `(dim,)`.
+        candidate_embeddings: Candidate vectors of shape `(n, dim)`.
+        k: Number of candidates to select.
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0).
+
+    Returns:
+        Indices of the selected candidates, in selection order.
+    """
+    candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+    if candidates.ndim != 2 or not len(candidates):
+        return []
+    k = min(k, len(candidates))
+    vectors = _normalise_rows(candidates)
+    query = _normalise_rows(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+
+    relevance = vectors @ query
+    similarity = vectors @ vectors.T
+    redundancy = np.full(len(vectors), -np.inf, dtype=np.float32)
+    available = np.ones(len(vectors), dtype=bool)
+    selected: List[int] = []
+    for _ in range(k):
+        # Before the first pick there is nothing to be redundant with.
+        penalty = np.where(np.isneginf(redundancy), 0.0, redundancy)
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * penalty
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[:, best])
+    return selected
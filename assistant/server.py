@@ -0,0 +1,175 @@
+"""
+Long-running local API server.
+
+`serve` keeps one process alive that holds the vector store and the
+embedding model in memory, so questions
+skip the several seconds of start-up a fresh `ask` invocation pays. The
+server speaks JSON over HTTP, on a TCP port or a Unix domain socket, and
+handles requests concurrently in threads. Ingest requests are serialised
+so two ingests never write to the store at the same time.
+
+Endpoints:
+
+- `GET /health` returns `{"status": "ok"}`.
+- `POST /ask` with `{"question": "..."}` returns `{"answer": "...", "cached": false}`.
+- `POST /ingest` with `{"folder": "...", "workers": 1}` returns ingest counts.
+- `POST /summary` with `{"file": "..."}` or `{"folder": "...", "workers": 1}`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .config import Config
+from .rag import CACHED_ANSWER_MARKER, _get_vector_store, answer_question, ingest_folder
+from .summarizer import summarize_folder, summarize_single_file
+
+
+class RequestError(Exception):
+    """Raised for malformed client requests (HTTP 400)."""
+
+
+class AssistantHandler(BaseHTTPRequestHandler):
+    """JSON request handler dispatching to the assistant's pipelines."""
+
+    server_version = "AIAssistant/0.1"
+    cfg: Config
+    ingest_lock: threading.Lock
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        print(f"[SERVE] {self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as exc:
+            raise RequestError(f"Invalid JSON body: {exc}") from exc
+        if not isinstance(payload, dict):
+            raise RequestError("Request body must be a JSON object.")
+        return payload
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        routes: Dict[str, Callable[[dict], dict]] = {
+            "/ask": self._handle_ask,
+            "/ingest": self._handle_ingest,
+            "/summary": self._handle_summary,
+        }
+        route = routes.get(self.path)
+        if route is None:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        try:
+            result = route(self._read_json())
+        except RequestError as exc:
+            self._send_json(400, {"error": str(exc)})
+        except Exception as exc:
+            self._send_json(500, {"error": str(exc)})
+        else:
+            self._send_json(200, result)
+
+    def _handle_ask(self, payload: dict) -> dict:
+        question = payload.get("question")
+        if not question:
+            raise RequestError("'question' is required.")
+        answer = answer_question(question, self.cfg)
+        return {"answer": answer, "cached": answer.endswith(CACHED_ANSWER_MARKER)}
+
+    def _handle_ingest(self, payload: dict) -> dict:
+        folder = payload.get("folder")
+        if not folder:
+            raise RequestError("'folder' is required.")
+        with self.ingest_lock:
+            return ingest_folder(Path(folder), self.cfg, workers=int(payload.get("workers", 1)))
+
+    def _handle_summary(self, payload: dict) -> dict:
+        if payload.get("file"):
+            out_path = summarize_single_file(Path(payload["file"]), self.cfg)
+            return {"output": str(out_path)}
+        if payload.get("folder"):
+            summarize_folder(Path(payload["folder"]), self.cfg, workers=int(payload.get("workers", 1)))
+            return {"status": "done"}
+        raise RequestError("'file' or 'folder' is required.")
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix domain socket, one thread per request."""
+
+    daemon_threads = True
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Unlink a socket left behind by an earlier server; refuse to touch anything else."""
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket; refusing to replace it")
+    os.unlink(socket_path)
+
+
+def make_server(
+    cfg: Config,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """Create (but do not start) a server bound to a TCP port or Unix socket."""
+    handler = type(
+        "BoundAssistantHandler",
+        (AssistantHandler,),
+        {"cfg": cfg, "ingest_lock": threading.Lock()},
+    )
+    if socket_path:
+        _remove_stale_socket(socket_path)
+        return ThreadingUnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(
+    cfg: Config,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[str] = None,
+) -> None:
+    """Warm up the vector store and embedding model, then serve until interrupted."""
+    _get_vector_store(cfg)
+    server = make_server(cfg, host=host, port=port, socket_path=socket_path)
+    where = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(f"[SERVE] Listening on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path:
+            _remove_stale_socket(socket_path)
@@ -9,36 +9,25 @@ summaries. The resulting summaries are written to disk in the configured
 output directory.
 """
 
+from functools import partial
 from pathlib import Path
-from typing import List
-
-from .file_discovery import is_text_file, is_image_file, iter_files
-from .parsers.pdf_parser import extract_pdf_text
-from .parsers.docx_parser import extract_docx_text
-from .parsers.md_parser import extract_md_text
-from .parsers.txt_parser import extract_txt_text
-from .parsers.image_parser import ocr_image
+from typing import List, Optional
+
+from .file_discovery import iter_files
+from .extract_cache import ExtractionCache, get_extraction_cache
+from .extraction import extract_text
 from .chunking import chunk_text
 from .llm.ollama_client import chat
 from .config import Config
+from .parallel import parse_files, thread_map
+from .profiling import profile_iter, span
 
 
-def _extract_text_for_file(path: Path) -> str:
+def _extract_text_for_file(
+    path: Path, cache: Optional[ExtractionCache] = None, ocr_dpi: Optional[int] = 300
+) -> str:
     """Determine the correct parser for a file based on its extension."""
-    suffix = path.suffix.lower()
-
-    if suffix == ".pdf":
-        return extract_pdf_text(path)
-    if suffix == ".docx":
-        return extract_docx_text(path)
-    if suffix == ".md":
-        return extract_md_text(path)
-    if suffix == ".txt":
-        return extract_txt_text(path)
-    if suffix in {".png", ".jpg", ".jpeg"}:
-        return ocr_image(path)
-
-    raise ValueError(f"Unsupported file type: {suffix}")
+    return extract_text(path, cache, ocr_dpi)
 
 
 def summarize_text(text: str, cfg: Config) -> str:
@@ -55,25 +44,85 @@ def summarize_text(text: str, cfg: Config) -> str:
     return chat(prompt, model=model, temperature=temp)
 
 
-def summarize_single_file(path: Path, cfg: Config) -> None:
-    """Summarise a single file and write the summary to disk."""
+def _group_by_budget(summaries: List[str], budget: int) -> List[List[str]]:
+    """Pack consecutive summaries into groups whose joined length fits `budget`.
+
+    A summary longer than the budget on its own forms a group by itself.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for summary in summaries:
+        added = len(summary) + (1 if current else 0)  # +1 for the joining newline
+        if current and size + added > budget:
+            groups.append(current)
+            current, size, added = [], 0, len(summary)
+        current.append(summary)
+        size += added
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _reduce_summaries(partial_summaries: List[str], cfg: Config) -> str:
+    """Tree-reduce partial summaries into one, keeping every prompt bounded.
+
+    Each level groups summaries under `summary.reduce_budget_chars`
+    characters and summarises the groups concurrently; levels repeat until
+    a single summary remains. There is always at least one reduce call, so
+    a one-chunk document still gets a final summarisation pass.
+    """
+    budget: int = cfg.summary.get("reduce_budget_chars", 6000)
+    max_parallel: int = cfg.model.get("max_parallel", 4)
+    level: List[str] = partial_summaries or [""]
+    while True:
+        groups = _group_by_budget(level, budget)
+        if len(level) > 1 and len(groups) == len(level):
+            # Every summary exceeds the budget alone; pair them so the tree still shrinks.
+            groups = [level[i:i + 2] for i in range(0, len(level), 2)]
+        level = thread_map(
+            lambda group: summarize_text("\n".join(group), cfg), groups, max_parallel
+        )
+        if len(level) == 1:
+            return level[0]
+
+
+def summarize_single_file(path: Path, cfg: Config, text: Optional[str] = None) -> Path:
+    """Summarise a single file and write the summary to disk.
+
+    Args:
+        path: File to summarise.
+        cfg: Loaded configuration.
+        text: Already-extracted text of the file. If omitted, the file is
+            parsed here.
+
+    Returns:
+        Path of the written summary file.
+    """
     # Extract text using the appropriate parser
-    text = _extract_text_for_file(path)
+    if text is None:
+        with span("summary.parse"):
+            text = _extract_text_for_file(
+                path, get_extraction_cache(cfg), cfg.pdf.get("ocr_dpi", 300)
+            )
     rag_cfg = cfg.rag
     chunk_size: int = rag_cfg.get("chunk_size", 1500)
     chunk_overlap: int = rag_cfg.get("chunk_overlap", 200)
 
     # Split text into chunks for summarisation
-    chunks: List[str] = chunk_text(text, max_chars=chunk_size, overlap=chunk_overlap)
+    with span("summary.chunk"):
+        chunks: List[str] = chunk_text(text, max_chars=chunk_size, overlap=chunk_overlap)
 
-    # Summarise each chunk
-    partial_summaries: List[str] = []
-    for ch in chunks:
-        partial_summaries.append(summarize_text(ch, cfg))
+    # Summarise each chunk, keeping up to `model.max_parallel` requests in flight
+    max_parallel: int = cfg.model.get("max_parallel", 4)
+    with span("summary.map", chunks=len(chunks)):
+        partial_summaries: List[str] = thread_map(
+            lambda ch: summarize_text(ch, cfg), chunks, max_parallel
+        )
 
-    # Combine partial summaries and summarise again for a final result
-    combined = "\n".join(partial_summaries)
-    final_summary = summarize_text(combined, cfg)
+    # Reduce partial summaries level by level into a final result
+    with span("summary.reduce"):
+        final_summary = _reduce_summaries(partial_summaries, cfg)
 
     # Determine output path and ensure the directory exists
     output_folder = Path(cfg.paths.get("output_folder", "./outputs"))
@@ -81,16 +130,33 @@ def summarize_single_file(path: Path, cfg: Config) -> None:
     out_path = output_folder / f"{path.name}.summary.md"
 
     # Write summary
-    out_path.write_text(final_summary, encoding="utf-8")
+    with span("summary.write"):
+        out_path.write_text(final_summary, encoding="utf-8")
 
     print(f"[SUMMARY] {path} -> {out_path}")
+    return out_path
 
 
-def summarize_folder(folder: Path, cfg: Config) -> None:
-    """Summarise all supported files in a folder recursively."""
-    for f in iter_files(folder):
-        if is_text_file(f) or is_image_file(f):
-            try:
-                summarize_single_file(f, cfg)
-            except Exception as e:
-                print(f"[ERROR] Failed to summarise {f}: {e}")
\ No newline at end of file
+def summarize_folder(folder: Path, cfg: Config, workers: int = 1) -> None:
+    """Summarise all supported files in a folder recursively.
+
+    Parsing runs in `workers` processes ahead of summarisation; files are
+    still summarised one at a time in discovery order.
+    """
+    cache = get_extraction_cache(cfg)
+    extract_fn = partial(_extract_text_for_file, cache=cache, ocr_dpi=cfg.pdf.get("ocr_dpi", 300))
+    files = iter_files(
+        folder,
+        ignore=cfg.discovery.get("ignore"),
+        ignore_files=cfg.discovery.get("ignore_files"),
+    )
+    for f, text, error in profile_iter("summary.parse", parse_files(files, extract_fn, workers)):
+        if error is not None:
+            print(f"[ERROR] Failed to summarise {f}: {error}")
+            continue
+        try:
+            summarize_single_file(f, cfg, text=text)
+        except Exception as e:
+            print(f"[ERROR] Failed to summarise {f}: {e}")
+    if cache is not None:
+        cache.prune()
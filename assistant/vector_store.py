@@ -0,0 +1,645 @@
+"""
+Vector store backends for the RAG pipeline.
+
+`VectorStore` is the small interface ingestion and retrieval use: add
+chunks with their embeddings, list or delete source files' chunks, look
+chunks up by id and run nearest-neighbour queries. Two backends implement it:
+
+- `ChromaVectorStore` wraps the persistent ChromaDB `documents` collection.
+- `NumpyVectorStore` keeps normalised float32 or float16 vectors in a
+  memory-mapped file, ids, documents and metadata in a SQLite side table,
+  and answers queries with an exact top-k over one matrix multiply. For
+  collections up to about a million chunks this avoids Chroma's start-up
+  and per-query overhead. Optionally it also keeps int8 or binary codes
+  (see `quantization`) for a coarse first pass whose shortlist is rescored
+  against the full-precision vectors.
+
+Query results use Chroma's column layout (`ids`, `documents`, `metadatas`,
+`distances` and optionally `embeddings`, one list per query) so callers
+handle both backends the same way.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .file_lock import FileLock
+from .quantization import MODES, coarse_scores, quantize_binary, quantize_int8, top_k_indices
+
+# Sources per delete call / SQL statement when removing many files at once.
+DELETE_BATCH = 500
+
+
+class VectorStore:
+    """Interface shared by the vector store backends."""
+
+    def add(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[dict],
+        embeddings,
+    ) -> None:
+        """Store chunks, replacing any existing chunks with the same ids."""
+        raise NotImplementedError
+
+    def delete_source(self, source: str) -> None:
+        """Remove every chunk whose metadata `source` equals `source`."""
+        self.delete_sources([source])
+
+    def delete_sources(self, sources: Sequence[str]) -> None:
+        """Remove every chunk of the given sources, in batched calls."""
+        raise NotImplementedError
+
+    def sources(self) -> Dict[str, int]:
+        """Return the number of stored chunks for every source."""
+        raise NotImplementedError
+
+    def source_metadatas(self, source: str) -> Dict[str, dict]:
+        """Return the metadata of every stored chunk of `source`, keyed by id."""
+        raise NotImplementedError
+
+    def delete_ids(self, ids: Sequence[str]) -> None:
+        """Remove chunks by id."""
+        raise NotImplementedError
+
+    def update_metadatas(self, ids: Sequence[str], metadatas: Sequence[dict]) -> None:
+        """Replace the metadata of stored chunks without touching their embeddings."""
+        raise NotImplementedError
+
+    def compact(self) -> None:
+        """Reclaim space left by deleted chunks, where the backend supports it."""
+
+    def get(self, ids: Sequence[str]) -> dict:
+        """Return `ids`, `documents` and `metadatas` of the stored chunks among `ids`."""
+        raise NotImplementedError
+
+    def query(self, query_embeddings, n_results: int, include_embeddings: bool = False) -> dict:
+        """Return the `n_results` nearest chunks for each query embedding."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Return the number of stored chunks."""
+        raise NotImplementedError
+
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by a persistent ChromaDB collection."""
+
+    def __init__(self, path: Path, name: str = "documents") -> None:
+        import chromadb
+
+        # Use a persistent client so that the vector store is saved on disk. The
+        # pipeline always passes embeddings, so the collection needs no embedding function.
+        self.client = chromadb.PersistentClient(path=str(path))
+        self.collection = self.client.get_or_create_collection(name=name, embedding_function=None)
+
+    def add(self, ids, documents, metadatas, embeddings) -> None:
+        self.collection.upsert(
+            ids=list(ids), documents=list(documents), metadatas=list(metadatas), embeddings=embeddings
+        )
+
+    def delete_source(self, source: str) -> None:
+        self.collection.delete(where={"source": source})
+
+    def delete_sources(self, sources: Sequence[str]) -> None:
+        sources = list(sources)
+        for start in range(0, len(sources), DELETE_BATCH):
+            self.collection.delete(where={"source": {"$in": sources[start:start + DELETE_BATCH]}})
+
+    def sources(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        page = 5000
+        for offset in range(0, self.collection.count(), page):
+            result = self.collection.get(include=["metadatas"], limit=page, offset=offset)
+            for meta in result["metadatas"]:
+                source = str((meta or {}).get("source"))
+                counts[source] = counts.get(source, 0) + 1
+        return counts
+
+    def source_metadatas(self, source: str) -> Dict[str, dict]:
+        result = self.collection.get(where={"source": source}, include=["metadatas"])
+        return dict(zip(result["ids"], result["metadatas"]))
+
+    def delete_ids(self, ids: Sequence[str]) -> None:
+        ids = list(ids)
+        for start in range(0, len(ids), DELETE_BATCH):
+            self.collection.delete(ids=ids[start:start + DELETE_BATCH])
+
+    def update_metadatas(self, ids: Sequence[str], metadatas: Sequence[dict]) -> None:
+        if ids:
+            self.collection.update(ids=list(ids), metadatas=list(metadatas))
+
+    def get(self, ids: Sequence[str]) -> dict:
+        return self.collection.get(ids=list(ids), include=["documents", "metadatas"])
+
+    def query(self, query_embeddings, n_results: int, include_embeddings: bool = False) -> dict:
+        include = ["documents", "metadatas", "distances"]
+        if include_embeddings:
+            include.append("embeddings")
+        return self.collection.query(
+            query_embeddings=query_embeddings, n_results=n_results, include=include
+        )
+
+    def count(self) -> int:
+        return self.collection.count()
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact-search vector store on memory-mapped NumPy arrays.
+
+    Vectors are L2-normalised and appended to `vectors.bin` in row order;
+    `meta.json` records their dimension and dtype, and the file is
+    converted when `dtype` changes. The SQLite table `chunks` maps each
+    live row to its id, source, document and JSON metadata. Deleting a
+    chunk removes its table row and leaves a dead vector row behind, which
+    queries mask out; the vector file is compacted once dead rows outnumber
+    live ones.
+
+    Several processes may share a store (e.g. `serve` while `ingest`
+    runs). Writers hold a lock file (`store.lock`) and number new rows
+    from the length of the vector file, so appends from different
+    processes never share a row. Rows that were written but never
+    committed (another writer's trailing deletes, an interrupted add) stay
+    behind as dead rows. Before reading vectors, the store checks SQLite's
+    `data_version` and the data files' stats, and reloads its row count,
+    live mask and memory maps when another process has changed them.
+
+    With `quantization` set to `int8` or `binary`, compact codes are kept
+    next to the vectors. Queries score the codes, keep the best
+    `k * rescore_factor` rows and rescore only those exactly, so the
+    full-precision file is touched for a handful of rows per query.
+
+    Distances are squared L2 distances between normalised vectors
+    (`2 - 2 * cosine`), matching Chroma's default space so
+    `rag.max_distance` means the same thing for both backends.
+    """
+
+    DTYPES = {"float32": np.float32, "float16": np.float16}
+    BLOCK_ROWS = 65536
+
+    def __init__(
+        self,
+        directory: Path,
+        dtype: str = "float32",
+        quantization: Optional[str] = None,
+        rescore_factor: int = 4,
+    ) -> None:
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported vector dtype {dtype!r}; use one of {sorted(self.DTYPES)}.")
+        if quantization is not None and quantization not in MODES:
+            raise ValueError(f"Unknown quantization {quantization!r}; expected one of {MODES}.")
+        self.quantization = quantization
+        self.rescore_factor = max(1, rescore_factor)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / "vectors.bin"
+        self.meta_path = self.directory / "meta.json"
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(self.directory / "store.lock")
+        self.conn = sqlite3.connect(self.directory / "chunks.sqlite3", check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, source TEXT NOT NULL,
+                document TEXT NOT NULL, metadata TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_source ON chunks(source);
+            """
+        )
+        self._rows = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._live: Optional[np.ndarray] = None
+        self._state: tuple = ()
+        with self._file_lock:
+            meta = self._read_meta()
+            stored = meta.get("dtype")
+            if stored is None and self.dim is not None:
+                stored = self._adopt_legacy_file(dtype)
+            self.dtype_name = stored or dtype
+            self.dtype = np.dtype(self.DTYPES[self.dtype_name])
+            self._sync_files()
+            if self.dim is not None and self.dtype_name != dtype:
+                self._convert(dtype)
+            elif self.dim is not None and stored != meta.get("dtype"):
+                self._write_meta()
+
+    def _read_meta(self) -> dict:
+        meta = {}
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        self.dim = meta.get("dim")
+        return meta
+
+    def _write_meta(self) -> None:
+        meta = {"dim": self.dim, "dtype": self.dtype_name}
+        self.meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    def _adopt_legacy_file(self, dtype: str) -> str:
+        """Rename a `vectors.<dtype>` file from older versions to `vectors.bin`."""
+        for name in [dtype] + [d for d in self.DTYPES if d != dtype]:
+            legacy = self.directory / f"vectors.{name}"
+            if legacy.exists():
+                os.replace(legacy, self.vectors_path)
+                return name
+        return dtype
+
+    def _convert(self, dtype: str) -> None:
+        """Rewrite the vector file in `dtype`, block by block."""
+        target = np.dtype(self.DTYPES[dtype])
+        vectors = self._vectors()
+        tmp_path = self.vectors_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as fh:
+            for start in range(0, len(vectors), self.BLOCK_ROWS):
+                fh.write(np.asarray(vectors[start:start + self.BLOCK_ROWS]).astype(target).tobytes())
+        self._invalidate()
+        os.replace(tmp_path, self.vectors_path)
+        self.dtype_name, self.dtype = dtype, target
+        self._write_meta()
+        self._state = self._current_state()
+
+    def _current_state(self) -> tuple:
+        """What another process changes when it writes: the database and data files."""
+        (version,) = self.conn.execute("PRAGMA data_version").fetchone()
+        files = []
+        for path in [self.vectors_path] + [path for path, _, _ in self._code_files()]:
+            try:
+                st = os.stat(path)
+                files.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except FileNotFoundError:
+                files.append(None)
+        return (version, *files)
+
+    def _file_rows(self) -> int:
+        """Complete rows in the vector file."""
+        if self.dim is None or not self.vectors_path.exists():
+            return 0
+        return self.vectors_path.stat().st_size // (self.dim * self.dtype.itemsize)
+
+    def _refresh(self) -> None:
+        """Reload rows and memory maps if another process changed the store."""
+        state = self._current_state()
+        if state == self._state:
+            return
+        meta = self._read_meta()
+        if meta.get("dtype"):
+            self.dtype_name = meta["dtype"]
+            self.dtype = np.dtype(self.DTYPES[self.dtype_name])
+        self._rows = self._file_rows()
+        self._invalidate()
+        self._state = self._current_state()
+
+    def _code_files(self) -> List[tuple]:
+        """`(path, dtype, width)` of each file holding the quantised codes."""
+        if self.quantization is None or self.dim is None:
+            return []
+        if self.quantization == "int8":
+            return [
+                (self.directory / "codes.int8", np.dtype(np.int8), self.dim),
+                (self.directory / "scales.f32", np.dtype(np.float32), 1),
+            ]
+        return [(self.directory / "codes.binary", np.dtype(np.uint8), (self.dim + 7) // 8)]
+
+    def _encode(self, vectors: np.ndarray) -> List[bytes]:
+        """Quantised codes of normalised vectors, one buffer per code file."""
+        if self.quantization == "int8":
+            codes, scales = quantize_int8(vectors)
+            return [codes.tobytes(), scales.tobytes()]
+        if self.quantization == "binary":
+            return [quantize_binary(vectors).tobytes()]
+        return []
+
+    def _rebuild_codes(self) -> None:
+        """Re-encode every stored vector, e.g. after quantization was switched on."""
+        vectors = self._vectors()
+        # Written aside and swapped in, so other processes' maps stay valid.
+        paths = [(path, path.with_suffix(path.suffix + ".tmp")) for path, _, _ in self._code_files()]
+        handles = [open(tmp_path, "wb") for _, tmp_path in paths]
+        try:
+            for start in range(0, len(vectors), self.BLOCK_ROWS):
+                block = np.asarray(vectors[start:start + self.BLOCK_ROWS], dtype=np.float32)
+                for fh, data in zip(handles, self._encode(block)):
+                    fh.write(data)
+        finally:
+            for fh in handles:
+                fh.close()
+        for path, tmp_path in paths:
+            os.replace(tmp_path, path)
+        self._invalidate()
+        self._state = self._current_state()
+
+    def _sync_files(self) -> None:
+        """Take the row count from the vector file and bring the code files in line.
+
+        Must be called with the file lock held, so no other writer is midway
+        through an append.
+        """
+        self._rows = self._file_rows()
+        self._invalidate()
+        if self.dim is not None:
+            row_bytes = self.dim * self.dtype.itemsize
+            if self.vectors_path.exists() and self.vectors_path.stat().st_size != self._rows * row_bytes:
+                # Drop the partial row of an interrupted append.
+                os.truncate(self.vectors_path, self._rows * row_bytes)
+            stale_codes = False
+            for path, dtype, width in self._code_files():
+                expected = self._rows * width * dtype.itemsize
+                size = path.stat().st_size if path.exists() else 0
+                if size > expected:
+                    os.truncate(path, expected)
+                elif size < expected:
+                    stale_codes = True
+            if stale_codes:
+                self._rebuild_codes()
+        self._state = self._current_state()
+
+    def _invalidate(self) -> None:
+        self._matrix = None
+        self._codes = None
+        self._scales = None
+        self._live = None
+
+    def _code_arrays(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Memory-mapped `(codes, scales)`; `scales` is None for binary codes."""
+        if self._codes is None:
+            arrays = [
+                np.memmap(path, dtype=dtype, mode="r", shape=(self._rows, width))
+                for path, dtype, width in self._code_files()
+            ]
+            self._codes = arrays[0]
+            self._scales = arrays[1][:, 0] if len(arrays) > 1 else None
+        return self._codes, self._scales
+
+    def _vectors(self) -> np.ndarray:
+        if self._matrix is None:
+            if not self._rows or self.dim is None:
+                self._matrix = np.zeros((0, self.dim or 0), dtype=self.dtype)
+            else:
+                self._matrix = np.memmap(
+                    self.vectors_path, dtype=self.dtype, mode="r", shape=(self._rows, self.dim)
+                )
+        return self._matrix
+
+    def _live_mask(self) -> np.ndarray:
+        if self._live is None:
+            live = np.zeros(self._rows, dtype=bool)
+            rows = np.fromiter((r for (r,) in self.conn.execute("SELECT row FROM chunks")), dtype=np.int64)
+            # Rows past the mapped file belong to a compaction still being committed.
+            live[rows[rows < self._rows]] = True
+            self._live = live
+        return self._live
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def live_vectors(self) -> np.ndarray:
+        """All stored (normalised) vectors of live rows as float32, in row order."""
+        with self._lock:
+            self._refresh()
+            if not self._rows:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            return np.asarray(self._vectors()[self._live_mask()], dtype=np.float32)
+
+    def vector_rows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The stored (normalised) vectors of all rows, memory-mapped, and the live-row mask.
+
+        Rows of deleted chunks stay in the matrix until compaction; use the
+        mask to skip them.
+        """
+        with self._lock:
+            self._refresh()
+            return self._vectors(), self._live_mask()
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def add(self, ids, documents, metadatas, embeddings) -> None:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("Expected one embedding per chunk.")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        with self._lock, self._file_lock:
+            self._refresh()
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_meta()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dim}.")
+            self._sync_files()
+            with open(self.vectors_path, "ab") as fh:
+                fh.write(vectors.astype(self.dtype).tobytes())
+            for (path, _, _), data in zip(self._code_files(), self._encode(vectors)):
+                with open(path, "ab") as fh:
+                    fh.write(data)
+            first = self._rows
+            with self.conn:
+                self._delete_ids(ids)
+                self.conn.executemany(
+                    "INSERT INTO chunks VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (first + pos, chunk_id, str(meta.get("source")), doc, json.dumps(meta))
+                        for pos, (chunk_id, doc, meta) in enumerate(zip(ids, documents, metadatas))
+                    ],
+                )
+            self._rows += len(ids)
+            self._invalidate()
+            self._state = self._current_state()
+            self._maybe_compact()
+
+    def _delete_ids(self, ids: Sequence[str]) -> None:
+        ids = list(ids)
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            self.conn.execute(f"DELETE FROM chunks WHERE id IN ({','.join('?' * len(batch))})", batch)
+
+    def delete_sources(self, sources: Sequence[str]) -> None:
+        sources = list(sources)
+        with self._lock:
+            with self.conn:
+                for start in range(0, len(sources), DELETE_BATCH):
+                    batch = sources[start:start + DELETE_BATCH]
+                    self.conn.execute(
+                        f"DELETE FROM chunks WHERE source IN ({','.join('?' * len(batch))})", batch
+                    )
+            self._invalidate()
+            self._maybe_compact()
+
+    def sources(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.conn.execute("SELECT source, COUNT(*) FROM chunks GROUP BY source"))
+
+    def source_metadatas(self, source: str) -> Dict[str, dict]:
+        with self._lock:
+            rows = self.conn.execute("SELECT id, metadata FROM chunks WHERE source = ?", (source,))
+            return {chunk_id: json.loads(meta) for chunk_id, meta in rows}
+
+    def delete_ids(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            with self.conn:
+                self._delete_ids(ids)
+            self._invalidate()
+            self._maybe_compact()
+
+    def update_metadatas(self, ids: Sequence[str], metadatas: Sequence[dict]) -> None:
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE chunks SET metadata = ? WHERE id = ?",
+                    [(json.dumps(meta), chunk_id) for chunk_id, meta in zip(ids, metadatas)],
+                )
+
+    def _maybe_compact(self) -> None:
+        self._refresh()
+        live = self.count()
+        if self._rows - live <= max(live, 1024):
+            return
+        self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the vector file without dead rows."""
+        with self._lock, self._file_lock:
+            self._sync_files()
+            rows = [r for (r,) in self.conn.execute("SELECT row FROM chunks ORDER BY row")]
+            tmp_path = self.vectors_path.with_suffix(self.vectors_path.suffix + ".tmp")
+            vectors = self._vectors()
+            with open(tmp_path, "wb") as fh:
+                for start in range(0, len(rows), self.BLOCK_ROWS):
+                    fh.write(np.ascontiguousarray(vectors[rows[start:start + self.BLOCK_ROWS]]).tobytes())
+            self._invalidate()
+            with self.conn:
+                # Shift rows down in order; new row numbers never collide with pending old ones.
+                self.conn.executemany(
+                    "UPDATE chunks SET row = ? WHERE row = ?", [(new, old) for new, old in enumerate(rows)]
+                )
+                os.replace(tmp_path, self.vectors_path)
+            self._rows = len(rows)
+            self._state = self._current_state()
+            if self.quantization is not None:
+                self._rebuild_codes()
+
+    def _fetch_rows(self, rows: Sequence[int]) -> Dict[int, tuple]:
+        found: Dict[int, tuple] = {}
+        rows = [int(r) for r in rows]
+        for start in range(0, len(rows), 500):
+            batch = rows[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            for row, chunk_id, doc, meta in self.conn.execute(
+                f"SELECT row, id, document, metadata FROM chunks WHERE row IN ({marks})", batch
+            ):
+                found[row] = (chunk_id, doc, json.loads(meta))
+        return found
+
+    def get(self, ids: Sequence[str]) -> dict:
+        result: dict = {"ids": [], "documents": [], "metadatas": []}
+        ids = list(ids)
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                marks = ",".join("?" * len(batch))
+                for chunk_id, doc, meta in self.conn.execute(
+                    f"SELECT id, document, metadata FROM chunks WHERE id IN ({marks})", batch
+                ):
+                    result["ids"].append(chunk_id)
+                    result["documents"].append(doc)
+                    result["metadatas"].append(json.loads(meta))
+        return result
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """Similarity of every stored row with every query, `(rows, queries)`.
+
+        Exact cosine similarity, or the coarse code score when quantised.
+        """
+        if self.quantization is not None:
+            codes, scales = self._code_arrays()
+        else:
+            codes, scales = self._vectors(), None
+        scores = np.empty((self._rows, len(queries)), dtype=np.float32)
+        for start in range(0, self._rows, self.BLOCK_ROWS):
+            end = start + self.BLOCK_ROWS
+            if self.quantization is not None:
+                block_scales = None if scales is None else scales[start:end]
+                block = coarse_scores(self.quantization, codes[start:end], queries, block_scales)
+            else:
+                block = np.asarray(codes[start:end], dtype=np.float32) @ queries.T
+            scores[start:start + len(block)] = block
+        scores[~self._live_mask()] = -np.inf
+        return scores
+
+    def _search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k rows and their exact cosine similarities, each `(k, queries)`."""
+        scores = self._scores(queries)
+        if self.quantization is None:
+            top = top_k_indices(scores, k)
+            return top, np.take_along_axis(scores, top, axis=0)
+        # Rescore the coarse shortlist against the full-precision vectors.
+        live = int(self._live_mask().sum())
+        shortlist = top_k_indices(scores, min(live, k * self.rescore_factor))
+        vectors = self._vectors()
+        exact = np.stack(
+            [np.asarray(vectors[shortlist[:, q]], dtype=np.float32) @ queries[q] for q in range(len(queries))],
+            axis=1,
+        )
+        best = top_k_indices(exact, k)
+        return np.take_along_axis(shortlist, best, axis=0), np.take_along_axis(exact, best, axis=0)
+
+    def query(self, query_embeddings, n_results: int, include_embeddings: bool = False) -> dict:
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+        result: dict = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if include_embeddings:
+            result["embeddings"] = []
+        with self._lock:
+            self._refresh()
+            live = int(self._live_mask().sum()) if self._rows else 0
+            k = min(n_results, live)
+            if not k or self.dim is None:
+                for column in result.values():
+                    column.extend([] for _ in range(len(queries)))
+                return result
+            if queries.shape[1] != self.dim:
+                raise ValueError(f"Query dimension {queries.shape[1]} does not match store dimension {self.dim}.")
+            top, top_scores = self._search(queries, k)
+            records = self._fetch_rows(np.unique(top))
+            vectors = self._vectors()
+            for q in range(len(queries)):
+                rows = top[:, q]
+                result["ids"].append([records[r][0] for r in rows])
+                result["documents"].append([records[r][1] for r in rows])
+                result["metadatas"].append([records[r][2] for r in rows])
+                result["distances"].append((2.0 - 2.0 * top_scores[:, q]).tolist())
+                if include_embeddings:
+                    result["embeddings"].append(np.asarray(vectors[rows], dtype=np.float32))
+        return result
+
+
+def open_vector_store(
+    backend: str,
+    directory: Path,
+    dtype: str = "float32",
+    quantization: Optional[str] = None,
+    rescore_factor: int = 4,
+) -> VectorStore:
+    """Create the vector store backend named by `rag.vector_backend`."""
+    if backend == "chroma":
+        return ChromaVectorStore(directory)
+    if backend == "numpy":
+        return NumpyVectorStore(
+            Path(directory) / "numpy", dtype=dtype, quantization=quantization, rescore_factor=rescore_factor
+        )
+    raise ValueError(f"Unknown vector backend {backend!r}; expected 'chroma' or 'numpy'.")
@@ -0,0 +1,422 @@
+"""
+Watch mode for `ingest --watch`.
+
+`watch_folder` keeps the vector store in step with a folder as files
+change. Filesystem events come from Linux inotify (`InotifyWatcher`,
+through `ctypes`, one watch per directory) or, where inotify is not
+available or runs out of watches, from `PollingWatcher`, which re-scans
+the folder every few seconds and compares sizes and modification times.
+
+Events are debounced: paths are collected until the folder has been quiet
+for `debounce` seconds (or `max_delay` seconds have passed since the first
+pending event), and each batch is applied with `rag.ingest_changes`, which
+runs the usual parse/chunk/embed path for changed files and deletes the
+chunks of removed ones. Only directories created or moved into the folder
+are scanned; the tree is never re-walked while inotify is in use, except
+after an event-queue overflow. If a watch cannot be added for such a
+directory (e.g. `fs.inotify.max_user_watches` is exhausted), its files are
+still reported and `watch_folder` switches to polling from then on. Files
+whose chunks cannot be embedded or stored (e.g. the store's disk is full),
+or a whole batch whose ingest raises, are kept and retried after
+`max_delay` seconds.
+
+Ignore files are read when a directory is first watched; edits to them
+take effect on the next start.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import Config
+from .file_discovery import (
+    IgnoreRule,
+    SUPPORTED_EXTS,
+    ignore_rules,
+    is_ignored,
+    scan_files,
+    scan_tree,
+)
+from .rag import ingest_changes, ingest_folder
+
+# Event kinds reported by the watchers.
+CHANGED = "changed"
+DELETED = "deleted"
+
+Event = Tuple[str, Path]
+
+# Seconds between scans when inotify cannot be used.
+FALLBACK_POLL_INTERVAL = 5.0
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+_WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_ONLYDIR
+    | IN_EXCL_UNLINK
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 1 << 16
+
+
+def _load_libc():
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("inotify is not available on this platform")
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher for a folder (Linux only).
+
+    Args:
+        folder: Root folder to watch.
+        extensions: File suffixes to report.
+        ignore: Ignore patterns, as for `file_discovery.scan_files`.
+        ignore_files: Ignore file names, as for `file_discovery.scan_files`.
+
+    Raises:
+        OSError: If inotify is unavailable or the initial watches cannot be
+            added (e.g. `fs.inotify.max_user_watches` is exhausted). A watch
+            that fails later is recorded in `degraded` instead.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        extensions: Iterable[str] = SUPPORTED_EXTS,
+        ignore: Optional[Iterable[str]] = None,
+        ignore_files: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.folder = Path(folder)
+        self.extensions = {e.lower() for e in extensions}
+        self.ignore_files = ignore_files
+        self._libc = _load_libc()
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+        # wd -> (directory, path relative to the root, rules for its entries)
+        self.watches: Dict[int, Tuple[Path, str, List[IgnoreRule]]] = {}
+        self._rules = ignore_rules(ignore)
+        self.degraded: Optional[OSError] = None
+        self._started = False
+        try:
+            self._add_tree(self.folder, "", self._rules)
+        except OSError:
+            self.close()
+            raise
+        self._started = True
+
+    def _add_watch(self, directory: Path, rel_dir: str, rules: List[IgnoreRule]) -> None:
+        mask = _WATCH_MASK | (IN_DONT_FOLLOW if rel_dir else 0)
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            exc = OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+            if not self._started:
+                raise exc
+            # Keep scanning so the files below are still reported.
+            if self.degraded is None:
+                print(f"[WARN] {exc}")
+                self.degraded = exc
+            return
+        self.watches[wd] = (directory, rel_dir, rules)
+
+    def _add_tree(self, directory: Path, rel_dir: str, rules: List[IgnoreRule]) -> List[Path]:
+        """Watch a directory and its subdirectories; return the wanted files in it."""
+        files = scan_tree(
+            directory, rel_dir, rules, self.extensions, self.ignore_files, on_dir=self._add_watch
+        )
+        return [path for path, _ in files]
+
+    def _remove_tree(self, directory: Path) -> None:
+        """Drop watches for a directory moved out of the tree and everything below it."""
+        prefix = str(directory) + os.sep
+        for wd, (path, _, _) in list(self.watches.items()):
+            if path == directory or str(path).startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                self.watches.pop(wd, None)
+
+    def read(self, timeout: float) -> List[Event]:
+        """Wait up to `timeout` seconds and return the events that arrived."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+        events: List[Event] = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            events.extend(self._translate(wd, mask, name))
+        return events
+
+    def _translate(self, wd: int, mask: int, name: str) -> List[Event]:
+        if mask & IN_Q_OVERFLOW:
+            print("[WATCH] Event queue overflowed; rescanning the folder")
+            return self._rescan()
+        if mask & IN_IGNORED:
+            self.watches.pop(wd, None)
+            return []
+        watch = self.watches.get(wd)
+        if watch is None or not name:
+            return []
+        directory, rel_dir, rules = watch
+        path = directory / name
+        rel_path = f"{rel_dir}/{name}" if rel_dir else name
+        if mask & IN_ISDIR:
+            if is_ignored(rules, rel_path, True):
+                return []
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    return [(CHANGED, p) for p in self._add_tree(path, rel_path, rules)]
+                except OSError as exc:
+                    print(f"[WARN] {exc}")
+                    return []
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._remove_tree(path)
+                return [(DELETED, path)]
+            return []
+        if os.path.splitext(name)[1].lower() not in self.extensions:
+            return []
+        if is_ignored(rules, rel_path, False):
+            return []
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            return [(DELETED, path)]
+        return [(CHANGED, path)]
+
+    def _rescan(self) -> List[Event]:
+        """Rebuild all watches after an overflow and report every file as changed."""
+        for wd in list(self.watches):
+            self._libc.inotify_rm_watch(self.fd, wd)
+        self.watches.clear()
+        return [(CHANGED, p) for p in self._add_tree(self.folder, "", self._rules)]
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Portable fallback that re-scans the folder every `interval` seconds.
+
+    Args:
+        folder: Root folder to watch.
+        interval: Seconds between scans.
+        extensions, ignore, ignore_files: As for `file_discovery.scan_files`.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        interval: float = 5.0,
+        extensions: Iterable[str] = SUPPORTED_EXTS,
+        ignore: Optional[Iterable[str]] = None,
+        ignore_files: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.folder = Path(folder)
+        self.interval = interval
+        self.scan_args = (set(extensions), ignore, ignore_files)
+        self.snapshot = self._scan()
+        self.next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        return {
+            path: (st.st_size, st.st_mtime_ns)
+            for path, st in scan_files(self.folder, *self.scan_args)
+        }
+
+    def read(self, timeout: float) -> List[Event]:
+        """Wait until the next scan is due (at most `timeout` seconds) and diff it."""
+        wait = self.next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(0.0, wait))
+        self.next_scan = time.monotonic() + self.interval
+        current = self._scan()
+        events: List[Event] = [
+            (CHANGED, path) for path, sig in current.items() if self.snapshot.get(path) != sig
+        ]
+        events.extend((DELETED, path) for path in self.snapshot.keys() - current.keys())
+        self.snapshot = current
+        return events
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(folder: Path, cfg: Config, poll_interval: Optional[float] = None):
+    """Return an inotify watcher, or a polling one if inotify is unusable or forced.
+
+    Args:
+        folder: Root folder to watch.
+        cfg: Loaded configuration (`discovery` settings).
+        poll_interval: Force polling with this interval in seconds.
+    """
+    ignore = cfg.discovery.get("ignore")
+    ignore_files = cfg.discovery.get("ignore_files")
+    if poll_interval is None:
+        try:
+            return InotifyWatcher(folder, ignore=ignore, ignore_files=ignore_files)
+        except OSError as exc:
+            print(f"[WATCH] inotify unavailable ({exc}); polling every {FALLBACK_POLL_INTERVAL:g}s instead")
+            poll_interval = FALLBACK_POLL_INTERVAL
+    return PollingWatcher(folder, poll_interval, ignore=ignore, ignore_files=ignore_files)
+
+
+def watch_folder(
+    folder: Path,
+    cfg: Config,
+    workers: int = 1,
+    debounce: float = 1.0,
+    max_delay: float = 10.0,
+    poll_interval: Optional[float] = None,
+    stop: Optional[threading.Event] = None,
+    prune: bool = False,
+) -> None:
+    """Ingest a folder, then keep applying its changes until stopped.
+
+    Watches are installed before the initial ingest, so nothing that changes
+    during it is missed.
+
+    Args:
+        folder: Folder to ingest and watch.
+        cfg: Loaded configuration.
+        workers: Number of processes used to parse files in parallel.
+        debounce: Quiet period (seconds) that ends a burst of events.
+        max_delay: Longest time (seconds) an event waits while bursts continue.
+        poll_interval: Force the polling watcher with this interval.
+        stop: Optional event that ends the loop when set (Ctrl-C also does).
+        prune: Garbage-collect stale sources after the initial ingest.
+    """
+    watcher = open_watcher(folder, cfg, poll_interval)
+    pending: Dict[Path, str] = {}
+    first = last = retry_at = 0.0
+    try:
+        ingest_folder(folder, cfg, workers=workers, prune=prune)
+        print(f"[WATCH] Watching {folder} for changes (Ctrl-C to stop)")
+        while stop is None or not stop.is_set():
+            events = watcher.read(min(debounce, 0.5))
+            if getattr(watcher, "degraded", None) is not None:
+                watcher, drained = _fall_back_to_polling(watcher, folder, cfg)
+                events.extend(drained)
+            now = time.monotonic()
+            if events:
+                if not pending:
+                    first = now
+                last = now
+                for kind, path in events:
+                    pending[path] = kind
+            if (
+                pending
+                and now >= retry_at
+                and (now - last >= debounce or now - first >= max_delay)
+            ):
+                pending = _apply(folder, pending, cfg, workers)
+                if pending:
+                    first = last = now
+                    retry_at = now + max_delay
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    if pending:
+        _apply(folder, pending, cfg, workers)
+    print("[WATCH] Stopped")
+
+
+def _fall_back_to_polling(
+    watcher: InotifyWatcher, folder: Path, cfg: Config
+) -> Tuple[PollingWatcher, List[Event]]:
+    """Replace an inotify watcher that could not watch every directory.
+
+    The polling snapshot is taken before the inotify queue is drained, so
+    changes in watched directories are either among the returned events or
+    seen by polling. Files in unwatched directories may have changed unseen
+    before the snapshot, so they are all reported as changed.
+    """
+    print(f"[WATCH] Falling back to polling every {FALLBACK_POLL_INTERVAL:g}s")
+    poller = PollingWatcher(
+        folder,
+        FALLBACK_POLL_INTERVAL,
+        ignore=cfg.discovery.get("ignore"),
+        ignore_files=cfg.discovery.get("ignore_files"),
+    )
+    watched = {directory for directory, _, _ in watcher.watches.values()}
+    events: List[Event] = [(CHANGED, p) for p in poller.snapshot if p.parent not in watched]
+    while True:
+        batch = watcher.read(0)
+        if not batch:
+            break
+        events.extend(batch)
+    watcher.close()
+    return poller, events
+
+
+def _apply(
+    folder: Path, pending: Dict[Path, str], cfg: Config, workers: int
+) -> Dict[Path, str]:
+    """Ingest one batch of changes; return the changes that should be retried.
+
+    Those are the whole batch if ingesting raised, otherwise the paths the
+    ingest reports in `retry` (chunks that could not be embedded or stored,
+    deletions that failed). Files that fail to parse are not retried.
+    """
+    changed = [path for path, kind in pending.items() if kind == CHANGED]
+    deleted = [path for path, kind in pending.items() if kind == DELETED]
+    try:
+        counts = ingest_changes(folder, changed, deleted, cfg, workers=workers)
+    except Exception as exc:
+        print(f"[WARN] Could not apply {len(pending)} changed paths, will retry: {exc}")
+        return dict(pending)
+    print(
+        f"[WATCH] {len(pending)} changed paths: new: {counts['new']}, "
+        f"updated: {counts['updated']}, deleted: {counts['deleted']}, "
+        f"failed: {counts['failed']}, chunks: {counts['chunks']}"
+    )
+    retry = set(counts.get("retry", ()))
+    kept = {path: kind for path, kind in pending.items() if str(path) in retry}
+    if kept:
+        print(f"[WARN] {len(kept)} changed paths could not be stored, will retry")
+    return kept
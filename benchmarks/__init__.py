@@ -0,0 +1,9 @@
+"""
+Performance benchmarks for the AI assistant.
+
+Run `python -m benchmarks --help` for options. The suite generates a
+synthetic corpus (`corpus`), serves LLM calls from a local fake Ollama
+server (`fake_ollama`), embeds with a deterministic hashing embedder
+(`embedder`) and reports ingest throughput, `ask` latency percentiles,
+summary wall time and peak RSS per stage as JSON (`runner`).
+"""
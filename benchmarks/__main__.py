@@ -0,0 +1,72 @@
+"""
+Command-line entry point: `python -m benchmarks`.
+
+Example:
+
+    python -m benchmarks --files 500 --mix txt=0.5,pdf=0.3,docx=0.2 \
+        --questions 100 --latency-ms 80 --workers 4 --output bench.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from .corpus import DEFAULT_MIX, parse_mix
+from .runner import STAGES, format_report, run_benchmarks
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark ingest, ask and summary on a synthetic corpus.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--files", type=int, default=200, help="Number of documents to generate")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="File type weights, e.g. txt=0.4,md=0.3,pdf=0.2,docx=0.1",
+    )
+    parser.add_argument("--words", type=int, default=800, help="Average words per document")
+    parser.add_argument("--questions", type=int, default=50, help="Questions asked in the ask stage")
+    parser.add_argument("--summary-files", type=int, default=20, help="Documents summarised in the summary stage")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake Ollama delay before the first token")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="Fake Ollama delay per generated token")
+    parser.add_argument("--tokens", type=int, default=32, help="Tokens in every fake Ollama reply")
+    parser.add_argument("--workers", type=int, default=1, help="Parse workers and concurrent LLM requests")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default="chroma", help="Vector store backend")
+    parser.add_argument("--dim", type=int, default=384, help="Dimension of the hashing embedder")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for corpus and question generation")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="Stages to run")
+    parser.add_argument("--workdir", type=str, help="Keep the corpus and stores in this folder")
+    parser.add_argument("--output", type=str, default="benchmark.json", help="Write the JSON report here")
+    parser.add_argument("--verbose", action="store_true", help="Show the assistant's own output")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    report = run_benchmarks(
+        files=args.files,
+        mix=args.mix,
+        words_per_file=args.words,
+        questions=args.questions,
+        summary_files=args.summary_files,
+        latency_ms=args.latency_ms,
+        token_ms=args.token_ms,
+        response_tokens=args.tokens,
+        workers=args.workers,
+        backend=args.backend,
+        dim=args.dim,
+        seed=args.seed,
+        stages=tuple(args.stages),
+        workdir=Path(args.workdir) if args.workdir else None,
+        verbose=args.verbose,
+    )
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(format_report(report))
+    print(f"[BENCH] Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
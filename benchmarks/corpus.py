@@ -0,0 +1,183 @@
+"""
+Synthetic document corpora for benchmarks.
+
+`generate_corpus` writes a reproducible mix of `.txt`, `.md`, `.pdf` and
+`.docx` files filled with pseudo-random prose. PDF and DOCX files are
+written directly (a minimal single-font PDF and a minimal WordprocessingML
+package), so generating a corpus needs no third-party libraries; parsing
+them during a benchmark uses the assistant's normal parsers.
+"""
+
+from __future__ import annotations
+
+import random
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_MIX = {"txt": 0.4, "md": 0.3, "pdf": 0.2, "docx": 0.1}
+
+_WORDS = (
+    "account action answer archive audit backup balance billing budget cache change "
+    "client cluster config contract customer dashboard data deadline delivery deploy "
+    "device document error estimate export failure feature forecast incident index "
+    "invoice issue latency license migration model network notice order outage owner "
+    "payment policy priority process product project quarter query quota record "
+    "release report request review revenue risk schedule server service storage "
+    "support system team ticket timeline token update upgrade usage user vendor version"
+).split()
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a file mix such as `txt=0.5,pdf=0.5` into normalised weights."""
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        ext, _, weight = part.partition("=")
+        ext = ext.strip().lstrip(".")
+        if ext not in DEFAULT_MIX:
+            raise ValueError(f"Unsupported file type {ext!r}; expected one of {sorted(DEFAULT_MIX)}.")
+        mix[ext] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("File mix weights must sum to a positive number.")
+    return {ext: weight / total for ext, weight in mix.items()}
+
+
+def _paragraphs(rng: random.Random, words: int) -> List[str]:
+    paragraphs: List[str] = []
+    while words > 0:
+        size = min(words, rng.randint(40, 120))
+        sentence_words = [rng.choice(_WORDS) for _ in range(size)]
+        # Sprinkle identifiers so lexical search has something exact to match.
+        sentence_words[rng.randrange(size)] = f"ERR-{rng.randint(1000, 9999)}"
+        text = " ".join(sentence_words)
+        paragraphs.append(text[0].upper() + text[1:] + ".")
+        words -= size
+    return paragraphs
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, paragraphs: List[str], lines_per_page: int = 60) -> None:
+    """Write paragraphs as a minimal multi-page PDF using the Helvetica base font."""
+    lines: List[str] = []
+    for paragraph in paragraphs:
+        words = paragraph.split()
+        for start in range(0, len(words), 14):
+            lines.append(" ".join(words[start:start + 14]))
+        lines.append("")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects: List[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]
+    kids = []
+    for page_lines in pages:
+        text = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in page_lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 790 Td {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (content_ref, 3 + 2 * len(pages))
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+
+def write_docx(path: Path, paragraphs: List[str]) -> None:
+    """Write paragraphs as a minimal DOCX package."""
+    from xml.sax.saxutils import escape
+
+    body = "".join(f"<w:p><w:r><w:t>{escape(p)}</w:t></w:r></w:p>" for p in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _DOCX_RELS)
+        zf.writestr("word/document.xml", document)
+
+
+def generate_corpus(
+    folder: Path,
+    files: int,
+    mix: Dict[str, float] = DEFAULT_MIX,
+    words_per_file: int = 800,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """Write `files` synthetic documents into `folder`.
+
+    Args:
+        folder: Destination folder; created if needed.
+        files: Number of documents to write.
+        mix: Weight of each file type (`txt`, `md`, `pdf`, `docx`).
+        words_per_file: Average document length in words (varies +/-50%).
+        seed: Random seed; the same arguments always produce the same corpus.
+
+    Returns:
+        The number of files written per extension.
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    extensions = list(mix)
+    weights = [mix[ext] for ext in extensions]
+    counts = {ext: 0 for ext in extensions}
+    for idx in range(files):
+        ext = rng.choices(extensions, weights)[0]
+        words = max(10, int(words_per_file * rng.uniform(0.5, 1.5)))
+        paragraphs = _paragraphs(rng, words)
+        path = folder / f"doc_{idx:06d}.{ext}"
+        if ext == "pdf":
+            write_pdf(path, paragraphs)
+        elif ext == "docx":
+            write_docx(path, paragraphs)
+        elif ext == "md":
+            path.write_text(f"# Document {idx}\n\n" + "\n\n".join(paragraphs) + "\n", encoding="utf-8")
+        else:
+            path.write_text("\n\n".join(paragraphs) + "\n", encoding="utf-8")
+        counts[ext] += 1
+    return counts
+
+
+def generate_questions(count: int, seed: int = 0) -> List[str]:
+    """Return `count` reproducible questions phrased over the corpus vocabulary."""
+    rng = random.Random(seed + 1)
+    return [
+        f"What does the {rng.choice(_WORDS)} {rng.choice(_WORDS)} say about {rng.choice(_WORDS)}?"
+        for _ in range(count)
+    ]
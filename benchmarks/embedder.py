@@ -0,0 +1,39 @@
+"""
+Deterministic hashing embedder for benchmarks.
+
+Stands in for the sentence-transformer so benchmarks measure the
+assistant's own pipeline rather than model inference, and run offline.
+Each token is hashed to a signed bucket (the "hashing trick"); texts that
+share words get similar vectors, so retrieval still behaves sensibly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Sequence
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Callable mapping texts to L2-normalised `(n, dim)` float32 arrays."""
+
+    def __init__(self, dim: int = 384) -> None:
+        self.dim = dim
+
+    def _bucket(self, token: str) -> int:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN_RE.findall(text.lower()):
+                bucket = self._bucket(token)
+                vectors[row, bucket % self.dim] += 1.0 if (bucket >> 32) & 1 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
@@ -0,0 +1,156 @@
+"""
+Local stand-in for the Ollama HTTP API.
+
+`FakeOllamaServer` answers `POST /api/chat` (streaming or not) and
+`POST /api/generate` after a configurable delay, so benchmarks exercise
+the real `ollama` client and the assistant's concurrency without a model.
+Responses carry the same accounting fields Ollama returns
+(`prompt_eval_count`, `eval_count` and the `*_duration` values in
+nanoseconds).
+
+Point the assistant at it by setting `OLLAMA_HOST` to `server.url` before
+`ollama` is imported.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    server: "FakeOllamaServer"
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle delay the body.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+    def _send_json(self, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        elif self.path == "/api/tags":
+            self._send_json({"models": []})
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path not in ("/api/chat", "/api/generate"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/api/chat":
+            prompt = " ".join(m.get("content", "") for m in request.get("messages", []))
+        else:
+            prompt = request.get("prompt", "")
+        self.server.record_request()
+        fake = self.server
+        tokens = [f"token{i} " for i in range(fake.response_tokens)]
+        prompt_tokens = max(1, len(prompt.split()))
+        start = time.perf_counter()
+        time.sleep(fake.latency_s)
+
+        def frame(content: str, done: bool) -> dict:
+            payload = {
+                "model": request.get("model", "fake"),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "done": done,
+            }
+            if self.path == "/api/chat":
+                payload["message"] = {"role": "assistant", "content": content}
+            else:
+                payload["response"] = content
+            if done:
+                total = int((time.perf_counter() - start) * 1e9)
+                payload.update(
+                    done_reason="stop",
+                    total_duration=total,
+                    load_duration=0,
+                    prompt_eval_count=prompt_tokens,
+                    prompt_eval_duration=int(fake.latency_s * 1e9),
+                    eval_count=len(tokens),
+                    eval_duration=max(0, total - int(fake.latency_s * 1e9)),
+                )
+            return payload
+
+        if not request.get("stream", True):
+            time.sleep(fake.token_s * len(tokens))
+            self._send_json(frame("".join(tokens), True))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in tokens:
+            time.sleep(fake.token_s)
+            self._write_chunk(json.dumps(frame(token, False)).encode("utf-8") + b"\n")
+        self._write_chunk(json.dumps(frame("", True)).encode("utf-8") + b"\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """Threaded fake Ollama server with configurable latency.
+
+    Args:
+        latency_ms: Delay before the first token (prompt evaluation).
+        token_ms: Delay per generated token.
+        response_tokens: Number of tokens in every reply.
+        port: TCP port; 0 picks a free one.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        latency_ms: float = 50.0,
+        token_ms: float = 0.0,
+        response_tokens: int = 32,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__((host, port), _FakeOllamaHandler)
+        self.latency_s = latency_ms / 1000
+        self.token_s = token_ms / 1000
+        self.response_tokens = response_tokens
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "FakeOllamaServer":
+        """Serve in a background thread and return self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
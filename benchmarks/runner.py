@@ -0,0 +1,262 @@
+"""
+Benchmark orchestration.
+
+`run_benchmarks` generates a synthetic corpus, starts a fake Ollama server
+and runs each stage (`ingest`, `ask`, `summary`) in a fresh Python process
+so every stage reports its own peak RSS. Stages use the real pipeline with
+the deterministic `HashingEmbedder` in place of the sentence-transformer.
+Results are returned (and written by the CLI) as one JSON document so runs
+can be compared across versions.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+
+from .corpus import DEFAULT_MIX, generate_corpus, generate_questions
+from .fake_ollama import FakeOllamaServer
+
+STAGES = ("ingest", "ask", "summary")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 and mean of latencies in milliseconds."""
+    if not values:
+        return {}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "mean_ms": round(float(np.mean(values)), 2),
+    }
+
+
+def run_stage(stage: str, config_path: Path, corpus: Path, options: dict) -> dict:
+    """Run one benchmark stage in this process and return its measurements."""
+    from assistant import rag
+    from assistant.config import Config
+    from assistant.summarizer import summarize_folder
+
+    from .embedder import HashingEmbedder
+
+    embedder = HashingEmbedder(options["dim"])
+    rag.get_embedding_function = lambda model_name=None: embedder
+    cfg = Config(config_path)
+    workers = options["workers"]
+    result: dict = {}
+
+    start = time.perf_counter()
+    if stage == "ingest":
+        counts = rag.ingest_folder(corpus, cfg, workers=workers)
+        seconds = time.perf_counter() - start
+        files = counts["new"] + counts["updated"]
+        result.update(
+            files=files,
+            chunks=counts["chunks"],
+            failed=counts["failed"],
+            seconds=round(seconds, 3),
+            files_per_s=round(files / seconds, 2) if seconds else None,
+            chunks_per_s=round(counts["chunks"] / seconds, 2) if seconds else None,
+        )
+    elif stage == "ask":
+        questions = generate_questions(options["questions"], options["seed"])
+        latencies = []
+        for question in questions:
+            q_start = time.perf_counter()
+            rag.answer_question(question, cfg)
+            latencies.append((time.perf_counter() - q_start) * 1000)
+        result.update(questions=len(questions), sequential=percentiles(latencies))
+        batch_start = time.perf_counter()
+        records = rag.answer_questions([{"question": q} for q in questions], cfg)
+        batch_seconds = time.perf_counter() - batch_start
+        result["batch"] = {
+            **percentiles([r["latency_ms"] for r in records]),
+            "seconds": round(batch_seconds, 3),
+            "questions_per_s": round(len(records) / batch_seconds, 2) if batch_seconds else None,
+        }
+    elif stage == "summary":
+        summarize_folder(corpus, cfg, workers=workers)
+        result.update(
+            files=sum(1 for p in corpus.iterdir() if p.is_file()),
+            seconds=round(time.perf_counter() - start, 3),
+        )
+    else:
+        raise ValueError(f"Unknown stage {stage!r}; expected one of {STAGES}.")
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def _write_config(path: Path, workdir: Path, options: dict) -> None:
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "model": {"max_parallel": options["workers"]},
+                "rag": {"vector_backend": options["backend"]},
+                # Measure the full ask path rather than semantic cache hits.
+                "cache": {"answers": False},
+                "paths": {
+                    "vector_store": str(workdir / "vector_store"),
+                    "cache_folder": str(workdir / "cache"),
+                    "output_folder": str(workdir / "outputs"),
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("ai-assistant")
+    except Exception:
+        return "unknown"
+
+
+def run_benchmarks(
+    files: int = 200,
+    mix: Dict[str, float] = DEFAULT_MIX,
+    words_per_file: int = 800,
+    questions: int = 50,
+    summary_files: int = 20,
+    latency_ms: float = 50.0,
+    token_ms: float = 0.0,
+    response_tokens: int = 32,
+    workers: int = 1,
+    backend: str = "chroma",
+    dim: int = 384,
+    seed: int = 0,
+    stages: tuple = STAGES,
+    workdir: Optional[Path] = None,
+    verbose: bool = False,
+) -> dict:
+    """Run the benchmark stages and return a JSON-serialisable report."""
+    options = {
+        "files": files,
+        "mix": mix,
+        "words_per_file": words_per_file,
+        "questions": questions,
+        "summary_files": summary_files,
+        "latency_ms": latency_ms,
+        "token_ms": token_ms,
+        "response_tokens": response_tokens,
+        "workers": workers,
+        "backend": backend,
+        "dim": dim,
+        "seed": seed,
+    }
+    tmp = None
+    if workdir is None:
+        tmp = tempfile.TemporaryDirectory(prefix="assistant-bench-")
+        workdir = Path(tmp.name)
+    workdir = Path(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    server = FakeOllamaServer(latency_ms, token_ms, response_tokens).start()
+    try:
+        corpus = workdir / "corpus"
+        corpus_counts = generate_corpus(corpus, files, mix, words_per_file, seed)
+        summary_corpus = workdir / "summary_corpus"
+        generate_corpus(summary_corpus, summary_files, mix, words_per_file, seed + 1)
+        config_path = workdir / "config.yaml"
+        _write_config(config_path, workdir, options)
+
+        env = {**os.environ, "OLLAMA_HOST": server.url}
+        results: Dict[str, dict] = {}
+        for stage in stages:
+            folder = summary_corpus if stage == "summary" else corpus
+            result_path = workdir / f"{stage}.json"
+            print(f"[BENCH] Running {stage} ...", flush=True)
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.stage",
+                    stage,
+                    str(config_path),
+                    str(folder),
+                    json.dumps(options),
+                    str(result_path),
+                ],
+                env=env,
+                cwd=Path(__file__).resolve().parent.parent,
+                check=True,
+                stdout=None if verbose else subprocess.DEVNULL,
+            )
+            results[stage] = json.loads(result_path.read_text(encoding="utf-8"))
+        return {
+            "version": _version(),
+            "git_commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": options,
+            "corpus": corpus_counts,
+            "llm_requests": server.requests,
+            "stages": results,
+        }
+    finally:
+        server.stop()
+        if tmp is not None:
+            tmp.cleanup()
+
+
+def format_report(report: dict) -> str:
+    """Render a benchmark report as a short human-readable table."""
+    stages = report["stages"]
+    lines = [f"Benchmark {report['version']} ({report.get('git_commit') or 'no git'})"]
+    if "ingest" in stages:
+        s = stages["ingest"]
+        lines.append(
+            f"  ingest   {s['files']} files, {s['chunks']} chunks in {s['seconds']} s: "
+            f"{s['files_per_s']} files/s, {s['chunks_per_s']} chunks/s, peak RSS {s['peak_rss_mb']} MB"
+        )
+    if "ask" in stages:
+        s = stages["ask"]
+        seq, batch = s["sequential"], s["batch"]
+        lines.append(
+            f"  ask      {s['questions']} questions: p50 {seq.get('p50_ms')} ms, p95 {seq.get('p95_ms')} ms, "
+            f"p99 {seq.get('p99_ms')} ms; batch {batch.get('questions_per_s')} q/s, peak RSS {s['peak_rss_mb']} MB"
+        )
+    if "summary" in stages:
+        s = stages["summary"]
+        lines.append(f"  summary  {s['files']} files in {s['seconds']} s, peak RSS {s['peak_rss_mb']} MB")
+    return "\n".join(lines)
@@ -0,0 +1,23 @@
+"""
+Child-process entry point for a single benchmark stage.
+
+Invoked by `runner.run_benchmarks` as
+`python -m benchmarks.stage STAGE CONFIG CORPUS OPTIONS_JSON RESULT_PATH`
+so each stage starts from a clean process and reports its own peak RSS.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from .runner import run_stage
+
+
+def main(argv: list) -> None:
+    stage, config_path, corpus, options, result_path = argv
+    result = run_stage(stage, Path(config_path), Path(corpus), json.loads(options))
+    Path(result_path).write_text(json.dumps(result), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,76 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from assistant.answer_cache import AnswerCache, bump_content_version
+
+SETTINGS = {"model": "llama3", "temperature": 0.2, "top_k": 5, "embedding_model": "all-minilm"}
+
+
+class AnswerCacheTests(unittest.TestCase):
+    def test_similar_embedding_hits_and_dissimilar_misses(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp), SETTINGS, threshold=0.9)
+            cache.store("q", [1.0, 0.0, 0.0], "answer", ["a.txt"])
+
+            hit = cache.lookup([0.99, 0.05, 0.0])
+            self.assertEqual((hit["answer"], hit["sources"]), ("answer", ["a.txt"]))
+            self.assertIsNone(cache.lookup([0.0, 1.0, 0.0]))
+
+    def test_content_version_change_invalidates(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp), SETTINGS)
+            cache.store("q", [1.0, 0.0], "answer")
+
+            bump_content_version(Path(tmp))
+
+            self.assertIsNone(cache.lookup([1.0, 0.0]))
+            self.assertIsNone(AnswerCache(Path(tmp), SETTINGS).lookup([1.0, 0.0]))
+
+    def test_settings_change_invalidates(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            AnswerCache(Path(tmp), SETTINGS).store("q", [1.0, 0.0], "answer")
+
+            other = AnswerCache(Path(tmp), {**SETTINGS, "model": "mistral"})
+
+            self.assertIsNone(other.lookup([1.0, 0.0]))
+
+    def test_ttl_expiry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp), SETTINGS, ttl_seconds=60)
+            cache.store("q", [1.0, 0.0], "answer")
+
+            with patch("assistant.answer_cache.time.time", return_value=time.time() + 120):
+                self.assertIsNone(cache.lookup([1.0, 0.0]))
+
+    def test_lru_eviction(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp), SETTINGS, max_entries=2)
+            cache.store("a", [1.0, 0.0, 0.0], "A")
+            cache.store("b", [0.0, 1.0, 0.0], "B")
+            cache.lookup([1.0, 0.0, 0.0])  # "a" is now more recent than "b"
+            cache.store("c", [0.0, 0.0, 1.0], "C")
+
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache.lookup([0.0, 1.0, 0.0]))
+            self.assertEqual(cache.lookup([1.0, 0.0, 0.0])["answer"], "A")
+
+    def test_hits_persist_lru_updates_only_on_flush(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AnswerCache(Path(tmp), SETTINGS)
+            cache.store("q", [1.0, 0.0], "answer")
+            path = Path(tmp) / "answer_cache.json"
+            saved = path.read_text()
+
+            with patch("assistant.answer_cache.time.time", return_value=time.time() + 5):
+                self.assertEqual(cache.lookup([1.0, 0.0])["answer"], "answer")
+            self.assertEqual(path.read_text(), saved)
+
+            cache.flush()
+            self.assertNotEqual(path.read_text(), saved)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import ollama
+
+from benchmarks.corpus import generate_corpus, parse_mix
+from benchmarks.embedder import HashingEmbedder
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.runner import percentiles
+
+
+class CorpusTests(unittest.TestCase):
+    def test_corpus_is_reproducible_and_follows_mix(self) -> None:
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+            counts = generate_corpus(Path(a), 12, parse_mix("txt=1,pdf=1,docx=1"), words_per_file=50)
+            generate_corpus(Path(b), 12, parse_mix("txt=1,pdf=1,docx=1"), words_per_file=50)
+
+            self.assertEqual(sum(counts.values()), 12)
+            self.assertEqual(set(counts), {"txt", "pdf", "docx"})
+            for path in Path(a).iterdir():
+                self.assertEqual(path.read_bytes(), (Path(b) / path.name).read_bytes())
+                self.assertTrue(path.read_bytes().startswith((b"%PDF", b"PK")) or path.suffix == ".txt")
+
+    def test_unknown_file_type_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_mix("txt=1,xlsx=1")
+
+
+class HashingEmbedderTests(unittest.TestCase):
+    def test_embeddings_are_deterministic_and_normalised(self) -> None:
+        embed = HashingEmbedder(dim=64)
+
+        vectors = embed(["server outage report", "server outage report", "invoice payment"])
+
+        self.assertEqual((vectors.shape, vectors.dtype), ((3, 64), np.float32))
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+        np.testing.assert_array_equal(vectors[0], HashingEmbedder(dim=64)(["server outage report"])[0])
+        self.assertGreater(vectors[0] @ vectors[1], vectors[0] @ vectors[2])
+
+
+class FakeOllamaTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = FakeOllamaServer(latency_ms=0, response_tokens=3).start()
+        self.addCleanup(self.server.stop)
+        self.client = ollama.Client(host=self.server.url)
+
+    def test_chat_reports_token_counts(self) -> None:
+        resp = self.client.chat(model="m", messages=[{"role": "user", "content": "two words"}])
+
+        self.assertEqual(resp["message"]["content"], "token0 token1 token2 ")
+        self.assertEqual((resp["prompt_eval_count"], resp["eval_count"]), (2, 3))
+
+    def test_chat_streams_tokens(self) -> None:
+        stream = self.client.chat(model="m", messages=[{"role": "user", "content": "hi"}], stream=True)
+
+        pieces = [chunk["message"]["content"] for chunk in stream]
+
+        self.assertEqual("".join(pieces), "token0 token1 token2 ")
+        self.assertEqual(self.server.requests, 1)
+
+
+class PercentileTests(unittest.TestCase):
+    def test_percentiles(self) -> None:
+        stats = percentiles([float(v) for v in range(1, 101)])
+
+        self.assertEqual((stats["p50_ms"], stats["p99_ms"], stats["mean_ms"]), (50.5, 99.01, 50.5))
+        self.assertEqual(percentiles([]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from assistant.chunking import chunk_text
+from assistant.chunking import chunk_ids, chunk_pages, chunk_text
 
 
 class ChunkingTests(unittest.TestCase):
@@ -38,6 +38,26 @@ class ChunkingTests(unittest.TestCase):
         reconstructed = chunks[0] + "".join(chunk[200:] for chunk in chunks[1:])
         self.assertEqual(reconstructed, long_text)
 
+    def test_chunk_ids_are_content_addressed(self) -> None:
+        ids = chunk_ids("/docs/a.txt", ["alpha  beta", "gamma", "alpha beta"])
+
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(ids[0], chunk_ids("/docs/a.txt", ["alpha beta\n"])[0])
+        self.assertEqual(ids[1], chunk_ids("/docs/a.txt", ["new", "gamma"])[1])
+        self.assertNotEqual(ids[1], chunk_ids("/docs/b.txt", ["gamma"])[0])
+        self.assertNotEqual(ids[1], chunk_ids("/docs/a.txt", ["new", "gamma"], "model-2")[1])
+
+    def test_chunk_pages_matches_chunk_text_and_tracks_pages(self) -> None:
+        pages = [(1, "a" * 12), (2, ""), (3, "b" * 7), (4, "c" * 20)]
+        joined = "\n".join(text for _, text in pages)
+
+        chunks = list(chunk_pages(iter(pages), max_chars=10, overlap=3))
+
+        self.assertEqual([c for c, _, _ in chunks], chunk_text(joined, max_chars=10, overlap=3))
+        self.assertEqual([(first, last) for _, first, last in chunks][:3], [(1, 1), (1, 3), (3, 4)])
+        self.assertEqual(chunks[-1][1:], (4, 4))
+        self.assertEqual(list(chunk_pages([], max_chars=10)), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -23,12 +23,78 @@ class CliParserTests(unittest.TestCase):
         args = parser.parse_args(["ingest", "--folder", "docs"])
         self.assertEqual(args.command, "ingest")
         self.assertEqual(args.folder, "docs")
+        self.assertEqual(args.workers, 1)
+        self.assertFalse(args.watch)
+
+    def test_ingest_watch_flags(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(
+            ["ingest", "--folder", "docs", "--watch", "--debounce", "2.5", "--poll-interval", "10"]
+        )
+        self.assertTrue(args.watch)
+        self.assertEqual((args.debounce, args.poll_interval), (2.5, 10.0))
+
+    def test_ingest_and_summary_accept_workers(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["ingest", "--folder", "docs", "--workers", "8"])
+        self.assertEqual(args.workers, 8)
+        args = parser.parse_args(["summary", "--folder", "docs", "--workers", "4"])
+        self.assertEqual(args.workers, 4)
 
     def test_ask_requires_question(self) -> None:
         parser = build_parser()
         args = parser.parse_args(["ask", "--question", "What?"])
         self.assertEqual(args.command, "ask")
         self.assertEqual(args.question, "What?")
+        self.assertFalse(args.no_stream)
+
+    def test_ask_no_stream_flag(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["ask", "--question", "What?", "--no-stream"])
+        self.assertTrue(args.no_stream)
+
+    def test_ask_accepts_questions_file(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["ask", "--questions-file", "q.jsonl", "--concurrency", "8"])
+        self.assertEqual(args.questions_file, "q.jsonl")
+        self.assertIsNone(args.question)
+        self.assertEqual(args.concurrency, 8)
+
+    def test_serve_defaults(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["serve"])
+        self.assertEqual(args.command, "serve")
+        self.assertEqual((args.host, args.port, args.socket), ("127.0.0.1", 8765, None))
+
+    def test_quantization_report_defaults(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["quantization", "--k", "5"])
+        self.assertEqual(args.command, "quantization")
+        self.assertEqual((args.sample, args.k), (200, 5))
+
+    def test_profile_flags_on_pipeline_commands(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["ingest", "--folder", "docs", "--profile"])
+        self.assertTrue(args.profile)
+        self.assertIsNone(args.trace)
+        args = parser.parse_args(["ask", "--question", "What?", "--trace", "t.json"])
+        self.assertFalse(args.profile)
+        self.assertEqual(args.trace, "t.json")
+
+    def test_gc_and_ingest_prune_flags(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["gc", "--dry-run"])
+        self.assertEqual(args.command, "gc")
+        self.assertTrue(args.dry_run)
+        self.assertFalse(args.force)
+        args = parser.parse_args(["ingest", "--folder", "docs", "--prune"])
+        self.assertTrue(args.prune)
+
+    def test_cache_action(self) -> None:
+        parser = build_parser()
+        args = parser.parse_args(["cache", "stats"])
+        self.assertEqual(args.command, "cache")
+        self.assertEqual(args.action, "stats")
 
 
 if __name__ == "__main__":
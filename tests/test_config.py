@@ -19,6 +19,8 @@ class ConfigTests(unittest.TestCase):
             self.assertEqual(cfg.rag["chunk_overlap"], 200)
             self.assertEqual(cfg.paths["output_folder"], "./outputs")
             self.assertEqual(cfg.logging["level"], "INFO")
+            self.assertIn("node_modules/", cfg.discovery["ignore"])
+            self.assertIn(".gitignore", cfg.discovery["ignore_files"])
 
     def test_yaml_values_override_defaults(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
@@ -0,0 +1,60 @@
+import unittest
+
+from assistant.chunking import chunk_text
+from assistant.context import pack_context
+
+
+class PackContextTests(unittest.TestCase):
+    def test_adjacent_chunks_merge_without_repeated_overlap(self) -> None:
+        text = "".join(str(i % 10) for i in range(50))
+        chunks = chunk_text(text, max_chars=20, overlap=5)
+        hits = [
+            (chunks[1], {"source": "a.txt", "chunk_index": 1, "distance": 0.2}),
+            (chunks[0], {"source": "a.txt", "chunk_index": 0, "distance": 0.4}),
+        ]
+
+        packed = pack_context(hits, overlap=5)
+
+        self.assertEqual(len(packed), 1)
+        passage, meta = packed[0]
+        self.assertEqual(passage, text[:35])
+        self.assertEqual((meta["chunk_index"], meta["chunk_end"], meta["distance"]), (0, 1, 0.2))
+
+    def test_merged_passage_spans_pages_of_both_chunks(self) -> None:
+        hits = [
+            ("abcdef", {"source": "m.pdf", "chunk_index": 0, "page": 2}),
+            ("defghi", {"source": "m.pdf", "chunk_index": 1, "page": 2, "page_end": 4}),
+        ]
+
+        (passage, meta), = pack_context(hits, overlap=3)
+
+        self.assertEqual(passage, "abcdefghi")
+        self.assertEqual((meta["page"], meta["page_end"]), (2, 4))
+
+    def test_non_adjacent_and_other_sources_stay_separate_in_rank_order(self) -> None:
+        hits = [
+            ("b0", {"source": "b.txt", "chunk_index": 0}),
+            ("a3", {"source": "a.txt", "chunk_index": 3}),
+            ("a0", {"source": "a.txt", "chunk_index": 0}),
+        ]
+
+        packed = pack_context(hits)
+
+        self.assertEqual([p for p, _ in packed], ["b0", "a3", "a0"])
+
+    def test_distance_threshold_and_budget(self) -> None:
+        hits = [
+            ("x" * 40, {"source": "a.txt", "chunk_index": 0, "distance": 0.1}),
+            ("y" * 40, {"source": "b.txt", "chunk_index": 0, "distance": 0.3}),
+            ("z" * 10, {"source": "c.txt", "chunk_index": 0, "distance": 0.5}),
+            ("w" * 10, {"source": "d.txt", "chunk_index": 0, "distance": 2.0}),
+        ]
+
+        packed = pack_context(hits, max_distance=1.0, budget_chars=60)
+
+        self.assertEqual([m["source"] for _, m in packed], ["a.txt", "c.txt"])
+        self.assertEqual(pack_context(hits, budget_chars=15)[0][0], "x" * 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
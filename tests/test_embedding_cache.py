@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from assistant.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+
+
+def fake_embed(texts):
+    return [np.array([len(t), 1.0, 2.0], dtype=np.float32) for t in texts]
+
+
+class EmbeddingCacheTests(unittest.TestCase):
+    def test_only_unseen_texts_are_encoded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            embed = MagicMock(side_effect=fake_embed)
+            cached = CachedEmbeddingFunction(embed, EmbeddingCache(Path(tmp), "model-a"))
+
+            first = cached(["header", "body one"])
+            second = cached(["header", "body two", "header"])
+
+            self.assertEqual(embed.call_args_list[1].args[0], ["body two"])
+            self.assertEqual((cached.hits, cached.misses), (2, 3))
+            np.testing.assert_array_equal(second[0], first[0])
+            np.testing.assert_array_equal(second[2], first[0])
+            self.assertEqual((second.shape, second.dtype), ((3, 3), np.float32))
+
+    def test_cache_persists_across_instances(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            EmbeddingCache(Path(tmp), "model-a").add(["abc"], fake_embed(["abc"]))
+
+            reopened = EmbeddingCache(Path(tmp), "model-a")
+            other_model = EmbeddingCache(Path(tmp), "model-b")
+
+            self.assertEqual(len(reopened), 1)
+            np.testing.assert_array_equal(reopened.lookup(["abc"])[0], [3.0, 1.0, 2.0])
+            self.assertIsNone(other_model.lookup(["abc"])[0])
+
+    def test_torn_append_is_dropped_by_the_next_append(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(Path(tmp), "model-a")
+            cache.add(["a", "b"], fake_embed(["a", "b"]))
+            vectors = cache.directory / "vectors.f32"
+            with open(vectors, "ab") as f:
+                f.write(b"\0" * 12)  # vector written, key missing
+
+            # Opening never cuts off what may be another writer's append.
+            reopened = EmbeddingCache(Path(tmp), "model-a")
+            self.assertEqual(vectors.stat().st_size, 3 * 12)
+            reopened.add(["c"], fake_embed(["c"]))
+
+            self.assertEqual(len(reopened), 3)
+            np.testing.assert_array_equal(reopened.lookup(["c"])[0], [1.0, 1.0, 2.0])
+
+
+    def test_writers_number_rows_from_the_files(self) -> None:
+        texts = ["x", "pp", "qqq", "aaaa"]
+        with tempfile.TemporaryDirectory() as tmp:
+            first = EmbeddingCache(Path(tmp), "model-a")
+            first.add(["x"], fake_embed(["x"]))
+            other = EmbeddingCache(Path(tmp), "model-a")
+            other.add(["pp", "qqq"], fake_embed(["pp", "qqq"]))
+
+            # `first` picks up the rows `other` appended before adding its own.
+            first.add(["aaaa", "pp"], fake_embed(["aaaa", "pp"]))
+
+            for cache in (first, EmbeddingCache(Path(tmp), "model-a")):
+                found = cache.lookup(texts)
+                np.testing.assert_array_equal(np.stack(found), np.stack(fake_embed(texts)))
+            self.assertEqual((first.directory / "keys.bin").stat().st_size, 4 * 16)
+
+if __name__ == "__main__":
+    unittest.main()
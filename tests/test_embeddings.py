@@ -1,6 +1,8 @@
 import unittest
 
-from assistant.embeddings import validate_embeddings
+import numpy as np
+
+from assistant.embeddings import as_embedding_array, validate_embeddings
 
 
 class EmbeddingValidationTests(unittest.TestCase):
@@ -35,6 +37,17 @@ class EmbeddingValidationTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_embeddings([])
 
+    def test_raises_on_non_finite_values(self) -> None:
+        for bad in (np.nan, np.inf):
+            with self.assertRaises(ValueError):
+                validate_embeddings(np.array([[0.1, bad]], dtype=np.float32))
+
+    def test_float32_array_is_passed_through_without_copy(self) -> None:
+        embeddings = np.ones((4, 3), dtype=np.float32)
+
+        self.assertIs(as_embedding_array(embeddings), embeddings)
+        self.assertEqual(as_embedding_array([np.ones(3), np.zeros(3)]).dtype, np.float32)
+
 
 if __name__ == "__main__":
     unittest.main()
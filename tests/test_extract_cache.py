@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from assistant.extract_cache import ExtractionCache
+from assistant.extraction import PARSERS, extract_text
+
+
+class ExtractionCacheTests(unittest.TestCase):
+    def test_key_depends_on_content_and_parser_version(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(Path(tmp) / "cache", max_bytes=1024)
+            a = Path(tmp) / "a.txt"
+            b = Path(tmp) / "b.txt"
+            a.write_text("same", encoding="utf-8")
+            b.write_text("same", encoding="utf-8")
+
+            self.assertEqual(cache.key_for(a, "txt", "1"), cache.key_for(b, "txt", "1"))
+            self.assertNotEqual(cache.key_for(a, "txt", "1"), cache.key_for(a, "txt", "2"))
+
+    def test_prune_evicts_least_recently_used(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(Path(tmp), max_bytes=10_000)
+            cache.put("aa01", "x" * 400)
+            cache.put("bb02", "y" * 400)
+            cache.put("cc03", "z" * 400)
+            old = 1_000_000
+            for i, key in enumerate(["aa01", "bb02", "cc03"]):
+                os.utime(cache._entry_path(key), (old + i, old + i))
+            cache.get("aa01")  # refresh: now the most recently used
+
+            cache.max_bytes = 800
+            removed = cache.prune()
+
+            self.assertEqual(removed, 1)
+            self.assertIsNone(cache.get("bb02"))
+            self.assertIsNotNone(cache.get("aa01"))
+            self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_ocr_runs_once_for_identical_bytes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(Path(tmp) / "cache", max_bytes=1 << 20)
+            first = Path(tmp) / "scan.png"
+            copy = Path(tmp) / "copy.png"
+            first.write_bytes(b"fake image bytes")
+            copy.write_bytes(b"fake image bytes")
+            fake_ocr = MagicMock(return_value="recognised text")
+
+            with patch.dict(PARSERS, {".png": ("ocr", "1", fake_ocr)}):
+                self.assertEqual(extract_text(first, cache), "recognised text")
+                self.assertEqual(extract_text(copy, cache), "recognised text")
+
+            fake_ocr.assert_called_once_with(first)
+
+    def test_pdf_entries_depend_on_ocr(self) -> None:
+        try:
+            import fitz  # type: ignore[import-not-found]
+        except ImportError:
+            self.skipTest("pymupdf not installed")
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(Path(tmp) / "cache", max_bytes=1 << 20)
+            pdf = Path(tmp) / "scan.pdf"
+            doc = fitz.open()
+            page = doc.new_page()
+            page.insert_image(page.rect, pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), 0))
+            doc.save(pdf)
+            doc.close()
+            available = "assistant.parsers.pdf_parser.ocr_unavailable_reason"
+
+            with patch(available, return_value="missing"):
+                self.assertEqual(extract_text(pdf, cache), "")
+            with patch(available, return_value=None), patch(
+                "assistant.parsers.pdf_parser.ocr_image_bytes", return_value="ocr"
+            ) as ocr:
+                # Text cached while OCR was unavailable, or with it off, is not reused.
+                self.assertEqual(extract_text(pdf, cache, ocr_dpi=0), "")
+                self.assertEqual(extract_text(pdf, cache, ocr_dpi=72), "ocr")
+                self.assertEqual(extract_text(pdf, cache, ocr_dpi=72), "ocr")
+                self.assertEqual(extract_text(pdf, cache, ocr_dpi=100), "ocr")
+            self.assertEqual(ocr.call_count, 2)
+
+    def test_clear_removes_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExtractionCache(Path(tmp) / "cache", max_bytes=1 << 20)
+            cache.put("abcd", "text")
+
+            self.assertEqual(cache.clear(), 1)
+            self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,13 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from assistant.file_discovery import iter_files, is_text_file, is_image_file
+from assistant.file_discovery import (
+    IgnoreRule,
+    is_image_file,
+    is_text_file,
+    iter_files,
+    scan_files,
+)
 
 
 class FileDiscoveryTests(unittest.TestCase):
@@ -23,6 +29,62 @@ class FileDiscoveryTests(unittest.TestCase):
             }
             self.assertSetEqual(found, expected)
 
+    def test_iter_files_filters_extensions_during_walk(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "doc.TXT").write_text("hi")
+            (root / "script.py").write_text("print()")
+
+            self.assertEqual([p.name for p in iter_files(root)], ["doc.TXT"])
+            self.assertEqual(
+                sorted(p.name for p in iter_files(root, extensions=None)),
+                ["doc.TXT", "script.py"],
+            )
+
+    def test_scan_files_prunes_ignored_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for rel in [
+                ".git/notes.txt",
+                "node_modules/pkg/readme.md",
+                "env/lib/site.txt",
+                "docs/keep.md",
+                "docs/build/out.txt",
+                "docs/draft.txt",
+                "docs/final.txt",
+                "scratch.txt",
+            ]:
+                (root / rel).parent.mkdir(parents=True, exist_ok=True)
+                (root / rel).write_text("x")
+            (root / "env" / "pyvenv.cfg").write_text("home = /usr")
+            (root / ".gitignore").write_text("# comment\nscratch.txt\nbuild/\n")
+            (root / "docs" / ".assistantignore").write_text("*.txt\n!final.txt\n")
+
+            found = {
+                p.relative_to(root).as_posix(): st.st_size
+                for p, st in scan_files(root)
+            }
+            self.assertEqual(found, {"docs/keep.md": 1, "docs/final.txt": 1})
+
+            found = {p.name for p in iter_files(root, ignore=[], ignore_files=[])}
+            self.assertIn("readme.md", found)
+            self.assertNotIn("site.txt", found)
+
+    def test_ignore_rule_anchoring(self) -> None:
+        anchored = IgnoreRule("/reports/*.pdf")
+        self.assertTrue(anchored.matches("reports/q1.pdf", False))
+        self.assertFalse(anchored.matches("old/reports/q1.pdf", False))
+
+        floating = IgnoreRule("*.pdf", base="docs")
+        self.assertTrue(floating.matches("docs/a/b.pdf", False))
+        self.assertFalse(floating.matches("other/b.pdf", False))
+
+        deep = IgnoreRule("a/**/z")
+        self.assertTrue(deep.matches("a/z", True))
+        self.assertTrue(deep.matches("a/b/c/z", True))
+
+        self.assertFalse(IgnoreRule("logs/").matches("logs", False))
+
     def test_extension_checks(self) -> None:
         self.assertTrue(is_text_file(Path("file.pdf")))
         self.assertTrue(is_text_file(Path("file.docx")))
@@ -0,0 +1,102 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from assistant.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+
+class LexicalIndexTests(unittest.TestCase):
+    def test_tokenize_keeps_identifiers_and_parts(self) -> None:
+        self.assertEqual(
+            tokenize("Run git-commit --amend (E1234)"),
+            ["run", "git-commit", "git", "commit", "amend", "e1234"],
+        )
+
+    def test_exact_identifier_ranks_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = LexicalIndex(Path(tmp))
+            index.add(
+                ["a#0", "b#0", "c#0"],
+                [
+                    "general notes about errors and codes",
+                    "error E1234 means the disk is full",
+                    "error handling overview",
+                ],
+                [{"source": "a"}, {"source": "b"}, {"source": "c"}],
+            )
+
+            results = index.search("what does E1234 mean", k=2)
+            index.close()
+
+        self.assertEqual(results[0][0], "b#0")
+        self.assertEqual(len(results), 1)
+
+    def test_delete_source_updates_postings_and_stats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = LexicalIndex(Path(tmp))
+            index.add(["a#0", "a#1", "b#0"], ["alpha beta", "alpha", "beta"],
+                      [{"source": "a"}, {"source": "a"}, {"source": "b"}])
+
+            index.delete_source("a")
+
+            self.assertEqual(index.search("alpha", k=5), [])
+            self.assertEqual(index._stats(), (1, 1.0))
+            index.close()
+
+    def test_read_only_search_does_not_wait_for_a_writer(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = LexicalIndex(Path(tmp))
+            writer.add(["a#0"], ["alpha beta"], [{"source": "a"}])
+            writer.conn.execute("BEGIN IMMEDIATE")  # An ingest batch in progress
+            try:
+                reader = LexicalIndex(Path(tmp), read_only=True)
+                self.assertEqual([cid for cid, _ in reader.search("alpha", k=1)], ["a#0"])
+                with self.assertRaises(sqlite3.OperationalError):
+                    reader.add(["b#0"], ["beta"], [{"source": "b"}])
+                reader.close()
+            finally:
+                writer.conn.rollback()
+                writer.close()
+
+    def test_common_terms_read_a_bounded_number_of_postings(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = LexicalIndex(Path(tmp), max_postings=2)
+            index.add(
+                ["a#0", "b#0", "c#0", "d#0"],
+                ["the rare word", "the the the", "the the", "the"],
+                [{"source": s} for s in "abcd"],
+            )
+
+            # The rare term picks the candidates; "the" only re-scores them.
+            self.assertEqual([cid for cid, _ in index.search("the rare", k=5)], ["a#0"])
+            # On its own, "the" reads its highest-frequency postings.
+            self.assertEqual([cid for cid, _ in index.search("the", k=5)], ["b#0", "c#0"])
+
+            index.delete_source("b")
+            self.assertEqual(index.conn.execute("SELECT df FROM terms WHERE term = 'the'").fetchone(), (3,))
+            index.close()
+
+    def test_older_index_gains_document_frequencies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = LexicalIndex(Path(tmp))
+            index.add(["a#0", "b#0"], ["alpha beta", "beta"], [{"source": "a"}, {"source": "b"}])
+            index.conn.execute("DELETE FROM terms")
+            index.conn.execute("PRAGMA user_version = 1")
+            index.conn.commit()
+            index.close()
+
+            reader = LexicalIndex(Path(tmp), read_only=True)
+            dfs = dict(reader.conn.execute("SELECT term, df FROM terms"))
+            reader.close()
+
+        self.assertEqual(dfs, {"alpha": 1, "beta": 2})
+
+    def test_reciprocal_rank_fusion(self) -> None:
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60)
+        self.assertEqual(fused[0][0], "c")
+        self.assertEqual({item for item, _ in fused}, {"a", "b", "c", "d"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from assistant.manifest import IngestManifest
+
+PARAMS = {"chunk_size": 100, "chunk_overlap": 10, "embedding_model": "all-minilm"}
+
+
+class IngestManifestTests(unittest.TestCase):
+    def test_new_then_unchanged_after_record(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            doc = Path(tmp) / "doc.txt"
+            doc.write_text("hello", encoding="utf-8")
+            manifest = IngestManifest(Path(tmp) / "store", PARAMS)
+
+            status, fingerprint = manifest.check(doc)
+            self.assertEqual(status, "new")
+            manifest.record(fingerprint)
+            manifest.save()
+
+            reloaded = IngestManifest(Path(tmp) / "store", PARAMS)
+            status, _ = reloaded.check(doc)
+            self.assertEqual(status, "unchanged")
+
+    def test_modified_content_is_updated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            doc = Path(tmp) / "doc.txt"
+            doc.write_text("hello", encoding="utf-8")
+            manifest = IngestManifest(Path(tmp), PARAMS)
+            manifest.record(manifest.check(doc)[1])
+
+            doc.write_text("hello world", encoding="utf-8")
+            status, _ = manifest.check(doc)
+            self.assertEqual(status, "updated")
+
+    def test_touched_file_with_same_content_is_unchanged(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            doc = Path(tmp) / "doc.txt"
+            doc.write_text("hello", encoding="utf-8")
+            manifest = IngestManifest(Path(tmp), PARAMS)
+            manifest.record(manifest.check(doc)[1])
+
+            st = doc.stat()
+            os.utime(doc, (st.st_atime, st.st_mtime + 10))
+            status, _ = manifest.check(doc)
+            self.assertEqual(status, "unchanged")
+
+    def test_changed_params_invalidate_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            doc = Path(tmp) / "doc.txt"
+            doc.write_text("hello", encoding="utf-8")
+            manifest = IngestManifest(Path(tmp), PARAMS)
+            manifest.record(manifest.check(doc)[1])
+            manifest.save()
+
+            changed = IngestManifest(Path(tmp), {**PARAMS, "chunk_size": 200})
+            status, _ = changed.check(doc)
+            self.assertEqual(status, "updated")
+
+
+    def test_suffix_params_only_invalidate_that_file_type(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = [Path(tmp) / "doc.txt", Path(tmp) / "scan.PDF"]
+            for doc in docs:
+                doc.write_text("hello", encoding="utf-8")
+            manifest = IngestManifest(Path(tmp), PARAMS, {".pdf": {"pdf_ocr_dpi": 0}})
+            for doc in docs:
+                manifest.record(manifest.check(doc)[1])
+            manifest.save()
+
+            changed = IngestManifest(Path(tmp), PARAMS, {".pdf": {"pdf_ocr_dpi": 300}})
+            self.assertEqual([changed.check(doc)[0] for doc in docs], ["unchanged", "updated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
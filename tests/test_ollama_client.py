@@ -1,7 +1,8 @@
 import unittest
 from unittest.mock import patch
 
-from assistant.llm.ollama_client import chat
+from assistant import profiling
+from assistant.llm.ollama_client import chat, chat_stream
 
 
 class OllamaClientTests(unittest.TestCase):
@@ -42,6 +43,43 @@ class OllamaClientTests(unittest.TestCase):
             [{"role": "user", "content": "Just user"}],
         )
 
+    @patch("assistant.llm.ollama_client.ollama.chat")
+    def test_chat_stream_yields_content_pieces(self, mock_chat) -> None:
+        mock_chat.return_value = iter(
+            [
+                {"message": {"content": "Hel"}},
+                {"message": {"content": "lo"}},
+                {"message": {"content": ""}, "done": True},
+            ]
+        )
+
+        pieces = list(chat_stream(prompt="Hi", model="llama3", temperature=0.1))
+
+        self.assertEqual(pieces, ["Hel", "lo"])
+        _, kwargs = mock_chat.call_args
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["options"]["temperature"], 0.1)
+
+    @patch("assistant.llm.ollama_client.ollama.chat")
+    def test_chat_records_token_usage_when_profiling(self, mock_chat) -> None:
+        mock_chat.return_value = {
+            "message": {"content": "ok"},
+            "prompt_eval_count": 12,
+            "eval_count": 3,
+            "eval_duration": 6_000_000,
+        }
+        profiler = profiling.enable()
+        try:
+            chat(prompt="Hi", model="llama3")
+        finally:
+            profiling.disable()
+
+        (event,) = profiler.events
+        self.assertEqual(event["name"], "llm.chat")
+        self.assertEqual(event["args"]["prompt_eval_count"], 12)
+        self.assertEqual(event["args"]["eval_count"], 3)
+        self.assertEqual(event["args"]["eval_duration_ms"], 6.0)
+
 
 if __name__ == "__main__":
     unittest.main()
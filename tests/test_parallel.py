@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from assistant.parallel import parse_files, process_pool, thread_map
+
+
+def read_or_fail(path: Path) -> str:
+    if path.name.startswith("bad"):
+        raise RuntimeError(f"cannot parse {path.name}")
+    return path.read_text(encoding="utf-8")
+
+
+class ParseFilesTests(unittest.TestCase):
+    def _make_files(self, root: Path) -> list:
+        paths = []
+        for i in range(7):
+            name = f"bad{i}.txt" if i == 3 else f"doc{i}.txt"
+            path = root / name
+            path.write_text(f"text {i}", encoding="utf-8")
+            paths.append(path)
+        return paths
+
+    def test_serial_and_parallel_results_match_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = self._make_files(Path(tmp))
+
+            serial = list(parse_files(paths, read_or_fail, workers=1))
+            parallel = list(parse_files(iter(paths), read_or_fail, workers=3))
+
+            self.assertEqual([r[0] for r in parallel], paths)
+            self.assertEqual([r[1] for r in parallel], [r[1] for r in serial])
+
+    def test_errors_are_reported_per_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = self._make_files(Path(tmp))
+
+            results = list(parse_files(paths, read_or_fail, workers=2))
+
+            failed = [(p.name, str(err)) for p, text, err in results if err is not None]
+            self.assertEqual(failed, [("bad3.txt", "cannot parse bad3.txt")])
+            self.assertEqual(results[0][1], "text 0")
+
+
+    def test_shared_pool_is_reused_and_left_running(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = self._make_files(Path(tmp))
+            for workers in (1, 2):
+                with process_pool(workers) as pool:
+                    first = list(parse_files(paths, read_or_fail, workers, pool))
+                    second = list(parse_files(paths[:2], read_or_fail, workers, pool))
+                    self.assertEqual(pool.submit(abs, -1).result(), 1)
+
+                self.assertEqual([r[1] for r in second], ["text 0", "text 1"])
+                self.assertEqual(str(first[3][2]), "cannot parse bad3.txt")
+
+
+class ProcessPoolTests(unittest.TestCase):
+    def test_serial_and_parallel_pools_return_results_and_errors(self) -> None:
+        for workers in (1, 2):
+            with process_pool(workers) as pool:
+                futures = [pool.submit(abs, x) for x in (-3, 4)]
+                failing = pool.submit(abs, "x")
+                self.assertEqual([f.result() for f in futures], [3, 4])
+                with self.assertRaises(TypeError):
+                    failing.result()
+
+
+class ThreadMapTests(unittest.TestCase):
+    def test_results_keep_input_order(self) -> None:
+        self.assertEqual(thread_map(lambda x: x * x, list(range(10)), max_workers=4), [x * x for x in range(10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,8 @@ from unittest.mock import patch
 
 from assistant.parsers.docx_parser import extract_docx_text
 from assistant.parsers.md_parser import extract_md_text
-from assistant.parsers.pdf_parser import extract_pdf_text
+from assistant.parsers.image_parser import ocr_image_bytes
+from assistant.parsers.pdf_parser import extract_pdf_text, iter_pdf_pages, scan_pdf_pages
 from assistant.parsers.txt_parser import extract_txt_text
 
 
@@ -61,6 +62,45 @@ class ParserErrorHandlingTests(unittest.TestCase):
                 with self.assertRaises(RuntimeError):
                     extract_pdf_text(bad_pdf)
 
+    def test_pdf_pages_without_text_layer_are_ocred(self) -> None:
+        try:
+            import fitz  # type: ignore[import-not-found]
+        except ImportError:
+            self.skipTest("pymupdf not installed")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf = Path(tmp) / "scan.pdf"
+            doc = fitz.open()
+            doc.new_page().insert_text((72, 72), "typed")
+            doc.new_page()
+            page = doc.new_page()
+            page.insert_image(page.rect, pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), 0))
+            doc.save(pdf)
+            doc.close()
+
+            self.assertEqual(
+                [(n, needs_ocr) for n, _, needs_ocr in scan_pdf_pages(pdf)],
+                [(1, False), (2, False), (3, True)],
+            )
+            with patch("assistant.parsers.pdf_parser.ocr_unavailable_reason", return_value=None):
+                with patch("assistant.parsers.pdf_parser.ocr_image_bytes", return_value="ocr") as ocr:
+                    pages = list(iter_pdf_pages(pdf, ocr_dpi=72))
+                    self.assertEqual([text for _, text in pages], ["typed\n", "", "ocr"])
+                    self.assertTrue(ocr.call_args.args[0].startswith(b"\x89PNG"))
+                    self.assertEqual(list(iter_pdf_pages(pdf, start=2, ocr_dpi=0)), [(3, "")])
+                # A failing page keeps its empty text layer instead of failing the document.
+                with patch(
+                    "assistant.parsers.pdf_parser.ocr_image_bytes", side_effect=RuntimeError("bad")
+                ):
+                    self.assertEqual(extract_pdf_text(pdf), "typed\n\n\n")
+            with patch("assistant.parsers.pdf_parser.ocr_unavailable_reason", return_value="missing"):
+                self.assertEqual(list(iter_pdf_pages(pdf, start=2)), [(3, "")])
+
+    def test_ocr_of_rendered_pages_raises_without_dependencies(self) -> None:
+        with patch.dict("sys.modules", {"pytesseract": None}):
+            with self.assertRaises(RuntimeError):
+                ocr_image_bytes(b"\x89PNG")
+
     def test_docx_parser_raises_on_corrupted_file(self) -> None:
         class FakeDocxModule:
             @staticmethod
@@ -0,0 +1,51 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from assistant import profiling
+
+
+class ProfilingTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        profiling.disable()
+
+    def test_span_is_noop_when_disabled(self) -> None:
+        self.assertIs(profiling.span("stage"), profiling._NOOP)
+        with profiling.span("stage") as s:
+            s.set(eval_count=3)
+        self.assertEqual(list(profiling.profile_iter("stage", [1, 2])), [1, 2])
+
+    def test_breakdown_totals_calls_and_tokens(self) -> None:
+        profiler = profiling.enable()
+        for _ in range(2):
+            with profiling.span("llm.chat") as s:
+                s.set(prompt_eval_count=10, eval_count=4)
+        self.assertEqual(list(profiling.profile_iter("ingest.parse", "ab")), ["a", "b"])
+
+        rows = {row["stage"]: row for row in profiler.breakdown()}
+        self.assertEqual(rows["llm.chat"]["calls"], 2)
+        self.assertEqual(rows["llm.chat"]["prompt_eval_count"], 20)
+        self.assertEqual(rows["llm.chat"]["eval_count"], 8)
+        # One span per item plus the final exhausted step
+        self.assertEqual(rows["ingest.parse"]["calls"], 3)
+        table = profiler.format_table()
+        self.assertIn("llm.chat", table)
+        self.assertIn("LLM tokens: 20 prompt, 8 generated", table)
+
+    def test_export_trace_writes_chrome_events(self) -> None:
+        profiler = profiling.enable()
+        with profiling.span("ask.search", queries=1):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "trace.json"
+            profiler.export_trace(path)
+            trace = json.loads(path.read_text(encoding="utf-8"))
+        (event,) = trace["traceEvents"]
+        self.assertEqual((event["name"], event["cat"], event["ph"]), ("ask.search", "ask", "X"))
+        self.assertEqual(event["args"], {"queries": 1})
+        self.assertEqual(trace["breakdown"][0]["stage"], "ask.search")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from assistant.quantization import (
+    code_bytes,
+    coarse_scores,
+    evaluate_quantization,
+    quantize_binary,
+    quantize_int8,
+)
+from assistant.vector_store import NumpyVectorStore
+
+
+def random_unit_vectors(n, dim, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class QuantizationTests(unittest.TestCase):
+    def test_int8_codes_approximate_dot_products(self) -> None:
+        vectors = random_unit_vectors(50, 64)
+        codes, scales = quantize_int8(vectors)
+
+        approx = coarse_scores("int8", codes, vectors[:3], scales)
+
+        np.testing.assert_allclose(approx, vectors @ vectors[:3].T, atol=0.02)
+
+    def test_binary_codes_rank_identical_vector_first(self) -> None:
+        vectors = random_unit_vectors(20, 64)
+        codes = quantize_binary(vectors)
+
+        scores = coarse_scores("binary", codes, vectors[5:6])
+
+        self.assertEqual(codes.shape, (20, 8))
+        self.assertEqual(int(np.argmax(scores[:, 0])), 5)
+
+    def test_binary_scores_are_computed_in_bounded_blocks(self) -> None:
+        vectors = random_unit_vectors(300, 64)
+        codes = quantize_binary(vectors)
+        queries = random_unit_vectors(9, 64, seed=3)
+        query_codes = [int.from_bytes(q, "big") for q in quantize_binary(queries)]
+        expected = np.array(
+            [[-bin(int.from_bytes(c, "big") ^ q).count("1") for q in query_codes] for c in codes],
+            dtype=np.float32,
+        )
+
+        # 100 bytes per block: a few rows of one query at a time.
+        with patch("assistant.quantization._BINARY_BLOCK_BYTES", 100):
+            scores = coarse_scores("binary", codes, queries)
+
+        np.testing.assert_array_equal(scores, expected)
+        np.testing.assert_array_equal(coarse_scores("binary", codes, queries), expected)
+
+    def test_report_lists_footprint_and_recall(self) -> None:
+        vectors = random_unit_vectors(500, 32)
+
+        rows = evaluate_quantization(vectors, vectors[:20], k=5, rescore_factor=4)
+
+        self.assertEqual([r["mode"] for r in rows], ["float32", "int8", "binary"])
+        self.assertEqual([r["bytes_per_vector"] for r in rows], [128, 36, 4])
+        self.assertEqual(code_bytes("binary", 384), 48)
+        for row in rows:
+            self.assertGreaterEqual(row["recall_rescored"], row["recall"])
+        self.assertGreater(rows[1]["recall_rescored"], 0.95)
+
+    def test_report_skips_hidden_rows_and_reads_in_blocks(self) -> None:
+        vectors = random_unit_vectors(500, 32, seed=2)
+        live = np.ones(len(vectors), dtype=bool)
+        live[[7, 300]] = False
+        keep = live.copy()
+        keep[3] = False
+
+        # The query's own row and dead rows are never neighbours, so this
+        # matches a search over the remaining rows only.
+        rows = evaluate_quantization(
+            vectors, vectors[3:4], k=5, live=live, exclude=np.array([3]), block_rows=64
+        )
+        expected = evaluate_quantization(vectors[keep], vectors[3:4], k=5)
+
+        self.assertAlmostEqual(rows[1]["index_mb"], 498 * 36 / 1024 / 1024)
+        for row, want in zip(rows[:2], expected[:2]):
+            self.assertEqual(row["recall"], want["recall"])
+            self.assertEqual(row["recall_rescored"], want["recall_rescored"])
+
+
+class QuantizedStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name)
+        self.vectors = random_unit_vectors(200, 32, seed=1)
+        self.ids = [f"c{i}" for i in range(len(self.vectors))]
+
+    def add_all(self, store) -> None:
+        store.add(
+            self.ids,
+            [f"doc {i}" for i in range(len(self.ids))],
+            [{"source": f"{i}.txt"} for i in range(len(self.ids))],
+            self.vectors,
+        )
+
+    def test_rescored_results_match_exact_search(self) -> None:
+        exact = NumpyVectorStore(self.path / "exact")
+        self.add_all(exact)
+        queries = self.vectors[:5] + 0.05
+        expected = exact.query(queries, n_results=3)
+
+        store = NumpyVectorStore(self.path / "int8", quantization="int8", rescore_factor=4)
+        self.add_all(store)
+        result = store.query(queries, n_results=3)
+        self.assertEqual(result["ids"], expected["ids"])
+        np.testing.assert_allclose(result["distances"], expected["distances"], atol=1e-5)
+
+        # Sign codes are much coarser; the rescored nearest neighbour is still exact.
+        store = NumpyVectorStore(self.path / "binary", quantization="binary", rescore_factor=10)
+        self.add_all(store)
+        result = store.query(queries, n_results=3)
+        self.assertEqual([ids[0] for ids in result["ids"]], [ids[0] for ids in expected["ids"]])
+        np.testing.assert_allclose(
+            [d[0] for d in result["distances"]], [d[0] for d in expected["distances"]], atol=1e-5
+        )
+
+    def test_enabling_quantization_encodes_existing_vectors(self) -> None:
+        store = NumpyVectorStore(self.path)
+        self.add_all(store)
+        store.delete_source("0.txt")
+        store.close()
+
+        quantized = NumpyVectorStore(self.path, quantization="int8")
+
+        self.assertEqual((self.path / "codes.int8").stat().st_size, 200 * 32)
+        self.assertEqual(quantized.query(self.vectors[1:2], n_results=1)["ids"], [["c1"]])
+        self.assertEqual(len(quantized.live_vectors()), 199)
+
+
+if __name__ == "__main__":
+    unittest.main()
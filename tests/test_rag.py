@@ -0,0 +1,651 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import yaml
+
+from assistant.config import Config
+from assistant.rag import (
+    _fuse_lexical,
+    _retrieve,
+    _sources,
+    CACHED_ANSWER_MARKER,
+    answer_question,
+    answer_questions,
+    collect_garbage,
+    ingest_changes,
+    ingest_folder,
+    iter_answer,
+)
+
+
+class FakeCollection:
+    """Minimal in-memory stand-in for a vector store."""
+
+    def __init__(self) -> None:
+        self.records: dict = {}
+
+    def add(self, ids, documents, metadatas, embeddings) -> None:
+        for id_, doc, meta, emb in zip(ids, documents, metadatas, embeddings):
+            self.records[id_] = (doc, meta, emb)
+
+    def query(self, query_embeddings, n_results, include_embeddings=False):
+        self.queries = list(query_embeddings)
+        items = list(self.records.items())[:n_results]
+        result = {
+            "ids": [[id_ for id_, _ in items] for _ in self.queries],
+            "documents": [[doc for _, (doc, _, _) in items] for _ in self.queries],
+            "metadatas": [[meta for _, (_, meta, _) in items] for _ in self.queries],
+        }
+        if include_embeddings:
+            result["embeddings"] = [[emb for _, (_, _, emb) in items] for _ in self.queries]
+        return result
+
+    def get(self, ids):
+        found = [id_ for id_ in ids if id_ in self.records]
+        return {
+            "ids": found,
+            "documents": [self.records[id_][0] for id_ in found],
+            "metadatas": [self.records[id_][1] for id_ in found],
+        }
+
+    def delete_source(self, source) -> None:
+        self.delete_sources([source])
+
+    def delete_sources(self, sources) -> None:
+        self.records = {
+            k: v for k, v in self.records.items() if v[1]["source"] not in sources
+        }
+
+    def sources(self):
+        counts = {}
+        for _, meta, _ in self.records.values():
+            counts[meta["source"]] = counts.get(meta["source"], 0) + 1
+        return counts
+
+    def compact(self) -> None:
+        pass
+
+    def source_metadatas(self, source):
+        return {k: dict(v[1]) for k, v in self.records.items() if v[1]["source"] == source}
+
+    def delete_ids(self, ids) -> None:
+        for id_ in ids:
+            self.records.pop(id_, None)
+
+    def update_metadatas(self, ids, metadatas) -> None:
+        for id_, meta in zip(ids, metadatas):
+            doc, _, emb = self.records[id_]
+            self.records[id_] = (doc, meta, emb)
+
+
+def fake_embed(texts):
+    return [[float(len(t)), 1.0] for t in texts]
+
+
+def make_config(tmp_path: Path, cache=None, pdf=None, **rag) -> Config:
+    cfg_path = tmp_path / "config.yaml"
+    cfg_path.write_text(
+        yaml.safe_dump(
+            {
+                "rag": {"chunk_size": 10, "chunk_overlap": 0, **rag},
+                "cache": cache or {},
+                "pdf": pdf or {},
+                "paths": {
+                    "vector_store": str(tmp_path / "store"),
+                    "cache_folder": str(tmp_path / "cache"),
+                },
+            }
+        )
+    )
+    return Config(cfg_path)
+
+
+class IngestFolderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.collection = FakeCollection()
+        patcher = patch(
+            "assistant.rag._get_vector_store",
+            return_value=(self.collection, fake_embed),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_run_skips_unchanged_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("a" * 25, encoding="utf-8")
+            (data / "b.md").write_text("b" * 5, encoding="utf-8")
+            cfg = make_config(tmp_path)
+
+            first = ingest_folder(data, cfg)
+            self.assertEqual(first["new"], 2)
+            self.assertEqual(first["chunks"], 4)
+
+            second = ingest_folder(data, cfg)
+            self.assertEqual(second["skipped"], 2)
+            self.assertEqual(second["chunks"], 0)
+            self.assertEqual(len(self.collection.records), 4)
+
+    def test_modified_file_is_reindexed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            doc = data / "a.txt"
+            doc.write_text("a" * 25, encoding="utf-8")
+            cfg = make_config(tmp_path)
+            ingest_folder(data, cfg)
+
+            doc.write_text("c" * 5, encoding="utf-8")
+            counts = ingest_folder(data, cfg)
+
+            self.assertEqual(counts["updated"], 1)
+            self.assertEqual(len(self.collection.records), 1)
+
+    def test_ingest_changes_applies_updates_and_deletions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            (data / "sub").mkdir(parents=True)
+            (data / "a.txt").write_text("a" * 5, encoding="utf-8")
+            (data / "sub" / "b.txt").write_text("b" * 5, encoding="utf-8")
+            (data / "sub" / "c.txt").write_text("c" * 5, encoding="utf-8")
+            cfg = make_config(tmp_path)
+            ingest_folder(data, cfg)
+
+            (data / "a.txt").write_text("d" * 15, encoding="utf-8")
+            (data / "new.txt").write_text("e" * 5, encoding="utf-8")
+            for name in ("b.txt", "c.txt"):
+                (data / "sub" / name).unlink()
+            (data / "sub").rmdir()
+            counts = ingest_changes(
+                data, [data / "a.txt", data / "new.txt"], [data / "sub"], cfg
+            )
+
+            self.assertEqual(
+                (counts["updated"], counts["new"], counts["deleted"]), (1, 1, 2)
+            )
+            sources = sorted(meta["source"] for _, meta, _ in self.collection.records.values())
+            self.assertEqual(sources, [str(data / "a.txt")] * 2 + [str(data / "new.txt")])
+            self.assertEqual(ingest_folder(data, cfg)["skipped"], 2)
+
+    def test_collect_garbage_removes_chunks_of_deleted_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            for name in ("a.txt", "b.txt", "c.txt"):
+                (data / name).write_text(name[0] * 15, encoding="utf-8")
+            cfg = make_config(tmp_path)
+            ingest_folder(data, cfg)
+            (data / "a.txt").unlink()
+            (data / "b.txt").unlink()
+
+            dry = collect_garbage(cfg, dry_run=True)
+            self.assertEqual((dry["orphans"], dry["chunks"]), (2, 4))
+            self.assertEqual(len(self.collection.records), 6)
+
+            result = collect_garbage(cfg)
+            self.assertEqual((result["sources"], result["orphans"], result["chunks"]), (3, 2, 4))
+            self.assertEqual(self.collection.sources(), {str(data / "c.txt"): 2})
+
+            (data / "a.txt").write_text("a" * 5, encoding="utf-8")
+            self.assertEqual(ingest_folder(data, cfg)["new"], 1)
+
+    def test_collect_garbage_refuses_to_empty_the_store(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("a" * 5, encoding="utf-8")
+            cfg = make_config(tmp_path)
+            ingest_folder(data, cfg)
+            (data / "a.txt").unlink()
+
+            self.assertEqual(collect_garbage(cfg)["chunks"], 0)
+            self.assertEqual(len(self.collection.records), 1)
+            self.assertEqual(collect_garbage(cfg, force=True)["chunks"], 1)
+            self.assertEqual(self.collection.records, {})
+
+    def test_ingest_prune_drops_sources_missing_from_the_walk(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            (data / "drafts").mkdir(parents=True)
+            (data / "a.txt").write_text("a" * 5, encoding="utf-8")
+            (data / "drafts" / "b.txt").write_text("b" * 5, encoding="utf-8")
+            cfg = make_config(tmp_path)
+            ingest_folder(data, cfg)
+
+            (data / ".assistantignore").write_text("drafts/\n", encoding="utf-8")
+            counts = ingest_folder(data, cfg, prune=True)
+
+            self.assertEqual(counts["pruned"], 1)
+            self.assertEqual(self.collection.sources(), {str(data / "a.txt"): 1})
+
+    def test_reingest_embeds_only_new_chunks(self) -> None:
+        embedded = []
+
+        def recording_embed(texts):
+            embedded.extend(texts)
+            return fake_embed(texts)
+
+        with tempfile.TemporaryDirectory() as tmp, patch(
+            "assistant.rag._get_vector_store", return_value=(self.collection, recording_embed)
+        ):
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            doc = data / "log.txt"
+            doc.write_text("aaaaaaaaaabbbbbbbbbb", encoding="utf-8")
+            cfg = make_config(tmp_path, cache={"embeddings": False})
+            ingest_folder(data, cfg)
+
+            # Appending only embeds the appended chunk
+            embedded.clear()
+            doc.write_text("aaaaaaaaaabbbbbbbbbbcccccccccc", encoding="utf-8")
+            counts = ingest_folder(data, cfg)
+            self.assertEqual((counts["chunks"], counts["reused"]), (1, 2))
+            self.assertEqual(embedded, ["cccccccccc"])
+
+            # Prepending a chunk shifts the others: they keep their ids and
+            # embeddings, only their chunk_index moves; edited chunks go away
+            embedded.clear()
+            doc.write_text("zzzzzzzzzzaaaaaaaaaabbbbbbbbbbdddddddddd", encoding="utf-8")
+            counts = ingest_folder(data, cfg)
+            self.assertEqual(sorted(embedded), ["dddddddddd", "zzzzzzzzzz"])
+            stored = sorted(
+                (meta["chunk_index"], text) for text, meta, _ in self.collection.records.values()
+            )
+            self.assertEqual(
+                stored,
+                [(0, "zzzzzzzzzz"), (1, "aaaaaaaaaa"), (2, "bbbbbbbbbb"), (3, "dddddddddd")],
+            )
+
+            # Truncating reuses every remaining chunk, but is still an update
+            embedded.clear()
+            doc.write_text("zzzzzzzzzzaaaaaaaaaa", encoding="utf-8")
+            with redirect_stdout(io.StringIO()) as out:
+                counts = ingest_folder(data, cfg)
+            self.assertEqual((counts["updated"], counts["chunks"], embedded), (1, 0, []))
+            self.assertNotIn("No documents to ingest", out.getvalue())
+
+    def test_changing_embedding_model_reembeds_every_chunk(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("a" * 25, encoding="utf-8")
+            ingest_folder(data, make_config(tmp_path, embedding_model="one"))
+            old_ids = set(self.collection.records)
+
+            counts = ingest_folder(data, make_config(tmp_path, embedding_model="two"))
+
+            self.assertEqual((counts["updated"], counts["chunks"], counts["reused"]), (1, 3, 0))
+            self.assertEqual(len(self.collection.records), 3)
+            self.assertFalse(old_ids & set(self.collection.records))
+
+            # The vector store converts its own vectors when the dtype changes.
+            counts = ingest_folder(
+                data, make_config(tmp_path, embedding_model="two", vector_dtype="float16")
+            )
+            self.assertEqual((counts["skipped"], counts["chunks"]), (1, 0))
+
+    def test_pdf_pages_stream_into_chunk_metadata(self) -> None:
+        try:
+            import fitz  # type: ignore[import-not-found]
+        except ImportError:
+            self.skipTest("pymupdf not installed")
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            doc = fitz.open()
+            for word in ("alpha", "bravo", "charlie"):
+                doc.new_page().insert_text((72, 72), word * 3)
+            doc.save(data / "manual.pdf")
+            doc.close()
+            cfg = make_config(tmp_path, chunk_size=20, pdf={"pages_per_task": 1, "fanout_min_pages": 2})
+
+            counts = ingest_folder(data, cfg, workers=2)
+
+            self.assertEqual(counts["new"], 1)
+            metas = sorted(
+                (meta["chunk_index"], meta["page"], meta.get("page_end"))
+                for _, meta, _ in self.collection.records.values()
+            )
+            self.assertEqual(metas, [(0, 1, 2), (1, 2, 3), (2, 3, None)])
+            self.assertEqual(ingest_folder(data, cfg)["skipped"], 1)
+
+    def test_scanned_pdf_pages_are_ocred_in_workers(self) -> None:
+        try:
+            import fitz  # type: ignore[import-not-found]
+        except ImportError:
+            self.skipTest("pymupdf not installed")
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            doc = fitz.open()
+            doc.new_page().insert_text((72, 72), "typed page")
+            for _ in range(2):
+                page = doc.new_page()
+                page.insert_image(page.rect, pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), 0))
+            doc.save(data / "scan.pdf")
+            doc.close()
+            cfg = make_config(tmp_path, chunk_size=200, pdf={"ocr_dpi": 50})
+
+            with patch("assistant.parsers.pdf_parser.ocr_unavailable_reason", return_value=None), patch(
+                "assistant.parsers.pdf_parser.ocr_image_bytes", return_value="scanned words"
+            ):
+                counts = ingest_folder(data, cfg, workers=2)
+
+            self.assertEqual(counts["ocr_pages"], 2)
+            (doc_text, meta, _), = self.collection.records.values()
+            self.assertEqual(doc_text, "typed page\n\nscanned words\nscanned words")
+            self.assertEqual((meta["page"], meta["page_end"]), (1, 3))
+
+    def test_pdf_with_image_page_ingests_when_ocr_is_unavailable(self) -> None:
+        try:
+            import fitz  # type: ignore[import-not-found]
+        except ImportError:
+            self.skipTest("pymupdf not installed")
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            doc = fitz.open()
+            page = doc.new_page()
+            page.insert_image(page.rect, pixmap=fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), 0))
+            doc.new_page().insert_text((72, 72), "body text")
+            doc.save(data / "report.pdf")
+            doc.close()
+            cfg = make_config(tmp_path, chunk_size=200)
+
+            with patch(
+                "assistant.parsers.pdf_parser.ocr_unavailable_reason", return_value="no tesseract"
+            ):
+                counts = ingest_folder(data, cfg)
+
+            self.assertEqual((counts["new"], counts["failed"], counts["ocr_pages"]), (1, 0, 0))
+            (doc_text, meta, _), = self.collection.records.values()
+            self.assertEqual((doc_text.strip(), meta["page"]), ("body text", 1))
+
+    def test_changing_chunk_size_invalidates_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("a" * 25, encoding="utf-8")
+            ingest_folder(data, make_config(tmp_path))
+
+            counts = ingest_folder(data, make_config(tmp_path, chunk_size=20))
+
+            self.assertEqual(counts["updated"], 1)
+            self.assertEqual(len(self.collection.records), 2)
+
+    def test_parallel_parsing_matches_serial_ingest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            for i in range(5):
+                (data / f"doc{i}.txt").write_text(str(i) * (10 * i + 5), encoding="utf-8")
+            cfg = make_config(tmp_path)
+
+            counts = ingest_folder(data, cfg, workers=2)
+
+            self.assertEqual(counts["new"], 5)
+            self.assertEqual(counts["chunks"], 1 + 2 + 3 + 4 + 5)
+
+    def test_repeated_chunks_hit_embedding_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("disclaimerBODY-A", encoding="utf-8")
+            (data / "b.txt").write_text("disclaimerBODY-B", encoding="utf-8")
+            cfg = make_config(tmp_path)
+
+            counts = ingest_folder(data, cfg)
+
+            self.assertEqual(counts["embedding_cache_hits"], 1)
+            self.assertEqual(counts["embedding_cache_misses"], 3)
+
+    def test_hybrid_retrieval_surfaces_exact_identifier(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("generic text", encoding="utf-8")
+            (data / "b.txt").write_text("other notes", encoding="utf-8")
+            (data / "c.txt").write_text("use rebase", encoding="utf-8")
+            cfg = make_config(tmp_path, chunk_size=20, retrieval_mode="hybrid")
+            ingest_folder(data, cfg)
+
+            # The fake vector search returns the first two stored chunks;
+            # BM25 has to pull c.txt into the fused top 2 when it is not among them.
+            fused = _retrieve("how do I rebase", cfg, top_k=2)
+
+        self.assertEqual(len(fused), 2)
+        self.assertIn(("use rebase", str(data / "c.txt")), [(d, m["source"]) for d, m in fused])
+
+    def test_hybrid_fusion_keeps_distances_per_query(self) -> None:
+        self.collection.add(["a", "b"], ["A", "B"], [{"source": "a.txt"}, {"source": "b.txt"}], [[1.0], [2.0]])
+        lexical = Mock()
+        lexical.search.side_effect = lambda query, k: [("b" if query == "qa" else "a", 1.0)]
+        retrieved = [
+            [("A", {"source": "a.txt", "id": "a", "distance": 0.1})],
+            [("B", {"source": "b.txt", "id": "b", "distance": 0.9})],
+        ]
+        with tempfile.TemporaryDirectory() as tmp, patch(
+            "assistant.rag._get_lexical_index", return_value=lexical
+        ):
+            fused = _fuse_lexical(["qa", "qb"], retrieved, make_config(Path(tmp)), self.collection, 2)
+
+        distances = [{m["id"]: m.get("distance") for _, m in hits} for hits in fused]
+        self.assertEqual(distances, [{"a": 0.1, "b": None}, {"b": 0.9, "a": None}])
+
+    def test_mmr_drops_near_duplicate_candidates(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            # fake_embed embeds by length: a.txt and b.txt are exact duplicates.
+            (data / "a.txt").write_text("x" * 10, encoding="utf-8")
+            (data / "b.txt").write_text("y" * 10, encoding="utf-8")
+            (data / "c.txt").write_text("zz", encoding="utf-8")
+            cfg = make_config(tmp_path, mmr_lambda=0.3, fetch_k=10)
+            ingest_folder(data, cfg)
+
+            with patch.object(self.collection, "query", wraps=self.collection.query) as query:
+                hits = _retrieve("q" * 10, cfg, top_k=2)
+
+        self.assertEqual(query.call_args.kwargs["n_results"], 10)
+        self.assertTrue(query.call_args.kwargs["include_embeddings"])
+        sources = sorted(Path(m["source"]).name for _, m in hits)
+        self.assertEqual(len(sources), 2)
+        self.assertIn("c.txt", sources)
+
+    def test_chunks_are_written_in_fixed_size_batches(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("a" * 45, encoding="utf-8")
+            cfg = make_config(tmp_path, ingest_batch_size=2)
+
+            with patch.object(self.collection, "add", wraps=self.collection.add) as add, patch(
+                "assistant.rag.IngestManifest.save", autospec=True
+            ) as save:
+                counts = ingest_folder(data, cfg)
+
+            self.assertEqual(counts["chunks"], 5)
+            self.assertEqual([len(c.kwargs["ids"]) for c in add.call_args_list], [2, 2, 1])
+            # The manifest is written once at the end, not after every batch.
+            self.assertEqual(save.call_count, 1)
+
+    def test_failed_batch_is_not_recorded_in_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("a" * 10, encoding="utf-8")
+            (data / "b.txt").write_text("b" * 10, encoding="utf-8")
+            cfg = make_config(tmp_path, ingest_batch_size=1)
+
+            def flaky_embed(texts):
+                if texts[0].startswith("b"):
+                    raise RuntimeError("boom")
+                return fake_embed(texts)
+
+            with patch("assistant.rag._get_vector_store", return_value=(self.collection, flaky_embed)):
+                first = ingest_folder(data, cfg)
+            counts = ingest_folder(data, cfg)
+
+            self.assertEqual((first["new"], first["failed"]), (1, 1))
+            self.assertEqual(first["retry"], [str(data / "b.txt")])
+
+            self.assertEqual(counts["skipped"], 1)
+            self.assertEqual(counts["new"], 1)
+
+
+class NumpyBackendTests(unittest.TestCase):
+    @patch("assistant.rag.get_embedding_function", return_value=fake_embed)
+    def test_ingest_and_retrieve_through_numpy_backend(self, _) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            data = tmp_path / "data"
+            data.mkdir()
+            (data / "a.txt").write_text("a" * 8, encoding="utf-8")
+            (data / "b.txt").write_text("bb", encoding="utf-8")
+            cfg = make_config(tmp_path, vector_backend="numpy", vector_dtype="float16")
+
+            counts = ingest_folder(data, cfg)
+            hits = _retrieve("q" * 8, cfg, top_k=1)
+
+        self.assertEqual(counts["chunks"], 2)
+        self.assertEqual([(doc, m["source"]) for doc, m in hits], [("a" * 8, str(data / "a.txt"))])
+
+
+def question_embed(texts):
+    """Embed by first word so rephrasings of the same question collide."""
+    return [[1.0, 0.0] if t.startswith("What") else [0.0, 1.0] for t in texts]
+
+
+class AnswerQuestionsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_path = Path(tmp.name)
+        self.collection = FakeCollection()
+        self.collection.add(["x#0"], ["context"], [{"source": "x.txt", "chunk_index": 0}], [[1.0]])
+        patcher = patch(
+            "assistant.rag._get_vector_store",
+            return_value=(self.collection, question_embed),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("assistant.rag.chat", side_effect=lambda prompt, **kwargs: prompt.split("Question: ")[1][:2])
+    def test_batch_queries_once_and_preserves_order(self, mock_chat) -> None:
+        questions = [{"id": i, "question": f"Q{i}?"} for i in range(6)]
+        cfg = make_config(self.tmp_path, cache={"answers": False})
+
+        with patch.object(self.collection, "query", wraps=self.collection.query) as query:
+            results = answer_questions(questions, cfg, max_workers=3)
+
+        query.assert_called_once()
+        np.testing.assert_array_equal(self.collection.queries, question_embed([q["question"] for q in questions]))
+        self.assertEqual([r["id"] for r in results], list(range(6)))
+        self.assertEqual([r["answer"] for r in results], [f"Q{i}" for i in range(6)])
+        self.assertEqual(results[0]["sources"], ["x.txt"])
+        self.assertIn("latency_ms", results[0])
+        self.assertEqual(mock_chat.call_count, 6)
+
+    def test_empty_question_list_returns_no_results(self) -> None:
+        self.assertEqual(answer_questions([], make_config(self.tmp_path)), [])
+
+    def test_sources_cite_pages_of_paged_documents(self) -> None:
+        retrieved = [
+            ("a", {"source": "m.pdf", "page": 7, "page_end": 9}),
+            ("b", {"source": "m.pdf", "page": 3}),
+            ("c", {"source": "notes.txt", "chunk_index": 0}),
+            ("d", {"source": "one.pdf", "page": 2}),
+        ]
+        self.assertEqual(
+            _sources(retrieved), ["m.pdf (pages 3, 7-9)", "notes.txt", "one.pdf (page 2)"]
+        )
+
+    def test_streamed_answer_matches_non_streamed(self) -> None:
+        cfg = make_config(self.tmp_path, cache={"answers": False})
+        with patch("assistant.rag.chat", return_value="Hello there"), \
+                patch("assistant.rag.chat_stream", return_value=iter(["Hello", " there"])):
+            pieces = list(iter_answer("Hi?", cfg))
+            full = answer_question("Hi?", cfg)
+
+        self.assertEqual(pieces[:2], ["Hello", " there"])
+        self.assertEqual("".join(pieces), full)
+        self.assertTrue(full.endswith("Sources:\nx.txt"))
+
+    @patch("assistant.rag.chat", return_value="Paris")
+    def test_near_duplicate_question_hits_answer_cache(self, mock_chat) -> None:
+        cfg = make_config(self.tmp_path)
+
+        first = answer_question("What is the capital?", cfg)
+        second = answer_question("What's the capital city?", cfg)
+        other = answer_question("Who wrote it?", cfg)
+
+        self.assertEqual(mock_chat.call_count, 2)
+        self.assertFalse(first.endswith(CACHED_ANSWER_MARKER))
+        self.assertEqual(second, f"{first}\n\n{CACHED_ANSWER_MARKER}")
+        self.assertFalse(other.endswith(CACHED_ANSWER_MARKER))
+
+    @patch("assistant.rag.chat", return_value="Paris")
+    def test_cached_answers_look_the_same_from_every_entry_point(self, mock_chat) -> None:
+        cfg = make_config(self.tmp_path)
+        fresh = answer_question("What is the capital?", cfg)
+
+        batch = answer_questions([{"question": "What's the capital city?"}], cfg)
+        self.assertEqual(
+            (batch[0]["answer"], batch[0]["sources"], batch[0]["cached"]), ("Paris", ["x.txt"], True)
+        )
+
+        answer_questions([{"question": "Who wrote it?"}], cfg)
+        single = answer_question("Who is the author?", cfg)
+        self.assertEqual(single, f"Paris\n\nSources:\nx.txt\n\n{CACHED_ANSWER_MARKER}")
+        self.assertEqual(fresh, "Paris\n\nSources:\nx.txt")
+        self.assertEqual(mock_chat.call_count, 2)
+
+    @patch("assistant.rag.chat", return_value="Paris")
+    def test_retrieval_settings_change_misses_answer_cache(self, mock_chat) -> None:
+        answer_question("What is the capital?", make_config(self.tmp_path))
+
+        for changed in ({"retrieval_mode": "hybrid"}, {"context_budget_chars": 100}):
+            answer = answer_question("What is the capital?", make_config(self.tmp_path, **changed))
+            self.assertFalse(answer.endswith(CACHED_ANSWER_MARKER), changed)
+
+    @patch("assistant.rag.chat", return_value="Paris")
+    def test_ingest_invalidates_answer_cache(self, mock_chat) -> None:
+        cfg = make_config(self.tmp_path)
+        data = self.tmp_path / "data"
+        data.mkdir()
+        answer_question("What is the capital?", cfg)
+
+        (data / "new.txt").write_text("fresh", encoding="utf-8")
+        ingest_folder(data, cfg)
+        results = answer_questions([{"question": "What is the capital?"}], cfg)
+
+        self.assertFalse(results[0]["cached"])
+        self.assertEqual(mock_chat.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
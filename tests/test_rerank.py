@@ -0,0 +1,26 @@
+import unittest
+
+import numpy as np
+
+from assistant.rerank import mmr
+
+
+class MMRTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.query = np.array([1.0, 0.0])
+        # Two near-duplicates closest to the query, then a distinct one.
+        self.candidates = np.array([[1.0, 0.1], [1.0, 0.11], [0.7, -0.7]])
+
+    def test_pure_relevance_keeps_similarity_order(self) -> None:
+        self.assertEqual(mmr(self.query, self.candidates, k=3, lambda_mult=1.0), [0, 1, 2])
+
+    def test_diversity_skips_near_duplicate(self) -> None:
+        self.assertEqual(mmr(self.query, self.candidates, k=2, lambda_mult=0.5), [0, 2])
+
+    def test_k_is_capped_and_empty_input_selects_nothing(self) -> None:
+        self.assertEqual(len(mmr(self.query, self.candidates, k=10)), 3)
+        self.assertEqual(mmr(self.query, np.zeros((0, 2)), k=3), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
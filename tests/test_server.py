@@ -0,0 +1,76 @@
+import json
+import socket
+import tempfile
+import threading
+import unittest
+from http.client import HTTPConnection
+from pathlib import Path
+from unittest.mock import patch
+
+from assistant.config import Config
+from assistant.server import make_server
+
+
+class ServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = make_server(Config(), host="127.0.0.1", port=0)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _request(self, method: str, path: str, body=None):
+        conn = HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+        conn.request(method, path, body=json.dumps(body) if body is not None else None)
+        resp = conn.getresponse()
+        payload = json.loads(resp.read())
+        conn.close()
+        return resp.status, payload
+
+    def test_health(self) -> None:
+        self.assertEqual(self._request("GET", "/health"), (200, {"status": "ok"}))
+
+    @patch("assistant.server.answer_question", return_value="42")
+    def test_ask_returns_answer(self, mock_answer) -> None:
+        status, payload = self._request("POST", "/ask", {"question": "Meaning?"})
+
+        self.assertEqual((status, payload), (200, {"answer": "42", "cached": False}))
+        self.assertEqual(mock_answer.call_args.args[0], "Meaning?")
+
+    def test_ask_requires_question(self) -> None:
+        status, payload = self._request("POST", "/ask", {})
+        self.assertEqual(status, 400)
+        self.assertIn("question", payload["error"])
+
+    @patch("assistant.server.ingest_folder", return_value={"new": 1})
+    def test_ingest_passes_folder_and_workers(self, mock_ingest) -> None:
+        status, payload = self._request("POST", "/ingest", {"folder": "docs", "workers": 4})
+
+        self.assertEqual((status, payload), (200, {"new": 1}))
+        self.assertEqual(mock_ingest.call_args.args[0], Path("docs"))
+        self.assertEqual(mock_ingest.call_args.kwargs["workers"], 4)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets unavailable")
+class SocketPathTests(unittest.TestCase):
+    def test_refuses_to_replace_regular_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "notes.txt"
+            path.write_text("keep me")
+
+            with self.assertRaises(FileExistsError):
+                make_server(Config(), socket_path=str(path))
+
+            self.assertEqual(path.read_text(), "keep me")
+
+    def test_replaces_stale_socket(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "api.sock")
+            make_server(Config(), socket_path=path).server_close()
+
+            server = make_server(Config(), socket_path=path)
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ import unittest
 from unittest.mock import patch
 
 from assistant.config import Config
-from assistant.summarizer import summarize_single_file
+from assistant.summarizer import _group_by_budget, summarize_single_file
 
 
 class SummarizerPipelineTests(unittest.TestCase):
@@ -27,6 +27,7 @@ class SummarizerPipelineTests(unittest.TestCase):
                 "  chunk_overlap: 2\n"
                 f"paths:\n"
                 f"  output_folder: {tmp_path / 'out'}\n"
+                f"  cache_folder: {tmp_path / 'cache'}\n"
             )
 
             cfg = Config(cfg_path)
@@ -41,6 +42,74 @@ class SummarizerPipelineTests(unittest.TestCase):
                 self.assertEqual(call.kwargs["model"], "test-model")
                 self.assertEqual(call.kwargs["temperature"], 0.5)
 
+    @patch("assistant.summarizer.chat")
+    def test_concurrent_map_preserves_chunk_order(self, mock_chat) -> None:
+        def fake_chat(prompt, **kwargs):
+            content = prompt.split("Content:\n", 1)[1]
+            return content if "\n" in content else f"<{content}>"
+
+        mock_chat.side_effect = fake_chat
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            input_file = tmp_path / "sample.txt"
+            input_file.write_text("".join(str(i) * 10 for i in range(8)), encoding="utf-8")
+            cfg_path = tmp_path / "config.yaml"
+            cfg_path.write_text(
+                "model:\n"
+                "  max_parallel: 4\n"
+                "rag:\n"
+                "  chunk_size: 10\n"
+                "  chunk_overlap: 0\n"
+                f"paths:\n"
+                f"  output_folder: {tmp_path / 'out'}\n"
+                f"  cache_folder: {tmp_path / 'cache'}\n"
+            )
+
+            out_path = summarize_single_file(input_file, Config(cfg_path))
+
+            expected = "\n".join(f"<{str(i) * 10}>" for i in range(8))
+            self.assertEqual(out_path.read_text(encoding="utf-8"), expected)
+
+    @patch("assistant.summarizer.chat")
+    def test_tree_reduce_keeps_prompts_within_budget(self, mock_chat) -> None:
+        prompts = []
+
+        def fake_chat(prompt, **kwargs):
+            content = prompt.split("Content:\n", 1)[1]
+            prompts.append(content)
+            return "x" * 8
+
+        mock_chat.side_effect = fake_chat
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            input_file = tmp_path / "sample.txt"
+            input_file.write_text("a" * 160, encoding="utf-8")
+            cfg_path = tmp_path / "config.yaml"
+            cfg_path.write_text(
+                "rag:\n"
+                "  chunk_size: 10\n"
+                "  chunk_overlap: 0\n"
+                "summary:\n"
+                "  reduce_budget_chars: 30\n"
+                f"paths:\n"
+                f"  output_folder: {tmp_path / 'out'}\n"
+                f"  cache_folder: {tmp_path / 'cache'}\n"
+            )
+
+            summarize_single_file(input_file, Config(cfg_path))
+
+        # 16 chunks -> 6 groups of <= 3 -> 2 groups -> 1 final summary.
+        self.assertEqual(mock_chat.call_count, 16 + 6 + 2 + 1)
+        self.assertTrue(all(len(p) <= 30 for p in prompts))
+
+    def test_group_by_budget(self) -> None:
+        self.assertEqual(
+            _group_by_budget(["aaaa", "bbbb", "cc", "dddddddddd"], 9),
+            [["aaaa", "bbbb"], ["cc"], ["dddddddddd"]],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
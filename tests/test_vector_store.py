@@ -0,0 +1,145 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from assistant.vector_store import NumpyVectorStore, open_vector_store
+
+
+def add_chunks(store, names, vectors):
+    store.add(
+        [f"{n}#0" for n in names],
+        [f"text {n}" for n in names],
+        [{"source": f"{n}.txt", "chunk_index": 0} for n in names],
+        vectors,
+    )
+
+
+class NumpyVectorStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name)
+
+    def test_exact_top_k_per_query(self) -> None:
+        store = NumpyVectorStore(self.path)
+        add_chunks(store, ["a", "b", "c"], [[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+
+        result = store.query([[1.0, 0.0], [0.0, 1.0]], n_results=2)
+
+        self.assertEqual(result["ids"], [["a#0", "c#0"], ["b#0", "c#0"]])
+        self.assertEqual(result["metadatas"][0][0], {"source": "a.txt", "chunk_index": 0})
+        self.assertAlmostEqual(result["distances"][0][0], 0.0, places=5)
+        self.assertAlmostEqual(result["distances"][0][1], 2 - np.sqrt(2), places=5)
+
+    def test_delete_and_replace_hide_old_rows(self) -> None:
+        store = NumpyVectorStore(self.path)
+        add_chunks(store, ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+        store.delete_source("a.txt")
+        add_chunks(store, ["b"], [[1.0, 0.1]])
+
+        result = store.query([[1.0, 0.0]], n_results=5, include_embeddings=True)
+
+        self.assertEqual(result["ids"], [["b#0"]])
+        self.assertEqual(store.count(), 1)
+        self.assertEqual(result["embeddings"][0].shape, (1, 2))
+        self.assertEqual(store.get(["a#0", "b#0"])["ids"], ["b#0"])
+
+    def test_sources_and_batched_delete(self) -> None:
+        store = NumpyVectorStore(self.path)
+        add_chunks(store, ["a", "b", "c"], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+        self.assertEqual(store.sources(), {"a.txt": 1, "b.txt": 1, "c.txt": 1})
+        store.delete_sources(["a.txt", "c.txt", "missing.txt"])
+
+        self.assertEqual(store.sources(), {"b.txt": 1})
+        self.assertEqual(store.query([[1.0, 0.0]], n_results=5)["ids"], [["b#0"]])
+
+    def test_source_metadatas_delete_ids_and_update_metadatas(self) -> None:
+        store = NumpyVectorStore(self.path)
+        add_chunks(store, ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+
+        self.assertEqual(store.source_metadatas("a.txt"), {"a#0": {"source": "a.txt", "chunk_index": 0}})
+        store.update_metadatas(["b#0"], [{"source": "b.txt", "chunk_index": 7}])
+        store.delete_ids(["a#0"])
+
+        result = store.query([[1.0, 0.0]], n_results=5)
+        self.assertEqual(result["ids"], [["b#0"]])
+        self.assertEqual(result["metadatas"][0][0]["chunk_index"], 7)
+
+    def test_float16_store_persists_and_drops_torn_append(self) -> None:
+        store = NumpyVectorStore(self.path, dtype="float16")
+        add_chunks(store, ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+        store.close()
+        vectors = self.path / "vectors.bin"
+        with open(vectors, "ab") as fh:
+            fh.write(b"\x00" * 3)
+
+        reopened = NumpyVectorStore(self.path, dtype="float16")
+
+        self.assertEqual(vectors.stat().st_size, 2 * 2 * 2)
+        self.assertEqual(reopened.query([[0.0, 1.0]], n_results=1)["ids"], [["b#0"]])
+
+    def test_compact_keeps_live_rows_searchable(self) -> None:
+        store = NumpyVectorStore(self.path)
+        add_chunks(store, ["a", "b", "c"], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+        store.delete_source("b.txt")
+
+        store.compact()
+
+        self.assertEqual((self.path / "vectors.bin").stat().st_size, 2 * 2 * 4)
+        self.assertEqual(store.query([[1.0, 1.0]], n_results=2)["ids"], [["c#0", "a#0"]])
+
+    def test_dtype_change_converts_the_vector_file(self) -> None:
+        store = NumpyVectorStore(self.path)
+        add_chunks(store, ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+        store.close()
+
+        half = NumpyVectorStore(self.path, dtype="float16")
+        add_chunks(half, ["c"], [[1.0, 1.0]])
+
+        self.assertEqual((self.path / "vectors.bin").stat().st_size, 3 * 2 * 2)
+        self.assertEqual(json.loads((self.path / "meta.json").read_text())["dtype"], "float16")
+        self.assertEqual(half.query([[0.0, 1.0]], n_results=1)["ids"], [["b#0"]])
+        self.assertEqual(half.query([[1.0, 1.0]], n_results=1)["ids"], [["c#0"]])
+
+    def test_reader_sees_writes_from_another_store_instance(self) -> None:
+        writer = NumpyVectorStore(self.path)
+        add_chunks(writer, ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+        reader = NumpyVectorStore(self.path)
+        self.assertEqual(reader.query([[0.0, 1.0]], n_results=1)["ids"], [["b#0"]])
+
+        writer.delete_source("b.txt")
+        self.assertEqual(reader.query([[0.0, 1.0]], n_results=2)["ids"], [["a#0"]])
+
+        add_chunks(writer, ["c"], [[1.0, 1.0]])
+        writer.compact()
+        self.assertEqual(reader.query([[1.0, 1.0]], n_results=2)["ids"], [["c#0", "a#0"]])
+        add_chunks(reader, ["d"], [[0.0, 1.0]])
+        self.assertEqual(writer.query([[0.0, 1.0]], n_results=1)["ids"], [["d#0"]])
+
+    def test_appends_from_two_instances_never_share_rows(self) -> None:
+        eye = np.eye(8)
+        first = NumpyVectorStore(self.path, quantization="int8")
+        add_chunks(first, ["a"], eye[:1])
+        other = NumpyVectorStore(self.path, quantization="int8")
+        add_chunks(other, [f"b{i}" for i in range(6)], eye[1:7])
+        other.delete_sources([f"b{i}.txt" for i in range(3, 6)])
+
+        # The file still holds b3-b5, so `first` must append after them.
+        add_chunks(first, ["new"], eye[7:8])
+
+        for store in (first, NumpyVectorStore(self.path, quantization="int8")):
+            result = store.query(eye[7:8], n_results=1)
+            self.assertEqual(result["ids"], [["new#0"]])
+            self.assertAlmostEqual(result["distances"][0][0], 0.0, places=5)
+
+    def test_unknown_backend_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            open_vector_store("faiss", self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from assistant import watcher as watcher_module
+from assistant.config import Config
+from assistant.watcher import (
+    CHANGED,
+    DELETED,
+    InotifyWatcher,
+    PollingWatcher,
+    watch_folder,
+)
+
+
+def drain(watcher, seconds: float = 0.5) -> set:
+    """Collect events until the watcher has been quiet for a moment."""
+    events = set()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        batch = watcher.read(0.05)
+        events.update((kind, path.name) for kind, path in batch)
+    return events
+
+
+class FailingLibc:
+    """libc wrapper whose inotify_add_watch fails once `failing` is set."""
+
+    def __init__(self, libc) -> None:
+        self.libc = libc
+        self.failing = False
+
+    def inotify_add_watch(self, *args):
+        return -1 if self.failing else self.libc.inotify_add_watch(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.libc, name)
+
+
+class InotifyWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "node_modules").mkdir()
+        try:
+            self.watcher = InotifyWatcher(self.root)
+        except OSError as exc:
+            self.skipTest(f"inotify unavailable: {exc}")
+        self.addCleanup(self.watcher.close)
+
+    def test_reports_supported_file_changes(self) -> None:
+        doc = self.root / "a.txt"
+        doc.write_text("one")
+        (self.root / "script.py").write_text("print()")
+        (self.root / "node_modules" / "b.md").write_text("dep")
+        self.assertEqual(drain(self.watcher), {(CHANGED, "a.txt")})
+
+        doc.rename(self.root / "c.txt")
+        self.assertEqual(drain(self.watcher), {(DELETED, "a.txt"), (CHANGED, "c.txt")})
+
+    def test_new_directories_are_scanned_and_watched(self) -> None:
+        outside = tempfile.TemporaryDirectory()
+        self.addCleanup(outside.cleanup)
+        moved = Path(outside.name) / "batch"
+        moved.mkdir()
+        (moved / "x.txt").write_text("x")
+        moved.rename(self.root / "batch")
+        self.assertEqual(drain(self.watcher), {(CHANGED, "x.txt")})
+
+        (self.root / "batch" / "y.md").write_text("y")
+        self.assertEqual(drain(self.watcher), {(CHANGED, "y.md")})
+
+        (self.root / "batch").rename(Path(outside.name) / "gone")
+        self.assertEqual(drain(self.watcher), {(DELETED, "batch")})
+
+    def test_failed_watch_still_reports_the_new_tree(self) -> None:
+        self.watcher._libc = FailingLibc(self.watcher._libc)
+        self.watcher._libc.failing = True
+        outside = tempfile.TemporaryDirectory()
+        self.addCleanup(outside.cleanup)
+        moved = Path(outside.name) / "batch"
+        (moved / "sub").mkdir(parents=True)
+        (moved / "x.txt").write_text("x")
+        (moved / "sub" / "y.md").write_text("y")
+        moved.rename(self.root / "batch")
+
+        self.assertEqual(drain(self.watcher), {(CHANGED, "x.txt"), (CHANGED, "y.md")})
+        self.assertIsInstance(self.watcher.degraded, OSError)
+
+
+class PollingWatcherTests(unittest.TestCase):
+    def test_diffs_successive_scans(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "keep.txt").write_text("same")
+            (root / "old.txt").write_text("bye")
+            watcher = PollingWatcher(root, interval=0)
+
+            (root / "old.txt").unlink()
+            (root / "new.md").write_text("hi")
+            events = {(kind, path.name) for kind, path in watcher.read(1.0)}
+
+            self.assertEqual(events, {(DELETED, "old.txt"), (CHANGED, "new.md")})
+            self.assertEqual(watcher.read(1.0), [])
+
+
+class WatchFolderTests(unittest.TestCase):
+    def test_debounced_changes_are_applied_in_one_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "config.yaml").write_text("")
+            data = root / "data"
+            data.mkdir()
+            cfg = Config(root / "config.yaml")
+            stop = threading.Event()
+            calls = []
+
+            def fake_changes(folder, changed, deleted, cfg, workers=1):
+                calls.append(({p.name for p in changed}, {p.name for p in deleted}))
+                stop.set()
+                return {"new": len(changed), "updated": 0, "deleted": 0, "failed": 0, "chunks": 0}
+
+            with patch("assistant.watcher.ingest_folder"), patch(
+                "assistant.watcher.ingest_changes", side_effect=fake_changes
+            ):
+                thread = threading.Thread(
+                    target=watch_folder,
+                    args=(data, cfg),
+                    kwargs={"debounce": 0.3, "poll_interval": 0.05, "stop": stop},
+                )
+                thread.start()
+                time.sleep(0.2)
+                for i in range(5):
+                    (data / f"doc{i}.txt").write_text(str(i))
+                thread.join(timeout=10)
+
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(calls, [({f"doc{i}.txt" for i in range(5)}, set())])
+
+    def test_failed_batch_is_retried(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "config.yaml").write_text("")
+            data = root / "data"
+            data.mkdir()
+            cfg = Config(root / "config.yaml")
+            stop = threading.Event()
+            calls = []
+
+            def flaky_changes(folder, changed, deleted, cfg, workers=1):
+                calls.append({p.name for p in changed})
+                if len(calls) == 1:
+                    raise RuntimeError("ollama is down")
+                stop.set()
+                return {"new": len(changed), "updated": 0, "deleted": 0, "failed": 0, "chunks": 0}
+
+            with patch("assistant.watcher.ingest_folder"), patch(
+                "assistant.watcher.ingest_changes", side_effect=flaky_changes
+            ):
+                thread = threading.Thread(
+                    target=watch_folder,
+                    args=(data, cfg),
+                    kwargs={"debounce": 0.1, "max_delay": 0.3, "poll_interval": 0.05, "stop": stop},
+                )
+                thread.start()
+                time.sleep(0.2)
+                (data / "doc.txt").write_text("text")
+                thread.join(timeout=10)
+
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(calls, [{"doc.txt"}, {"doc.txt"}])
+
+    def test_paths_whose_chunks_were_not_stored_are_retried(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "config.yaml").write_text("")
+            data = root / "data"
+            data.mkdir()
+            cfg = Config(root / "config.yaml")
+            stop = threading.Event()
+            calls = []
+
+            def partly_failing(folder, changed, deleted, cfg, workers=1):
+                calls.append({p.name for p in changed})
+                tries = sum("bad.txt" in names for names in calls)
+                retry = [str(p) for p in changed if p.name == "bad.txt" and tries == 1]
+                if tries == 2:
+                    stop.set()
+                return {
+                    "new": len(changed), "updated": 0, "deleted": 0, "failed": len(retry),
+                    "chunks": 0, "retry": retry,
+                }
+
+            with patch("assistant.watcher.ingest_folder"), patch(
+                "assistant.watcher.ingest_changes", side_effect=partly_failing
+            ):
+                thread = threading.Thread(
+                    target=watch_folder,
+                    args=(data, cfg),
+                    kwargs={"debounce": 0.1, "max_delay": 0.3, "poll_interval": 0.05, "stop": stop},
+                )
+                thread.start()
+                time.sleep(0.2)
+                (data / "good.txt").write_text("good")
+                (data / "bad.txt").write_text("bad")
+                thread.join(timeout=10)
+
+            self.assertFalse(thread.is_alive())
+            # bad.txt is applied again on its own; good.txt is not.
+            self.assertEqual(calls[-1], {"bad.txt"})
+            self.assertEqual(sum("good.txt" in names for names in calls), 1)
+
+    def test_falls_back_to_polling_when_a_watch_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "config.yaml").write_text("")
+            data = root / "data"
+            data.mkdir()
+            cfg = Config(root / "config.yaml")
+            stop = threading.Event()
+            libc = FailingLibc(watcher_module._load_libc())
+            calls = []
+
+            def fake_changes(folder, changed, deleted, cfg, workers=1):
+                calls.append({p.name for p in changed})
+                if len(calls) == 2:
+                    stop.set()
+                return {"new": len(changed), "updated": 0, "deleted": 0, "failed": 0, "chunks": 0}
+
+            with patch("assistant.watcher.ingest_folder"), patch(
+                "assistant.watcher.ingest_changes", side_effect=fake_changes
+            ), patch("assistant.watcher._load_libc", return_value=libc), patch(
+                "assistant.watcher.FALLBACK_POLL_INTERVAL", 0.05
+            ):
+                try:
+                    InotifyWatcher(data).close()
+                except OSError as exc:
+                    self.skipTest(f"inotify unavailable: {exc}")
+                thread = threading.Thread(
+                    target=watch_folder,
+                    args=(data, cfg),
+                    kwargs={"debounce": 0.1, "stop": stop},
+                )
+                thread.start()
+                time.sleep(0.2)
+                libc.failing = True
+                (data / "sub").mkdir()
+                (data / "sub" / "a.txt").write_text("a")
+                time.sleep(0.6)
+                (data / "sub" / "b.txt").write_text("b")
+                thread.join(timeout=10)
+
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(calls, [{"a.txt"}, {"b.txt"}])
+
+
+if __name__ == "__main__":
+    unittest.main()